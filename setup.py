@@ -18,6 +18,10 @@ with open("requirements/install/hermes.txt", "r") as fh:
     requirements_hermes = fh.read().splitlines()
     extra_requirements_hermes = list(set(requirements_hermes) - set(requirements_common))
 
+with open("requirements/install/audio.txt", "r") as fh:
+    requirements_audio = fh.read().splitlines()
+    extra_requirements_audio = list(set(requirements_audio) - set(requirements_common))
+
 with open("requirements/install/mqtt.txt", "r") as fh:
     requirements_mqtt = fh.read().splitlines()
     extra_requirements_mqtt = list(set(requirements_mqtt) - set(requirements_common))
@@ -36,8 +40,11 @@ setup(
     package_dir={'': 'src'},
     py_modules=[splitext(basename(path))[0] for path in glob('src/*.py')],
     install_requires=requirements_common,
-    extras_require={'hermes': extra_requirements_hermes,
+    extras_require={'audio': extra_requirements_audio,
+                    'hermes': extra_requirements_hermes,
                     'mqtt': extra_requirements_mqtt},
+    entry_points={'console_scripts': ['snipskit-benchmark=snipskit.mqtt.benchmark:main',
+                                        'snipskit-loadgen=snipskit.mqtt.loadgen:main']},
     include_package_data=True,
     zip_safe=False,
     classifiers=[
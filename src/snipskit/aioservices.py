@@ -0,0 +1,246 @@
+"""This module contains coroutine versions of the functions in
+:mod:`snipskit.services`, for applications that run an asyncio event loop.
+
+The functions in :mod:`snipskit.services` block the event loop while they run
+`<service> --version` or scan the process table. The coroutines in this module
+run the binaries with :func:`asyncio.create_subprocess_exec`, all at once and
+with a timeout, and scan the process table in the default executor of the
+event loop.
+
+They share the cache of version outputs with :mod:`snipskit.services`, so a
+binary that has been checked before isn't run again until it changes, by
+either module. The binaries are looked up on the PATH in the default executor
+too.
+
+A binary that doesn't answer in time is still installed: :func:`installed`
+and :func:`is_installed` report it as installed, but its version is unknown,
+so :func:`version` and :func:`versions` return an empty string for it.
+
+Example:
+
+.. code-block:: python
+
+    import asyncio
+
+    from snipskit import aioservices
+
+    async def health():
+        installed, running = await asyncio.gather(aioservices.installed(),
+                                                  aioservices.running())
+        return {service: installed[service] and running[service]
+                for service in installed}
+
+.. versionadded:: 0.7.0
+"""
+
+import asyncio
+
+from snipskit.services import _binary, _cached_version_output, \
+    _parse_model_version, _parse_version, _version_cache, \
+    _version_cache_lock, ProcessSnapshot, SNIPS_SERVICES, VERSION_FLAG
+
+DEFAULT_TIMEOUT = 5.0
+
+# The running version commands, with a tuple (event loop, path of the binary)
+# as key, so concurrent callers wait for the same command.
+_pending = {}
+
+
+async def _run_version(path, identity, timeout):
+    """Run a binary with the argument '--version' and cache its output."""
+    try:
+        process = await asyncio.create_subprocess_exec(
+            path, VERSION_FLAG, stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL)
+    except FileNotFoundError:
+        # The binary has been removed in the meantime.
+        version_output = ''
+    else:
+        try:
+            stdout, _ = await asyncio.wait_for(process.communicate(), timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            # Don't cache this, the next call tries again.
+            return None
+        version_output = stdout.decode('utf-8').strip()
+
+    with _version_cache_lock:
+        _version_cache[path] = (identity, version_output)
+
+    return version_output
+
+
+async def _version_output(service, timeout=DEFAULT_TIMEOUT):
+    """Return the output of the command `service` with the argument
+    '--version'.
+
+    Args:
+        service (str): The service to check the version of.
+        timeout (float, optional): The maximum time in seconds to wait for
+            the command. Defaults to 5.
+
+    Returns:
+        str: The output of the command, an empty string if the command is not
+        installed, or `None` if it didn't finish in time.
+    """
+    # Looking up the binary on the PATH touches the file system, so don't
+    # block the event loop with it.
+    loop = asyncio.get_event_loop()
+    path, identity = await loop.run_in_executor(None, _binary, service)
+    if path is None:
+        return ''
+
+    version_output = _cached_version_output(path, identity)
+    if version_output is not None:
+        return version_output
+
+    key = (loop, path)
+    future = _pending.get(key)
+    if future is None:
+        future = asyncio.ensure_future(_run_version(path, identity, timeout))
+        _pending[key] = future
+        future.add_done_callback(lambda _: _pending.pop(key, None))
+
+    # Don't cancel the shared command if one of the callers is cancelled.
+    return await asyncio.shield(future)
+
+
+def _is_installed(version_output):
+    """Check whether a version output belongs to an installed binary: it isn't
+    empty, or the binary didn't answer in time (`None`)."""
+    return version_output is None or bool(version_output)
+
+
+async def _version_outputs(services, timeout=DEFAULT_TIMEOUT):
+    """Return the version outputs of services, running the binaries that
+    aren't cached concurrently."""
+    outputs = await asyncio.gather(*[_version_output(service, timeout)
+                                     for service in services])
+    return dict(zip(services, outputs))
+
+
+async def process_snapshot(services=None):
+    """Scan the process table in the default executor of the event loop.
+
+    Args:
+        services (list, optional): The names of the services to look for.
+            Defaults to all Snips services.
+
+    Returns:
+        :class:`.ProcessSnapshot`: The snapshot of the Snips processes.
+    """
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(None, ProcessSnapshot, services)
+
+
+async def is_installed(service, timeout=DEFAULT_TIMEOUT):
+    """Check whether the Snips service `service` is installed.
+
+    Args:
+        service (str): The Snips service to check.
+        timeout (float, optional): The maximum time in seconds to wait for
+            `<service> --version`. Defaults to 5.
+
+    Returns:
+        bool: True if the service is installed, also if its binary didn't
+        answer in time; False otherwise.
+    """
+    return _is_installed(await _version_output(service, timeout))
+
+
+async def is_running(service):
+    """Check whether the Snips service `service` is running.
+
+    Args:
+        service (str): The Snips service to check.
+
+    Returns:
+        bool: True if the service is running; False otherwise.
+    """
+    snapshot = await process_snapshot([service])
+    return snapshot.is_running(service)
+
+
+async def model_version(timeout=DEFAULT_TIMEOUT):
+    """Return the model version of Snips NLU.
+
+    Args:
+        timeout (float, optional): The maximum time in seconds to wait for
+            `snips-nlu --version`. Defaults to 5.
+
+    Returns:
+        str: The model version of Snips NLU, or an empty string if snips-nlu
+        is not installed.
+    """
+    return _parse_model_version(await _version_output('snips-nlu', timeout)
+                                or '')
+
+
+async def installed(timeout=DEFAULT_TIMEOUT):
+    """Return a dict with the installation state of all Snips services.
+
+    Args:
+        timeout (float, optional): The maximum time in seconds to wait for
+            each `<service> --version` command. Defaults to 5.
+
+    Returns:
+        dict: A dict with all Snips services as keys and their installation
+        state (True or False) as value. A service whose binary didn't answer
+        in time is installed.
+    """
+    return {service: _is_installed(version_output)
+            for service, version_output
+            in (await _version_outputs(SNIPS_SERVICES, timeout)).items()}
+
+
+async def running():
+    """Return a dict with the running state of all Snips services.
+
+    Returns:
+        dict: A dict with all Snips services as keys and their running state
+        (True or False) as value.
+    """
+    snapshot = await process_snapshot()
+    return snapshot.running()
+
+
+async def versions(timeout=DEFAULT_TIMEOUT):
+    """Return a dict with the version numbers of all Snips services.
+
+    Args:
+        timeout (float, optional): The maximum time in seconds to wait for
+            each `<service> --version` command. Defaults to 5.
+
+    Returns:
+        dict: A dict with all Snips services as keys and their version numbers
+        as value. Services that are not installed or whose binary didn't
+        answer in time have an empty string as their value.
+    """
+    return {service: _parse_version(version_output or '')
+            for service, version_output
+            in (await _version_outputs(SNIPS_SERVICES, timeout)).items()}
+
+
+async def version(service=None, timeout=DEFAULT_TIMEOUT):
+    """Return the version number of a Snips service or the Snips platform.
+
+    If the `service` argument is empty, this returns the minimum value of the
+    version numbers of all installed Snips services.
+
+    Args:
+        service (str, optional): The Snips service to check.
+        timeout (float, optional): The maximum time in seconds to wait for
+            each `<service> --version` command. Defaults to 5.
+
+    Returns:
+        str: The version number of the Snips service or an empty string if the
+        service is not installed. If no `service` argument is given: the
+        version of the Snips platform or an empty string if no Snips services
+        are installed.
+    """
+    if service:
+        return _parse_version(await _version_output(service, timeout) or '')
+
+    return min([version for version in (await versions(timeout)).values()
+                if version] or [''])
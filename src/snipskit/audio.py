@@ -0,0 +1,514 @@
+"""This module contains classes and functions to analyze and prepare audio for
+Snips with NumPy_.
+
+The Snips audio server publishes the audio of each site as a stream of small
+WAV files on the MQTT topic `hermes/audioServer/<siteId>/audioFrame`. The
+functions in this module compute features of this audio per frame of samples,
+without looping over the samples in Python:
+
+- RMS energy;
+- peak level;
+- zero-crossing rate;
+- a simple voice activity flag.
+
+The :class:`.AudioAsset` class gives access to a static WAV file that's played
+on the Snips audio server, converted once to the format you need.
+
+.. _NumPy: https://www.numpy.org/
+
+.. note::
+   This module requires NumPy. Install SnipsKit with `pip3 install
+   snipskit[audio]` to pull in this dependency.
+
+.. versionadded:: 0.7.0
+"""
+
+import io
+import mmap
+from pathlib import Path
+import struct
+import wave
+
+import numpy as np
+
+DEFAULT_FRAME_LENGTH = 256
+DEFAULT_VOICE_THRESHOLD = 0.02
+DEFAULT_VOICE_MAX_ZCR = 0.25
+
+# NumPy data types of PCM samples by their sample width in bytes. 8-bit WAV
+# files have unsigned samples, all other sample widths are signed.
+_SAMPLE_TYPES = {1: np.uint8, 2: np.int16, 4: np.int32}
+
+_WAV_HEADER = struct.Struct('<4sI4s4sIHHIIHH4sI')
+_CHUNK_HEADER = struct.Struct('<4sI')
+_FORMAT_PCM = 1
+
+
+def wav_to_samples(wav_data):
+    """Decode a WAV file to an array of samples.
+
+    Multiple channels are mixed down to one channel and the samples are
+    normalized to floating point values between -1 and 1.
+
+    Args:
+        wav_data (bytes): The content of a WAV file, for instance the payload
+            of an audioFrame message.
+
+    Returns:
+        (:class:`numpy.ndarray`, int): A tuple with a one-dimensional array of
+        samples and the sample rate of the audio.
+
+    Raises:
+        :exc:`wave.Error`: If `wav_data` isn't a valid WAV file.
+
+        :exc:`ValueError`: If the sample width of the WAV file isn't
+            supported.
+    """
+    with wave.open(io.BytesIO(wav_data), 'rb') as wav:
+        channels = wav.getnchannels()
+        sample_width = wav.getsampwidth()
+        sample_rate = wav.getframerate()
+        pcm = wav.readframes(wav.getnframes())
+
+    return pcm_to_samples(pcm, sample_width, channels), sample_rate
+
+
+def pcm_to_samples(pcm, sample_width=2, channels=1):
+    """Convert raw little-endian PCM data to an array of samples.
+
+    Args:
+        pcm (bytes): The raw PCM data.
+        sample_width (int, optional): The width of a sample in bytes. Defaults
+            to 2.
+        channels (int, optional): The number of interleaved channels. Defaults
+            to 1.
+
+    Returns:
+        :class:`numpy.ndarray`: A one-dimensional array of samples as
+        floating point values between -1 and 1. Multiple channels are mixed
+        down to one channel.
+
+    Raises:
+        :exc:`ValueError`: If the sample width isn't supported.
+    """
+    try:
+        sample_type = np.dtype(_SAMPLE_TYPES[sample_width]).newbyteorder('<')
+    except KeyError:
+        raise ValueError('Unsupported sample width: {}'.format(sample_width))
+
+    samples = np.frombuffer(pcm, dtype=sample_type).astype(np.float32)
+
+    if sample_width == 1:
+        samples = (samples - 128) / 128
+    else:
+        samples /= 2 ** (8 * sample_width - 1)
+
+    if channels > 1:
+        samples = samples[:len(samples) - len(samples) % channels]
+        samples = samples.reshape(-1, channels).mean(axis=1)
+
+    return samples
+
+
+def samples_to_pcm(samples, sample_width=2, channels=1):
+    """Convert an array of samples to raw little-endian PCM data.
+
+    This is the inverse of :func:`pcm_to_samples`.
+
+    Args:
+        samples (:class:`numpy.ndarray`): A one-dimensional array of samples
+            between -1 and 1.
+        sample_width (int, optional): The width of a sample in bytes. Defaults
+            to 2.
+        channels (int, optional): The number of channels. The samples are
+            copied to each channel. Defaults to 1.
+
+    Returns:
+        bytes: The raw PCM data.
+
+    Raises:
+        :exc:`ValueError`: If the sample width isn't supported.
+    """
+    try:
+        sample_type = np.dtype(_SAMPLE_TYPES[sample_width]).newbyteorder('<')
+    except KeyError:
+        raise ValueError('Unsupported sample width: {}'.format(sample_width))
+
+    scale = 2 ** (8 * sample_width - 1)
+    pcm = np.clip(np.round(np.asarray(samples, dtype=np.float64) * scale),
+                  -scale, scale - 1)
+    if sample_width == 1:
+        pcm += 128
+
+    if channels > 1:
+        pcm = np.repeat(pcm, channels)
+
+    return pcm.astype(sample_type).tobytes()
+
+
+def resample(samples, sample_rate, new_sample_rate):
+    """Resample an array of samples with linear interpolation.
+
+    Args:
+        samples (:class:`numpy.ndarray`): A one-dimensional array of samples.
+        sample_rate (int): The sample rate of `samples`.
+        new_sample_rate (int): The sample rate to convert to.
+
+    Returns:
+        :class:`numpy.ndarray`: The resampled samples.
+    """
+    if sample_rate == new_sample_rate or not len(samples):
+        return samples
+
+    length = int(round(len(samples) * new_sample_rate / sample_rate))
+    positions = np.arange(length) * (sample_rate / new_sample_rate)
+    return np.interp(positions, np.arange(len(samples)), samples)
+
+
+def wav_header(data_length, sample_rate=16000, channels=1, sample_width=2):
+    """Return the header of a PCM WAV file.
+
+    Args:
+        data_length (int): The length of the PCM data in bytes.
+        sample_rate (int, optional): The sample rate. Defaults to 16000.
+        channels (int, optional): The number of channels. Defaults to 1.
+        sample_width (int, optional): The width of a sample in bytes. Defaults
+            to 2.
+
+    Returns:
+        bytes: The 44 bytes of the WAV header. Append the PCM data to get a
+        complete WAV file.
+    """
+    block_align = channels * sample_width
+    return _WAV_HEADER.pack(b'RIFF', 36 + data_length, b'WAVE', b'fmt ', 16,
+                            _FORMAT_PCM, channels, sample_rate,
+                            sample_rate * block_align, block_align,
+                            8 * sample_width, b'data', data_length)
+
+
+def frames(samples, frame_length=DEFAULT_FRAME_LENGTH, hop_length=None):
+    """Split an array of samples into (possibly overlapping) frames.
+
+    The frames are a view on `samples`, so no samples are copied. Samples at
+    the end that don't fill a complete frame are left out.
+
+    Args:
+        samples (:class:`numpy.ndarray`): A one-dimensional array of samples.
+        frame_length (int, optional): The number of samples in a frame.
+            Defaults to 256.
+        hop_length (int, optional): The number of samples between the start of
+            two consecutive frames. Defaults to `frame_length`, which means the
+            frames don't overlap.
+
+    Returns:
+        :class:`numpy.ndarray`: A two-dimensional array with a frame in each
+        row.
+    """
+    if hop_length is None:
+        hop_length = frame_length
+
+    samples = np.ascontiguousarray(samples)
+    number_of_frames = max(0, 1 + (len(samples) - frame_length) // hop_length)
+    stride = samples.strides[0]
+
+    return np.lib.stride_tricks.as_strided(samples,
+                                           shape=(number_of_frames,
+                                                  frame_length),
+                                           strides=(hop_length * stride,
+                                                    stride),
+                                           writeable=False)
+
+
+def frame_features(samples, frame_length=DEFAULT_FRAME_LENGTH,
+                   hop_length=None, voice_threshold=DEFAULT_VOICE_THRESHOLD,
+                   voice_max_zcr=DEFAULT_VOICE_MAX_ZCR):
+    """Compute the features of each frame in an array of samples.
+
+    A frame is flagged as voice when its RMS energy is at least
+    `voice_threshold` and its zero-crossing rate is at most `voice_max_zcr`.
+    Noise such as hiss has a high zero-crossing rate, while voiced speech has
+    a lower one.
+
+    Args:
+        samples (:class:`numpy.ndarray`): A one-dimensional array of samples
+            between -1 and 1.
+        frame_length (int, optional): The number of samples in a frame.
+            Defaults to 256.
+        hop_length (int, optional): The number of samples between the start of
+            two consecutive frames. Defaults to `frame_length`.
+        voice_threshold (float, optional): The minimum RMS energy of a voiced
+            frame. Defaults to 0.02.
+        voice_max_zcr (float, optional): The maximum zero-crossing rate of a
+            voiced frame. Defaults to 0.25.
+
+    Returns:
+        dict: A dict with the keys 'rms', 'peak', 'zcr' and 'voice' and
+        one-dimensional arrays with a value for each frame as values.
+
+    Example:
+        >>> features = frame_features(samples)
+        >>> features['rms'].max()
+        0.3184
+    """
+    framed = frames(samples, frame_length, hop_length)
+
+    rms = np.sqrt(np.mean(np.square(framed), axis=1))
+    peak = np.max(np.abs(framed), axis=1) if len(framed) else np.zeros(0)
+    zcr = np.mean(np.diff(np.signbit(framed), axis=1), axis=1) \
+        if frame_length > 1 else np.zeros(len(framed))
+    voice = (rms >= voice_threshold) & (zcr <= voice_max_zcr)
+
+    return {'rms': rms, 'peak': peak, 'zcr': zcr, 'voice': voice}
+
+
+def features_summary(features):
+    """Summarize the features of a number of frames in a compact dict.
+
+    This is suitable for publishing the features in a small JSON payload.
+
+    Args:
+        features (dict): The features as returned by :func:`frame_features`.
+
+    Returns:
+        dict: A dict with the number of frames, the mean RMS energy, the
+        maximum peak level, the mean zero-crossing rate and the fraction of
+        voiced frames.
+
+    Example:
+        >>> features_summary(frame_features(samples))
+        {'frames': 4, 'rms': 0.1, 'peak': 0.3, 'zcr': 0.05, 'voice': 0.5}
+    """
+    number_of_frames = len(features['rms'])
+    if not number_of_frames:
+        return {'frames': 0, 'rms': 0.0, 'peak': 0.0, 'zcr': 0.0,
+                'voice': 0.0}
+
+    return {'frames': number_of_frames,
+            'rms': float(np.mean(features['rms'])),
+            'peak': float(np.max(features['peak'])),
+            'zcr': float(np.mean(features['zcr'])),
+            'voice': float(np.mean(features['voice']))}
+
+
+class AudioAnalyzer:
+    """This class computes the features of a stream of audio, frame by frame.
+
+    Audio chunks (e.g. the payloads of audioFrame messages) seldom contain a
+    whole number of frames. An :class:`.AudioAnalyzer` object keeps the samples
+    that don't fill a complete frame and prepends them to the next chunk.
+
+    Use one :class:`.AudioAnalyzer` object per audio stream.
+
+    Attributes:
+        frame_length (int): The number of samples in a frame.
+        hop_length (int): The number of samples between the start of two
+            consecutive frames.
+        voice_threshold (float): The minimum RMS energy of a voiced frame.
+        voice_max_zcr (float): The maximum zero-crossing rate of a voiced
+            frame.
+        sample_rate (int): The sample rate of the last WAV chunk, or `None` if
+            no WAV chunk has been fed yet.
+
+    Example:
+        >>> analyzer = AudioAnalyzer()
+        >>> features = analyzer.feed(payload)
+    """
+
+    def __init__(self, frame_length=DEFAULT_FRAME_LENGTH, hop_length=None,
+                 voice_threshold=DEFAULT_VOICE_THRESHOLD,
+                 voice_max_zcr=DEFAULT_VOICE_MAX_ZCR):
+        """Initialize an :class:`.AudioAnalyzer` object.
+
+        Args:
+            frame_length (int, optional): The number of samples in a frame.
+                Defaults to 256.
+            hop_length (int, optional): The number of samples between the
+                start of two consecutive frames. Defaults to `frame_length`.
+            voice_threshold (float, optional): The minimum RMS energy of a
+                voiced frame. Defaults to 0.02.
+            voice_max_zcr (float, optional): The maximum zero-crossing rate of
+                a voiced frame. Defaults to 0.25.
+        """
+        self.frame_length = frame_length
+        self.hop_length = hop_length or frame_length
+        self.voice_threshold = voice_threshold
+        self.voice_max_zcr = voice_max_zcr
+        self.sample_rate = None
+        self._remainder = np.zeros(0, dtype=np.float32)
+
+    def feed(self, wav_data):
+        """Feed a WAV chunk to the analyzer.
+
+        Args:
+            wav_data (bytes): The content of a WAV file.
+
+        Returns:
+            dict: The features of all complete frames, as returned by
+            :func:`frame_features`. The arrays are empty if the samples don't
+            fill a frame yet.
+        """
+        samples, self.sample_rate = wav_to_samples(wav_data)
+        return self.feed_samples(samples)
+
+    def feed_samples(self, samples):
+        """Feed an array of samples to the analyzer.
+
+        Args:
+            samples (:class:`numpy.ndarray`): A one-dimensional array of
+                samples between -1 and 1.
+
+        Returns:
+            dict: The features of all complete frames, as returned by
+            :func:`frame_features`.
+        """
+        if len(self._remainder):
+            samples = np.concatenate((self._remainder, samples))
+
+        features = frame_features(samples, self.frame_length,
+                                  self.hop_length, self.voice_threshold,
+                                  self.voice_max_zcr)
+
+        # Keep the samples the next frame starts with.
+        consumed = len(features['rms']) * self.hop_length
+        self._remainder = samples[consumed:].copy()
+
+        return features
+
+    def reset(self):
+        """Drop the buffered samples, e.g. when the stream is interrupted."""
+        self._remainder = np.zeros(0, dtype=np.float32)
+
+
+class AudioAsset:
+    """This class gives access to a static PCM WAV file, e.g. a sound effect,
+    to play on the Snips audio server.
+
+    The file is memory-mapped instead of read into memory. A WAV file in a
+    specific format (sample rate, number of channels and sample width) is only
+    created once and then cached, so you can publish the same bytes to many
+    sites without creating them again.
+
+    Attributes:
+        filename (str): The filename of the WAV file.
+        sample_rate (int): The sample rate of the WAV file.
+        channels (int): The number of channels of the WAV file.
+        sample_width (int): The width of a sample of the WAV file in bytes.
+
+    Example:
+        >>> ding = AudioAsset('/usr/share/sounds/ding.wav')
+        >>> payload = ding.wav(sample_rate=16000, channels=1)
+    """
+
+    def __init__(self, filename):
+        """Initialize an :class:`.AudioAsset` object.
+
+        Args:
+            filename (str): The filename of the WAV file.
+
+        Raises:
+            :exc:`FileNotFoundError`: If the specified filename doesn't exist.
+
+            :exc:`wave.Error`: If the file isn't a PCM WAV file.
+        """
+        self.filename = str(filename)
+        self._cache = {}
+
+        with Path(self.filename).open('rb') as wav_file:
+            self._mmap = mmap.mmap(wav_file.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+
+        try:
+            self._parse_header()
+        except (wave.Error, struct.error):
+            self.close()
+            raise
+
+    def _parse_header(self):
+        """Find the format and the location of the PCM data in the mapped WAV
+        file.
+
+        Raises:
+            :exc:`wave.Error`: If the file isn't a PCM WAV file.
+        """
+        if self._mmap[:4] != b'RIFF' or self._mmap[8:12] != b'WAVE':
+            raise wave.Error('{} is not a WAV file'.format(self.filename))
+
+        offset = 12
+        wav_format = None
+        while offset + _CHUNK_HEADER.size <= len(self._mmap):
+            chunk_id, chunk_size = _CHUNK_HEADER.unpack_from(self._mmap,
+                                                             offset)
+            offset += _CHUNK_HEADER.size
+
+            if chunk_id == b'fmt ':
+                wav_format = struct.unpack_from('<HHIIHH', self._mmap, offset)
+            elif chunk_id == b'data':
+                if wav_format is None or wav_format[0] != _FORMAT_PCM:
+                    raise wave.Error('{} is not a PCM WAV file'.format(self.filename))
+
+                self.channels = wav_format[1]
+                self.sample_rate = wav_format[2]
+                self.sample_width = wav_format[5] // 8
+                self._data = (offset,
+                              min(chunk_size, len(self._mmap) - offset))
+                return
+
+            # Chunks are aligned on an even number of bytes.
+            offset += chunk_size + chunk_size % 2
+
+        raise wave.Error('{} has no data chunk'.format(self.filename))
+
+    def pcm(self):
+        """Return a view on the PCM data of the WAV file.
+
+        Returns:
+            :class:`memoryview`: A read-only view on the memory-mapped PCM
+            data, without copying it.
+        """
+        offset, length = self._data
+        return memoryview(self._mmap)[offset:offset + length]
+
+    def wav(self, sample_rate=None, channels=None, sample_width=None):
+        """Return the audio as a WAV file in the specified format.
+
+        The audio is converted and resampled the first time a format is
+        requested. Subsequent calls return the cached WAV file.
+
+        Args:
+            sample_rate (int, optional): The sample rate. Defaults to the
+                sample rate of the file.
+            channels (int, optional): The number of channels. Defaults to the
+                number of channels of the file.
+            sample_width (int, optional): The width of a sample in bytes.
+                Defaults to the sample width of the file.
+
+        Returns:
+            bytes: The content of a WAV file, e.g. to publish as the payload
+            of a playBytes message.
+        """
+        wav_format = (sample_rate or self.sample_rate,
+                      channels or self.channels,
+                      sample_width or self.sample_width)
+
+        try:
+            return self._cache[wav_format]
+        except KeyError:
+            pass
+
+        if wav_format == (self.sample_rate, self.channels,
+                          self.sample_width):
+            pcm = self.pcm().tobytes()
+        else:
+            samples = pcm_to_samples(self.pcm(), self.sample_width,
+                                     self.channels)
+            samples = resample(samples, self.sample_rate, wav_format[0])
+            pcm = samples_to_pcm(samples, wav_format[2], wav_format[1])
+
+        wav = wav_header(len(pcm), *wav_format) + pcm
+        self._cache[wav_format] = wav
+        return wav
+
+    def close(self):
+        """Drop the cached WAV files and unmap the file."""
+        self._cache.clear()
+        self._mmap.close()
@@ -19,8 +19,15 @@ modules:
 """
 
 from abc import ABCMeta, abstractmethod
+import os
+from pathlib import Path
+import time
 
 from snipskit.config import SnipsConfig
+from snipskit.profiler import DEFAULT_DURATION, DEFAULT_INTERVAL, \
+    SamplingProfiler
+
+PROFILE_FILENAME = 'profile-{}-{}.folded'
 
 
 class SnipsComponent(metaclass=ABCMeta):
@@ -34,6 +41,8 @@ class SnipsComponent(metaclass=ABCMeta):
 
     Attributes:
         snips (:class:`.SnipsConfig`): The Snips configuration.
+        profiler (:class:`.SamplingProfiler`): The profiler of the component,
+            or `None` if profiling isn't enabled.
     """
 
     def __init__(self, snips=None):
@@ -48,6 +57,9 @@ class SnipsComponent(metaclass=ABCMeta):
         if not snips:
             snips = SnipsConfig()
         self.snips = snips
+        self.profiler = None
+        self.profile_directory = None
+        self.profile_duration = DEFAULT_DURATION
 
         self._connect()
         self.initialize()
@@ -67,6 +79,107 @@ class SnipsComponent(metaclass=ABCMeta):
         called between connecting to Snips and starting the event loop.
         """
 
+    def on_config_reload(self, changed):
+        """If your subclass of :class:`.SnipsComponent` has to react to a
+        reloaded configuration, add your code in this method. It will be
+        called by a :class:`.ConfigWatcher` object after it has replaced the
+        configuration objects of the component.
+
+        Args:
+            changed (list): The names of the reloaded attributes: 'snips',
+                'assistant' and/or 'config'.
+
+        .. versionadded:: 0.7.0
+        """
+
+    def enable_profiling(self, signum=None, directory=None,
+                         duration=DEFAULT_DURATION, interval=DEFAULT_INTERVAL,
+                         handlers_only=True):
+        """Enable on-demand profiling of the running component with a
+        :class:`.SamplingProfiler` object.
+
+        Call this method in :meth:`initialize`. The profiler is started and
+        stopped with the signal `signum`, or with the :attr:`profiler`
+        attribute. When a run has finished, the profile is written to
+        `directory` and the method :meth:`on_profile` is called.
+
+        Args:
+            signum (int, optional): A signal that starts the profiler, or stops
+                it if it's running, e.g. :data:`signal.SIGUSR1`. The signal
+                handler can only be installed in the main thread. Defaults to
+                `None`, which doesn't install a signal handler.
+            directory (str, optional): The directory to write the profiles to
+                in the collapsed format of FlameGraph, as
+                profile-<PID>-<time>.folded. Defaults to `None`, which doesn't
+                write the profiles.
+            duration (float, optional): The maximum time in seconds of a run
+                of the profiler. Defaults to 30.
+            interval (float, optional): The time in seconds between two
+                samples. Defaults to 5 milliseconds.
+            handlers_only (bool, optional): Whether to count only the samples
+                of threads that are running a method of the component, such as
+                a callback. Defaults to True.
+
+        .. versionadded:: 0.7.0
+        """
+        focus = self._handler_codes() if handlers_only else None
+        self.profiler = SamplingProfiler(interval, focus,
+                                         self._profile_finished)
+        self.profile_directory = directory
+        self.profile_duration = duration
+
+        if signum is not None:
+            import signal
+            signal.signal(signum, self._profile_signal)
+
+    def _handler_codes(self):
+        """Return the code objects of the methods that the subclasses of the
+        component define, including the methods wrapped by a decorator."""
+        codes = set()
+        for cls in type(self).__mro__:
+            if cls.__module__.startswith('snipskit.') or cls is object:
+                continue
+            for attribute in vars(cls).values():
+                functions = [attribute]
+                for cell in getattr(attribute, '__closure__', None) or ():
+                    try:
+                        functions.append(cell.cell_contents)
+                    except ValueError:
+                        # The cell is empty.
+                        pass
+                for function in functions:
+                    code = getattr(function, '__code__', None)
+                    if code is not None:
+                        codes.add(code)
+        return codes
+
+    def _profile_signal(self, signum, frame):
+        """Start the profiler, or stop it if it's running."""
+        if self.profiler.running:
+            self.profiler.stop(wait=False)
+        else:
+            self.profiler.start(self.profile_duration)
+
+    def _profile_finished(self, profile):
+        """Write a profile to the profile directory and call
+        :meth:`on_profile`."""
+        if self.profile_directory:
+            filename = PROFILE_FILENAME.format(os.getpid(),
+                                               time.strftime('%Y%m%d-%H%M%S'))
+            profile.write(str(Path(self.profile_directory) / filename))
+        self.on_profile(profile)
+
+    def on_profile(self, profile):
+        """If your subclass of :class:`.SnipsComponent` has to process a
+        profile, add your code in this method. It will be called in the thread
+        of the profiler when a run of the profiler has finished.
+
+        Args:
+            profile (:class:`.Profile`): The result of the run.
+
+        .. versionadded:: 0.7.0
+        """
+
     @abstractmethod
     def _start(self):
         """Connect with Snips.
@@ -11,27 +11,508 @@ Classes:
   connection to an MQTT broker.
 - :class:`.MQTTConfig`: Represents the configuration for a connection to an
   MQTT broker.
+- :class:`.MQTTConnection`: Represents the resolved parameters of a connection
+  to an MQTT broker as an immutable and hashable object.
 - :class:`.MQTTTLSConfig`: Represents the TLS settings for a connection to an
   MQTT broker.
 - :class:`.SnipsConfig`: Gives access to the configuration of a locally
   installed instance of Snips, stored in a TOML file.
+
+The parsed contents of snips.toml and assistant.json are cached for the whole
+process, keyed by the identity of the file (path, inode, modification time and
+size). When many apps are hosted in one process, each file is only parsed once
+and its contents are shared between all :class:`.SnipsConfig` and
+:class:`.AssistantConfig` objects as read-only data. Call
+:func:`invalidate_cache` to force a new parse.
+
+The parsed contents can also be stored in binary snapshots on disk, so the
+next process that reads the same file, e.g. after a restart of all apps,
+doesn't have to parse it again. Set the environment variable
+SNIPSKIT_SNAPSHOT_DIR to a directory or call :func:`set_snapshot_directory` to
+enable snapshots. A snapshot records the identity and the SHA-256 hash of its
+source file and is regenerated automatically when the source file changes.
 """
 
-from collections import UserDict
+import atexit
+from collections import namedtuple, UserDict
+from collections.abc import Mapping
 from configparser import ConfigParser
+from functools import wraps
+from hashlib import sha256
+from io import StringIO
 import json
+import marshal
+import mmap
+import os
 from pathlib import Path
+import re
+import socket
+import sys
+from threading import Lock, RLock, Timer
+import time
+from weakref import WeakValueDictionary
 
 from snipskit.exceptions import AssistantConfigNotFoundError, \
     SnipsConfigNotFoundError
 from snipskit.tools import find_path
-import toml
 
 SEARCH_PATH_SNIPS = ['/etc/snips.toml', '/usr/local/etc/snips.toml']
 SEARCH_PATH_ASSISTANT = ['/usr/share/snips/assistant/assistant.json',
                          '/usr/local/share/snips/assistant/assistant.json']
 
 DEFAULT_BROKER = 'localhost:1883'
+DEFAULT_PORT = 1883
+DEFAULT_DNS_TTL = 60
+
+# The cache of parsed configuration files, with the resolved path as key and a
+# tuple (file identity, read-only data) as value.
+_parse_cache = {}
+_parse_cache_lock = Lock()
+
+# The directory of the binary snapshots of parsed configuration files, or None
+# if snapshots are disabled. The header of a snapshot identifies the format
+# and the Python implementation, because the marshal format depends on it.
+_snapshot_directory = os.environ.get('SNIPSKIT_SNAPSHOT_DIR') or None
+_SNAPSHOT_HEADER = b'SKSNAP\x01' + sys.implementation.cache_tag.encode() + b'\n'
+
+
+def _read_only(*args, **kwargs):
+    """Refuse to change read-only configuration data."""
+    raise TypeError('The configuration is read-only')
+
+
+class _ReadOnlyDict(dict):
+    """A :class:`dict` that can't be changed."""
+
+    __setitem__ = __delitem__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return (self.__class__, (dict(self),))
+
+
+class _ReadOnlyList(list):
+    """A :class:`list` that can't be changed."""
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = clear = extend = insert = pop = remove = reverse = sort = \
+        _read_only
+
+    def __reduce__(self):
+        return (self.__class__, (list(self),))
+
+
+def _freeze(data):
+    """Return a read-only copy of parsed configuration data.
+
+    Dicts and lists are converted recursively to read-only subclasses, so they
+    still compare equal to and can be serialized like the original data.
+    """
+    if isinstance(data, dict):
+        return _ReadOnlyDict((key, _freeze(value))
+                             for key, value in data.items())
+    if isinstance(data, list):
+        return _ReadOnlyList(_freeze(value) for value in data)
+    return data
+
+
+def _stat_identity(filename):
+    """Return the identity of a file, which changes when the file is changed
+    or replaced.
+
+    Raises:
+        :exc:`FileNotFoundError`: If the file doesn't exist.
+    """
+    stat = os.stat(str(filename))
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def _file_identity(filename):
+    """Return the resolved path and the identity of a file.
+
+    Raises:
+        :exc:`FileNotFoundError`: If the file doesn't exist.
+    """
+    identity = _stat_identity(filename)
+    return str(Path(filename).resolve()), identity
+
+
+def load_cached(filename, loader):
+    """Return the parsed contents of a configuration file from the cache,
+    parsing it if it isn't cached yet or has changed since it was parsed.
+
+    Args:
+        filename (str): The path of the configuration file.
+        loader (function): A function that parses the file with the filename
+            as its argument, e.g. :func:`toml.load`.
+
+    Returns:
+        dict: The parsed contents of the file as read-only data.
+
+    Raises:
+        :exc:`FileNotFoundError`: If the file doesn't exist.
+
+    .. versionadded:: 0.7.0
+    """
+    path, identity = _file_identity(filename)
+
+    with _parse_cache_lock:
+        cached = _parse_cache.get(path)
+    if cached and cached[0] == identity:
+        return cached[1]
+
+    data = None
+    if _snapshot_directory:
+        data = _read_snapshot(path, identity, loader)
+    if data is None:
+        data = _load_with_snapshot(path, identity, loader)
+    data = _freeze(data)
+
+    with _parse_cache_lock:
+        _parse_cache[path] = (identity, data)
+
+    return data
+
+
+def invalidate_cache(filename=None):
+    """Remove a configuration file from the cache of parsed configuration
+    files.
+
+    Args:
+        filename (str, optional): The path of the configuration file. If the
+            argument is not specified, the whole cache is cleared.
+
+    .. versionadded:: 0.7.0
+    """
+    with _parse_cache_lock:
+        if filename is None:
+            _parse_cache.clear()
+        else:
+            _parse_cache.pop(str(Path(filename).resolve()), None)
+
+
+def set_snapshot_directory(directory):
+    """Set the directory of the binary snapshots of parsed configuration
+    files.
+
+    The snapshots contain the parsed contents of snips.toml and
+    assistant.json, including MQTT credentials, so the directory is created
+    with access for the current user only.
+
+    Args:
+        directory (str): The directory of the snapshots, or `None` to disable
+            snapshots.
+
+    .. versionadded:: 0.7.0
+    """
+    global _snapshot_directory
+    _snapshot_directory = str(directory) if directory else None
+
+
+def _snapshot_path(path, loader):
+    """Return the path of the snapshot of a file parsed by a loader."""
+    key = '{}\0{}'.format(path, loader.__name__).encode('utf-8')
+    return Path(_snapshot_directory) / (sha256(key).hexdigest() + '.snapshot')
+
+
+def _read_snapshot(path, identity, loader):
+    """Return the parsed contents of a file from its snapshot, or `None` if
+    there's no valid snapshot for the current contents of the file.
+
+    If the identity of the file has changed but its contents haven't, e.g.
+    after a copy or a touch, the snapshot is still used and updated.
+    """
+    snapshot_path = _snapshot_path(path, loader)
+    try:
+        snapshot = snapshot_path.read_bytes()
+    except OSError:
+        return None
+
+    if not snapshot.startswith(_SNAPSHOT_HEADER):
+        return None
+    try:
+        snapshot_source, snapshot_identity, digest, data = \
+            marshal.loads(snapshot[len(_SNAPSHOT_HEADER):])
+    except (EOFError, TypeError, ValueError):
+        return None
+
+    if snapshot_source != path:
+        return None
+    if tuple(snapshot_identity) == identity:
+        return data
+
+    try:
+        source = Path(path).read_bytes()
+    except OSError:
+        return None
+    if sha256(source).hexdigest() != digest:
+        return None
+
+    _write_snapshot(path, identity, digest, loader, data)
+    return data
+
+
+def _load_with_snapshot(path, identity, loader):
+    """Parse a file and write its snapshot if snapshots are enabled."""
+    if not _snapshot_directory:
+        return loader(path)
+
+    digest = sha256(Path(path).read_bytes()).hexdigest()
+    data = loader(path)
+
+    # Only write the snapshot if the file hasn't changed while parsing it.
+    if _file_identity(path)[1] == identity:
+        _write_snapshot(path, identity, digest, loader, data)
+
+    return data
+
+
+def _write_snapshot(path, identity, digest, loader, data):
+    """Write the snapshot of a parsed file. Errors are ignored: the file is
+    just parsed again the next time."""
+    try:
+        snapshot = _SNAPSHOT_HEADER + marshal.dumps((path, identity, digest,
+                                                     data))
+    except ValueError:
+        # The data contains types that marshal doesn't support, e.g. dates in
+        # TOML files.
+        return
+
+    try:
+        Path(_snapshot_directory).mkdir(mode=0o700, parents=True,
+                                        exist_ok=True)
+        _write_atomic(_snapshot_path(path, loader), snapshot)
+    except OSError:
+        pass
+
+
+def _load_toml(filename):
+    """Parse a TOML file.
+
+    The toml module is only imported when the first TOML file is parsed.
+    """
+    import toml
+    return toml.load(filename)
+
+
+def _load_json(filename):
+    """Parse a JSON file."""
+    with Path(filename).open('rt') as json_file:
+        return json.load(json_file)
+
+
+# The tokens that matter to find the top-level members of a JSON object: a
+# complete string (so brackets and commas inside it are skipped) or a
+# structural character. Numbers, literals and whitespace are skipped.
+_JSON_TOKENS = re.compile(rb'"(?:[^"\\]|\\.)*"|[{}\[\],:]', re.DOTALL)
+
+
+def _index_json_object(buffer):
+    """Find the byte offsets of the values of the top-level members of a JSON
+    object, without parsing the values.
+
+    Args:
+        buffer: A bytes-like object with the JSON document.
+
+    Returns:
+        dict: A dict with the keys of the top-level members as keys and a
+        tuple (start, end) with the byte offsets of their values as values.
+
+    Raises:
+        :exc:`json.JSONDecodeError`: If the document isn't a JSON object.
+    """
+    index = {}
+    depth = 0
+    key = None
+    value_start = None
+
+    for token in _JSON_TOKENS.finditer(buffer):
+        character = token.group()[:1]
+
+        if depth == 0:
+            if character != b'{':
+                break
+            depth = 1
+        elif depth == 1 and character == b'"' and key is None:
+            key = json.loads(token.group().decode('utf-8'))
+        elif depth == 1 and character == b':' and value_start is None:
+            value_start = token.end()
+        elif depth == 1 and character in (b',', b'}'):
+            if key is not None:
+                index[key] = (value_start, token.start())
+            key = value_start = None
+            if character == b'}':
+                return index
+        elif character in (b'{', b'['):
+            depth += 1
+        elif character in (b'}', b']'):
+            depth -= 1
+
+    raise json.JSONDecodeError('Expecting a complete JSON object',
+                               bytes(buffer[:80]).decode('utf-8', 'replace'),
+                               0)
+
+
+class _LazyJSONObject(Mapping):
+    """A read-only mapping of the top-level members of a JSON object in a
+    file. Each member is only parsed when it's accessed for the first time.
+
+    Each access checks whether the file has changed, so the members that have
+    already been parsed never come from another version of the file than the
+    members that are parsed now.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._sections = {}
+        self._lock = Lock()
+        self._index()
+
+    def _index(self):
+        """Index the top-level members of the JSON object in the file.
+
+        The file is memory-mapped if possible, so it doesn't have to be read
+        in memory at once.
+        """
+        with Path(self.filename).open('rb') as json_file:
+            self._identity = _stat_identity(self.filename)
+            try:
+                buffer = mmap.mmap(json_file.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                # E.g. an empty file or a file system without mmap support.
+                buffer = json_file.read()
+
+            try:
+                self._offsets = _index_json_object(buffer)
+            finally:
+                if isinstance(buffer, mmap.mmap):
+                    buffer.close()
+
+        self._sections.clear()
+
+    def _refresh(self):
+        """Index the file again if it has changed since it was indexed. The
+        lock must be held."""
+        if _stat_identity(self.filename) != self._identity:
+            self._index()
+
+    def refresh(self):
+        """Index the file again if it has changed since it was indexed.
+
+        Returns:
+            tuple: The identity of the indexed file.
+        """
+        with self._lock:
+            self._refresh()
+            return self._identity
+
+    def __getitem__(self, key):
+        with self._lock:
+            self._refresh()
+            try:
+                return self._sections[key]
+            except KeyError:
+                pass
+
+            start, end = self._offsets[key]
+            with Path(self.filename).open('rb') as json_file:
+                json_file.seek(start)
+                value = json_file.read(end - start).decode('utf-8')
+
+            self._sections[key] = _freeze(json.loads(value))
+            return self._sections[key]
+
+    def __iter__(self):
+        with self._lock:
+            self._refresh()
+            return iter(list(self._offsets))
+
+    def __len__(self):
+        with self._lock:
+            self._refresh()
+            return len(self._offsets)
+
+    def __contains__(self, key):
+        with self._lock:
+            self._refresh()
+            return key in self._offsets
+
+
+def _read_text(filename):
+    """Read the contents of a text file, or return `None` if it can't be
+    read."""
+    try:
+        with Path(filename).open('rt') as text_file:
+            return text_file.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def _write_atomic(filename, content):
+    """Replace the contents of a file atomically with a str or bytes.
+
+    The content is written to a temporary file in the same directory, which is
+    synced to disk and then renamed to the filename. The file is never left
+    half-written, even if the process crashes while writing.
+    """
+    path = Path(filename)
+    temporary_path = path.with_name('.{}.{}.tmp'.format(path.name,
+                                                        os.urandom(8).hex()))
+    try:
+        mode = 'wb' if isinstance(content, bytes) else 'wt'
+        with temporary_path.open(mode) as temporary_file:
+            temporary_file.write(content)
+            temporary_file.flush()
+            os.fsync(temporary_file.fileno())
+        try:
+            # Keep the permissions of the file, which can contain secrets.
+            os.chmod(str(temporary_path), os.stat(str(path)).st_mode)
+        except FileNotFoundError:
+            pass
+        os.replace(str(temporary_path), str(path))
+    except BaseException:
+        try:
+            temporary_path.unlink()
+        except FileNotFoundError:
+            pass
+        raise
+
+    # Make the rename durable too. Not every platform can sync a directory.
+    try:
+        directory = os.open(str(path.parent), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(directory)
+    except OSError:
+        pass
+    finally:
+        os.close(directory)
+
+
+# The AppConfig objects with changes that aren't written yet, which are
+# flushed when the interpreter exits. The key is the id of the object, because
+# a ConfigParser isn't hashable.
+_pending_app_configs = WeakValueDictionary()
+
+
+@atexit.register
+def _flush_app_configs():
+    """Write the pending changes of all AppConfig objects."""
+    for config in list(_pending_app_configs.values()):
+        config.flush()
+
+
+def _locked(method):
+    """Wrap a method of ConfigParser that changes the configuration, so it
+    can't run while the configuration is being written."""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._change_lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
 
 
 class AppConfig(ConfigParser):
@@ -40,6 +521,8 @@ class AppConfig(ConfigParser):
 
     Attributes:
         filename (str): The filename of the configuration file.
+        write_delay (float): The time in seconds that changes are collected
+            before they're written, or `None` to write them immediately.
 
     Example:
         >>> config = AppConfig()  # Use default file config.ini
@@ -47,59 +530,172 @@ class AppConfig(ConfigParser):
         'foobar'
         >>> config['secret']['api-key'] = 'barfoo'
         >>> config.write()
+
+    Apps that change their configuration often, e.g. to store a counter, can
+    collect the changes and write them at most once per interval, which saves
+    writes on flash storage:
+
+        >>> config = AppConfig(write_delay=5)
+        >>> config['state']['counter'] = '42'
+        >>> config.write()  # Written in 5 seconds or on exit.
+
+    The methods that change the configuration hold a lock that's also held
+    while the configuration is written, so the configuration can be changed
+    from other threads while a delayed write is running.
     """
 
-    def __init__(self, filename=None):
+    def __init__(self, filename=None, write_delay=None):
         """Initialize an :class:`.AppConfig` object.
 
         Args:
             filename (optional): A filename for the configuration file. If the
                 filename is not specified, the default filename 'config.ini'
                 in the current directory is chosen.
+            write_delay (float, optional): The time in seconds that changes
+                are collected after a call to :meth:`write` before the file is
+                written. Pending changes are also written by :meth:`flush` and
+                when the interpreter exits. Defaults to `None`, which writes
+                the file on each call to :meth:`write`.
+
+                .. versionadded:: 0.7.0
         """
 
+        self._change_lock = RLock()
         ConfigParser.__init__(self)
 
         if not filename:
             filename = 'config.ini'
 
         self.filename = filename
+        self.write_delay = write_delay
+
+        self._written = None
+        self._timer = None
+        self._write_lock = Lock()
 
         config_path = Path(filename)
 
         with config_path.open('rt') as config:
             self.read_file(config)
 
+    # Hold the lock for all changes, including the ones by SectionProxy
+    # objects, which call these methods.
+    set = _locked(ConfigParser.set)
+    add_section = _locked(ConfigParser.add_section)
+    remove_option = _locked(ConfigParser.remove_option)
+    remove_section = _locked(ConfigParser.remove_section)
+    read_dict = _locked(ConfigParser.read_dict)
+    _read = _locked(ConfigParser._read)
+    __setitem__ = _locked(ConfigParser.__setitem__)
+    __delitem__ = _locked(ConfigParser.__delitem__)
+
     def write(self, *args, **kwargs):
         """Write the current configuration to the app's configuration file.
 
         If this method is called without any arguments, the configuration is
-        written to the :attr:`filename` attribute of this object.
+        written to the :attr:`filename` attribute of this object. The file is
+        replaced atomically: the configuration is written to a temporary file
+        that is synced to disk and then renamed, so the file is never left
+        half-written. If the :attr:`write_delay` attribute isn't `None`, the
+        file is written after this delay, together with all changes that are
+        made in the meantime.
 
         If this method is called with any arguments, they are forwarded to the
         :meth:`configparser.ConfigParser.write` method of its superclass.
         """
         if len(args) + len(kwargs):
             super().write(*args, **kwargs)
+        elif self.write_delay is None:
+            self.flush()
         else:
-            with Path(self.filename).open('wt') as config:
-                super().write(config)
+            with self._write_lock:
+                _pending_app_configs[id(self)] = self
+                if self._timer is None:
+                    self._timer = Timer(self.write_delay, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+
+    @property
+    def pending(self):
+        """Check whether there are changes waiting to be written.
+
+        Returns:
+            bool: True if :meth:`write` has been called and the file hasn't
+            been written since.
+
+        .. versionadded:: 0.7.0
+        """
+        return id(self) in _pending_app_configs
+
+    def cancel(self):
+        """Discard a delayed write of the configuration.
+
+        The changes stay in this object, but they aren't written to the file
+        unless :meth:`write` or :meth:`flush` is called again.
+
+        Returns:
+            bool: True if there were changes waiting to be written.
+
+        .. versionadded:: 0.7.0
+        """
+        with self._write_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            return _pending_app_configs.pop(id(self), None) is not None
+
+    def flush(self):
+        """Write the configuration to the app's configuration file now,
+        replacing it atomically.
+
+        The file isn't written if it already has the same contents, so a file
+        that has been deleted or changed by someone else is always written.
+        If writing the file fails, the changes stay pending, so they're
+        written by the next call to :meth:`write` or :meth:`flush` or when the
+        interpreter exits.
+
+        .. versionadded:: 0.7.0
+        """
+        with self._write_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            content = StringIO()
+            with self._change_lock:
+                super().write(content)
+            content = content.getvalue()
+            if content != _read_text(self.filename):
+                _write_atomic(self.filename, content)
+            self._written = content
+            _pending_app_configs.pop(id(self), None)
 
 
 class AssistantConfig(UserDict):
     """This class gives access to the configuration of a Snips assistant as a
-    :class:`dict`.
+    read-only :class:`dict`.
 
     Attributes:
         filename (str): The filename of the configuration file.
+        lazy (bool): Whether the top-level sections of the configuration are
+            only parsed when they're accessed.
 
     Example:
         >>> assistant = AssistantConfig('/opt/assistant/assistant.json')
         >>> assistant['language']
         'en'
+
+    The intents, slots and entities of the assistant can be looked up by name
+    with indexes that are built the first time they're needed and rebuilt
+    when the configuration changes:
+
+        >>> assistant.slots('koan:lightsTurnOn')['room']['entityId']
+        'house_room'
+        >>> assistant.entities_for_value('kitchen')
+        ('house_room',)
     """
 
-    def __init__(self, filename=None):
+    def __init__(self, filename=None, lazy=False):
         """Initialize an :class:`.AssistantConfig` object.
 
         Args:
@@ -112,6 +708,15 @@ class AssistantConfig(UserDict):
                 - /usr/share/snips/assistant/assistant.json
                 - /usr/local/share/snips/assistant/assistant.json
 
+            lazy (bool, optional): Whether the top-level sections of the
+                configuration are only parsed when they're accessed. The file
+                is scanned once to find the location of each section, and only
+                the sections that are accessed are kept in memory. This is
+                useful for large assistants when you only need a few keys
+                such as 'language'. Defaults to False.
+
+                .. versionadded:: 0.7.0
+
         Raises:
             :exc:`FileNotFoundError`: If the specified filename doesn't exist.
 
@@ -119,30 +724,198 @@ class AssistantConfig(UserDict):
                 configuration found in the search path.
 
             :exc:`json.JSONDecodeError`: If the assistant's configuration
-                file doesn't have a valid JSON syntax.
+                file doesn't have a valid JSON syntax. In lazy mode, this is
+                only checked for the structure of the top-level object when
+                the object is initialized, and for each section when it's
+                accessed.
 
         Examples:
             >>> assistant = AssistantConfig()  # default configuration
             >>> assistant2 = AssistantConfig('/opt/assistant/assistant.json')
+            >>> assistant3 = AssistantConfig(lazy=True)
         """
         if filename:
             self.filename = filename
-            assistant_file = Path(filename)
         else:
             self.filename = find_path(SEARCH_PATH_ASSISTANT)
 
             if not self.filename:
                 raise AssistantConfigNotFoundError()
 
-            assistant_file = Path(self.filename)
+        self.lazy = lazy
+
+        # Use the assistant's configuration from the cache, or index it in
+        # lazy mode. This raises FileNotFoundError if the file doesn't exist
+        # and JSONDecodeError if the file doesn't have a valid JSON syntax.
+        if lazy:
+            self.data = _LazyJSONObject(self.filename)
+        else:
+            self.data = load_cached(self.filename, _load_json)
+
+        self._index_version = None
+        self._index = None
+
+    def _indexes(self):
+        """Return the lookup indexes of the configuration, building them if
+        they don't exist yet or if the configuration has changed since they
+        were built.
+
+        Returns:
+            dict: A dict with the indexes.
+        """
+        identity = self.data.refresh() if self.lazy else None
+        index_version = self._index_version
+        if index_version is None or index_version[0] is not self.data or \
+                index_version[1] != identity:
+            # The file has been indexed again above if it had changed, so the
+            # identity is the one the indexes are built from. If the file
+            # changes during the build, the identity doesn't match anymore
+            # and the indexes are rebuilt on the next call.
+            self._index = _build_assistant_indexes(self.data)
+            self._index_version = (self.data, identity)
+
+        return self._index
+
+    def intent_by_name(self, name):
+        """Return the configuration of an intent by its name.
+
+        The name is looked up in both the 'name' and the 'id' keys of the
+        intents in the configuration, so the full intent name as used in the
+        MQTT topics is accepted too.
+
+        Args:
+            name (str): The name of the intent.
+
+        Returns:
+            dict: The configuration of the intent, or `None` if the assistant
+            doesn't have this intent.
+
+        .. versionadded:: 0.7.0
+        """
+        return self._indexes()['intent_name'].get(name)
+
+    def intent_by_id(self, intent_id):
+        """Return the configuration of an intent by its ID.
+
+        Args:
+            intent_id (str): The ID of the intent.
+
+        Returns:
+            dict: The configuration of the intent, or `None` if the assistant
+            doesn't have this intent.
+
+        .. versionadded:: 0.7.0
+        """
+        return self._indexes()['intent_id'].get(intent_id)
+
+    def slots(self, intent_name):
+        """Return the slots of an intent.
 
-        # Open the assistant's file. This raises FileNotFoundError if the
-        # file doesn't exist.
-        with assistant_file.open('rt') as json_file:
-            # Create a dict with our configuration.
-            # This raises JSONDecodeError if the file doesn't have a
-            # valid JSON syntax.
-            UserDict.__init__(self, json.load(json_file))
+        Args:
+            intent_name (str): The name or ID of the intent.
+
+        Returns:
+            dict: A dict with the slot names as keys and the configuration of
+            the slots as values. The dict is empty if the assistant doesn't
+            have this intent.
+
+        .. versionadded:: 0.7.0
+        """
+        return self._indexes()['slots'].get(intent_name, {})
+
+    def entity(self, name):
+        """Return the configuration of an entity by its name.
+
+        Args:
+            name (str): The name of the entity.
+
+        Returns:
+            dict: The configuration of the entity, or `None` if the assistant
+            doesn't have this entity.
+
+        .. versionadded:: 0.7.0
+        """
+        return self._indexes()['entity'].get(name)
+
+    def entities_for_value(self, value):
+        """Return the entities that have a value or synonym.
+
+        Args:
+            value (str): The value or synonym.
+
+        Returns:
+            tuple: The names of the entities with this value or synonym. The
+            tuple is empty if no entity has this value.
+
+        .. versionadded:: 0.7.0
+        """
+        return self._indexes()['value'].get(value, ())
+
+
+def _entity_values(entity):
+    """Return the values and synonyms of an entity in an assistant's
+    configuration.
+
+    The values are read from a 'data' list with 'value' and 'synonyms' keys,
+    as in a Snips NLU dataset, or from a 'values' list of strings or of dicts
+    with 'value' and 'synonyms' keys.
+    """
+    values = []
+    for item in entity.get('data', entity.get('values', [])):
+        if isinstance(item, str):
+            values.append(item)
+        else:
+            values.append(item.get('value'))
+            values.extend(item.get('synonyms', []))
+
+    return [value for value in values if value]
+
+
+def _build_assistant_indexes(data):
+    """Build the lookup indexes of an assistant's configuration.
+
+    Args:
+        data (dict): The assistant's configuration.
+
+    Returns:
+        dict: A dict with the indexes 'intent_name', 'intent_id', 'slots',
+        'entity' and 'value'.
+    """
+    intent_name = {}
+    intent_id = {}
+    slots = {}
+
+    for intent in data.get('intents', []):
+        intent_slots = {slot['name']: slot
+                        for slot in intent.get('slots', []) if 'name' in slot}
+        keys = []
+        if 'id' in intent:
+            intent_id[intent['id']] = intent
+            keys.append(intent['id'])
+        if 'name' in intent:
+            keys.append(intent['name'])
+        for key in keys:
+            intent_name.setdefault(key, intent)
+            slots.setdefault(key, intent_slots)
+
+    entities = data.get('entities', {})
+    if isinstance(entities, dict):
+        entity = dict(entities)
+    else:
+        entity = {item.get('name', item.get('id')): item for item in entities}
+
+    value = {}
+    for name, configuration in entity.items():
+        for entity_value in _entity_values(configuration):
+            names = value.setdefault(entity_value, [])
+            if name not in names:
+                names.append(name)
+
+    return {'intent_name': intent_name,
+            'intent_id': intent_id,
+            'slots': slots,
+            'entity': entity,
+            'value': {key: tuple(names) for key, names in value.items()}}
 
 
 class MQTTAuthConfig:
@@ -240,6 +1013,175 @@ class MQTTTLSConfig:
         return self.hostname is not None
 
 
+def parse_broker_address(broker_address):
+    """Split the address of an MQTT broker into its host and port.
+
+    IPv6 addresses are written between square brackets if a port is
+    specified, as in URLs.
+
+    Args:
+        broker_address (str): The address of the MQTT broker, in the form
+            'host', 'host:port', '[ipv6]:port', '[ipv6]' or 'ipv6'.
+
+    Returns:
+        (str, int): A tuple with the host and port. The port defaults to 1883.
+        The host of an IPv6 address doesn't have square brackets.
+
+    Raises:
+        :exc:`ValueError`: If the address isn't valid.
+
+    Examples:
+        >>> parse_broker_address('mqtt.example.com:8883')
+        ('mqtt.example.com', 8883)
+        >>> parse_broker_address('[fd00::1]:1883')
+        ('fd00::1', 1883)
+
+    .. versionadded:: 0.7.0
+    """
+    if broker_address.startswith('['):
+        host, bracket, rest = broker_address[1:].partition(']')
+        if not bracket or (rest and not rest.startswith(':')):
+            raise ValueError('Invalid broker address {}'.format(broker_address))
+        port = rest[1:] if rest else DEFAULT_PORT
+    elif broker_address.count(':') == 1:
+        host, port = broker_address.split(':')
+    else:
+        # A host name, an IPv4 address or an IPv6 address without a port.
+        host, port = broker_address, DEFAULT_PORT
+
+    if not host:
+        raise ValueError('Invalid broker address {}'.format(broker_address))
+
+    return (host, int(port))
+
+
+# The cache of DNS lookups, with a tuple (host, port) as key and a tuple
+# (expiry time, addresses) as value.
+_dns_cache = {}
+_dns_cache_lock = Lock()
+
+
+class MQTTConnection(namedtuple('MQTTConnection',
+                                ['host', 'port', 'username', 'password',
+                                 'tls', 'ca_file', 'ca_path', 'client_key',
+                                 'client_cert', 'disable_root_store'])):
+    """This class represents the resolved parameters of a connection to an
+    MQTT broker.
+
+    An object of this class is immutable and hashable, so it can be used as a
+    key for connections, clients or TLS contexts that are shared between
+    components with the same connection settings. Get it from the
+    :attr:`.MQTTConfig.connection` attribute.
+
+    .. versionadded:: 0.7.0
+
+    Attributes:
+        host (str): The host to connect to: the TLS hostname if TLS is used,
+            otherwise the host of the broker address. An IPv6 address doesn't
+            have square brackets.
+        port (int): The port to connect to.
+        username (str): The username to authenticate to the MQTT broker, or
+            `None` if there's no authentication.
+        password (str): The password to authenticate to the MQTT broker. Can
+            be `None`.
+        tls (bool): Whether TLS is used.
+        ca_file (str): Path to the Certificate Authority file. Can be `None`.
+        ca_path (str): Path to the Certificate Authority files. Can be `None`.
+        client_key (str): Path to the private key file. Can be `None`.
+        client_cert (str): Path to the client certificate file. Can be `None`.
+        disable_root_store (bool): Whether the TLS root store is disabled.
+    """
+
+    __slots__ = ()
+
+    def __repr__(self):
+        # Don't show the password in logs and tracebacks.
+        password = None if self.password is None else '***'
+        return super(MQTTConnection, self._replace(password=password)).__repr__()
+
+    @property
+    def ipv6(self):
+        """Check whether the host is an IPv6 address.
+
+        Returns:
+            bool: True if the host is an IPv6 address.
+        """
+        return ':' in self.host
+
+    @property
+    def broker_address(self):
+        """Return the address of the host and port, with square brackets
+        around an IPv6 address.
+
+        Returns:
+            str: The address in the form 'host:port'.
+        """
+        if self.ipv6:
+            return '[{}]:{}'.format(self.host, self.port)
+        return '{}:{}'.format(self.host, self.port)
+
+    def addresses(self, ttl=DEFAULT_DNS_TTL):
+        """Return the socket addresses of the host, looked up in DNS.
+
+        The results are cached for all connections to the same host and port
+        during `ttl` seconds.
+
+        Args:
+            ttl (float, optional): The time in seconds to cache the results.
+                Defaults to 60.
+
+        Returns:
+            list: A list of tuples (family, address) as returned by
+            :func:`socket.getaddrinfo`, with `address` a tuple (host, port,
+            ...) of the socket address.
+
+        Raises:
+            :exc:`socket.gaierror`: If the host can't be resolved.
+        """
+        key = (self.host, self.port)
+        now = time.monotonic()
+
+        with _dns_cache_lock:
+            cached = _dns_cache.get(key)
+        if cached and cached[0] > now:
+            return cached[1]
+
+        addresses = [(family, address)
+                     for family, _, _, _, address
+                     in socket.getaddrinfo(self.host, self.port,
+                                           type=socket.SOCK_STREAM)]
+
+        with _dns_cache_lock:
+            _dns_cache[key] = (now + ttl, addresses)
+
+        return addresses
+
+    def auth_params(self):
+        """Return the authentication parameters.
+
+        Returns:
+            dict: A dict {'username': username, 'password': password} with the
+            authentication parameters, or `None` if no authentication is used.
+        """
+        if self.username:
+            return {'username': self.username, 'password': self.password}
+        return None
+
+    def tls_params(self):
+        """Return the TLS configuration parameters.
+
+        Returns:
+            dict: A dict {'ca_certs': ca_certs, 'certfile': certfile,
+            'keyfile': keyfile} with the TLS configuration parameters, or
+            `None` if no TLS connection is used.
+        """
+        if self.tls:
+            return {'ca_certs': self.ca_file,
+                    'certfile': self.client_cert,
+                    'keyfile': self.client_key}
+        return None
+
+
 class MQTTConfig:
     """This class represents the configuration for a connection to an
     MQTT broker.
@@ -248,29 +1190,69 @@ class MQTTConfig:
 
     Attributes:
         broker_address (str, optional): The address of the MQTT broker, in the
-            form 'host:port'.
+            form 'host:port'. If there are several brokers, this is the first
+            one.
+        brokers (list): The addresses of all MQTT brokers, in order of
+            preference.
+        spread (bool): Whether clients connect to a random reachable broker
+            instead of the one with the lowest round-trip time, to spread the
+            clients over the brokers.
         auth (:class:`.MQTTAuthConfig`, optional): The authentication
             settings (username and password) for the MQTT broker.
         tls (:class:`.MQTTTLSConfig`, optional): The TLS settings for the MQTT
             broker.
 
     """
-    def __init__(self, broker_address='localhost:1883', auth=None, tls=None):
+    def __setattr__(self, name, value):
+        if name == 'broker_address' and getattr(self, 'brokers', None) and \
+                self.brokers[0] != value:
+            # Keep the first broker in the list of brokers up to date.
+            object.__setattr__(self, 'brokers', [value] + self.brokers[1:])
+        object.__setattr__(self, name, value)
+        if name in ('broker_address', 'brokers', 'auth', 'tls'):
+            # Resolve the connection parameters again.
+            object.__setattr__(self, '_connection', None)
+            object.__setattr__(self, '_connections', None)
+
+    def __init__(self, broker_address='localhost:1883', auth=None, tls=None,
+                 spread=False):
         """Initialize a :class:`.MQTTConfig` object.
 
         Args:
-            broker_address (str, optional): The address of the MQTT broker, in
-                the form 'host:port'.
+            broker_address (str or list, optional): The address of the MQTT
+                broker, in the form 'host:port', or a list of addresses of
+                MQTT brokers in order of preference. Clients connect to the
+                reachable broker with the lowest round-trip time and fail over
+                to the other brokers.
+
+                .. versionchanged:: 0.7.0
+                   A list of brokers is accepted.
             auth (:class:`.MQTTAuthConfig`, optional): The authentication
                 settings (username and password) for the MQTT broker. Defaults
                 to a default :class:`.MQTTAuthConfig` object.
             tls (:class:`.MQTTTLSConfig`, optional): The TLS settings for the
                 MQTT broker. Defaults to a default :class:`.MQTTTLSConfig`
                 object.
+            spread (bool, optional): Whether clients connect to a random
+                reachable broker instead of the one with the lowest round-trip
+                time. Defaults to False.
+
+                .. versionadded:: 0.7.0
 
         All arguments are optional.
+
+        Raises:
+            :exc:`ValueError`: If the list of brokers is empty.
         """
-        self.broker_address = broker_address
+        if isinstance(broker_address, str):
+            self.brokers = [broker_address]
+        else:
+            self.brokers = list(broker_address)
+            if not self.brokers:
+                raise ValueError('The list of MQTT brokers is empty')
+
+        self.broker_address = self.brokers[0]
+        self.spread = spread
 
         if auth is None:
             self.auth = MQTTAuthConfig()
@@ -282,10 +1264,74 @@ class MQTTConfig:
         else:
             self.tls = tls
 
+    @property
+    def connection(self):
+        """Return the resolved parameters of the connection to the MQTT
+        broker.
+
+        The parameters are resolved the first time this attribute is accessed
+        and when the :attr:`broker_address`, :attr:`auth` or :attr:`tls`
+        attributes are replaced. Replace the :attr:`auth` or :attr:`tls`
+        attribute instead of changing its attributes after the connection is
+        resolved.
+
+        Returns:
+            :class:`.MQTTConnection`: The connection parameters.
+
+        Raises:
+            :exc:`ValueError`: If the broker address isn't valid.
+
+        .. versionadded:: 0.7.0
+        """
+        connection = self._connection
+        if connection is None:
+            host, port = parse_broker_address(self.broker_address)
+            if self.tls.hostname:
+                host = self.tls.hostname
+            connection = MQTTConnection(host, port, self.auth.username,
+                                        self.auth.password,
+                                        self.tls.hostname is not None,
+                                        self.tls.ca_file, self.tls.ca_path,
+                                        self.tls.client_key,
+                                        self.tls.client_cert,
+                                        bool(self.tls.disable_root_store))
+            self._connection = connection
+
+        return connection
+
+    @property
+    def connections(self):
+        """Return the resolved parameters of the connections to all MQTT
+        brokers, in the order of the :attr:`brokers` attribute.
+
+        If there are several brokers, the host of each broker is used as the
+        TLS hostname. With only one broker, this is a list with the
+        :attr:`connection` attribute.
+
+        Returns:
+            list: A list of :class:`.MQTTConnection` objects.
+
+        Raises:
+            :exc:`ValueError`: If a broker address isn't valid.
+
+        .. versionadded:: 0.7.0
+        """
+        connections = self._connections
+        if connections is None:
+            if len(self.brokers) == 1:
+                connections = [self.connection]
+            else:
+                connections = [self.connection._replace(host=host, port=port)
+                               for host, port
+                               in map(parse_broker_address, self.brokers)]
+            self._connections = connections
+
+        return connections
+
 
 class SnipsConfig(UserDict):
     """This class gives access to a snips.toml configuration file as a
-    :class:`dict`.
+    read-only :class:`dict`.
 
     Attributes:
         filename (str): The filename of the configuration file.
@@ -337,16 +1383,17 @@ class SnipsConfig(UserDict):
             if not self.filename:
                 raise SnipsConfigNotFoundError()
 
-        # Create a dict with our configuration.
+        # Use the configuration from the cache.
         # This raises TomlDecodeError if the file doesn't have a valid TOML
         # syntax.
-        UserDict.__init__(self, toml.load(self.filename))
+        self.data = load_cached(self.filename, _load_toml)
 
         # Now find all the MQTT options in the configuration file and use
         # sensible defaults for options that aren't specified.
         try:
-            # Basic MQTT connection settings.
+            # Basic MQTT connection settings: one broker or a list of brokers.
             broker_address = self['snips-common'].get('mqtt', DEFAULT_BROKER)
+            spread = self['snips-common'].get('mqtt_spread', False)
 
             # MQTT authentication
             username = self['snips-common'].get('mqtt_username', None)
@@ -369,7 +1416,8 @@ class SnipsConfig(UserDict):
                                    MQTTTLSConfig(tls_hostname, tls_ca_file,
                                                  tls_ca_path, tls_client_key,
                                                  tls_client_cert,
-                                                 tls_disable_root_store))
+                                                 tls_disable_root_store),
+                                   spread)
         except KeyError:
             # The 'snips-common' section isn't in the configuration file, so we
             # use a sensible default: 'localhost:1883'.
@@ -0,0 +1,336 @@
+"""This module contains a structured event log for the handlers of a Snips
+component that doesn't slow down the handlers.
+
+An :class:`.EventLog` object records an event for each call of a handler: the
+MQTT topic, the site ID, the session ID, the name of the handler and its
+duration. Recording an event only appends it to a :class:`collections.deque`,
+which doesn't take a lock. A background thread takes the events from the queue
+in batches and writes them to a file in the `JSON Lines`_ format, which is
+rotated when it's too large. So the file I/O never happens in the network
+thread that calls the handlers.
+
+.. _`JSON Lines`: http://jsonlines.org
+
+Events of topics with a high volume, such as the audioFrame messages, can be
+sampled: only a fraction of them is recorded, and each of these events has
+the sample rate in its 'sampleRate' field.
+
+Once an event log is installed with :func:`set_event_log`, the following
+handlers are logged automatically:
+
+- the methods with the :func:`snipskit.mqtt.decorators.topic` decorator;
+- the methods with one of the decorators in :mod:`snipskit.hermes.decorators`.
+
+Example:
+
+.. code-block:: python
+
+    from snipskit.events import EventLog, set_event_log
+    from snipskit.mqtt.apps import MQTTSnipsApp
+
+
+    class SimpleSnipsApp(MQTTSnipsApp):
+
+        def initialize(self):
+            event_log = EventLog('/var/log/simple-app/events.jsonl',
+                                 sample_rates={'hermes/audioServer/+/audioFrame': 0.01})
+            event_log.start()
+            set_event_log(event_log)
+
+A line of the event log looks like this:
+
+.. code-block:: json
+
+    {"time": 1564395832.52, "topic": "hermes/intent/User:Weather",
+     "siteId": "kitchen", "sessionId": "8e5f2c6a", "handler": "weather",
+     "duration": 0.0132}
+
+.. versionadded:: 0.7.0
+"""
+
+from collections import deque
+import json
+import os
+import random
+import sys
+from threading import Event, Thread
+import time
+import traceback
+
+from snipskit.tracing import _rotate_files
+
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 3
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_QUEUE_SIZE = 10000
+
+# The maximum number of topics with a cached sample rate.
+_MAX_TOPIC_RATES = 1000
+
+# The installed event log.
+_event_log = None
+
+
+def _topic_matches(subscription, topic):
+    """Check whether an MQTT topic matches a subscription with wildcards."""
+    subscription_levels = subscription.split('/')
+    topic_levels = topic.split('/')
+    for index, level in enumerate(subscription_levels):
+        if level == '#':
+            return True
+        if index >= len(topic_levels):
+            return False
+        if level != '+' and level != topic_levels[index]:
+            return False
+    return len(subscription_levels) == len(topic_levels)
+
+
+class EventLog:
+    """This class writes the events of handlers in batches to a JSON Lines
+    file in a background thread.
+
+    Attributes:
+        filename (str): The path of the event log.
+        max_bytes (int): The size in bytes at which the event log is rotated.
+        backup_count (int): The number of rotated event logs that are kept, as
+            <filename>.1, <filename>.2, and so on.
+        sample_rates (dict): A dict with MQTT topics, which can contain the
+            wildcards + and #, as keys and the fraction of their events that
+            are recorded as values.
+        flush_interval (float): The time in seconds between two batches.
+        last_error (:exc:`OSError`): The last error while writing a batch, or
+            `None`.
+    """
+
+    def __init__(self, filename, max_bytes=DEFAULT_MAX_BYTES,
+                 backup_count=DEFAULT_BACKUP_COUNT, sample_rates=None,
+                 flush_interval=DEFAULT_FLUSH_INTERVAL,
+                 queue_size=DEFAULT_QUEUE_SIZE):
+        """Initialize an :class:`.EventLog` object.
+
+        Call :meth:`start` to start the background thread that writes the
+        events.
+
+        Args:
+            filename (str): The path of the event log. New events are appended
+                to an existing file.
+            max_bytes (int, optional): The size in bytes at which the event
+                log is rotated. Defaults to 10 MiB.
+            backup_count (int, optional): The number of rotated event logs that
+                are kept. Defaults to 3.
+            sample_rates (dict, optional): A dict with MQTT topics as keys and
+                the fraction of their events that are recorded, between 0 and
+                1, as values. Defaults to recording all events.
+            flush_interval (float, optional): The time in seconds between two
+                batches. Defaults to 1.
+            queue_size (int, optional): The maximum number of events in the
+                queue. If the writer can't keep up, the oldest events are
+                dropped. Defaults to 10000.
+        """
+        self.filename = str(filename)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.sample_rates = dict(sample_rates or {})
+        self.flush_interval = flush_interval
+        self.last_error = None
+
+        self._queue = deque(maxlen=queue_size)
+        # The sample rate of each topic that has been seen.
+        self._topic_rates = {}
+        self._stop = Event()
+        self._thread = None
+
+    def _sample_rate(self, topic):
+        """Return the sample rate of a topic."""
+        rate = self._topic_rates.get(topic)
+        if rate is None:
+            if len(self._topic_rates) >= _MAX_TOPIC_RATES:
+                # Topics with an ID, e.g. of playBytes messages, are
+                # countless, so don't let the cache grow without bound.
+                self._topic_rates.clear()
+            rate = 1.0
+            for subscription, subscription_rate in self.sample_rates.items():
+                if _topic_matches(subscription, topic):
+                    rate = subscription_rate
+                    break
+            self._topic_rates[topic] = rate
+        return rate
+
+    def record(self, topic, handler, duration, site_id=None, session_id=None,
+               **fields):
+        """Record the event of a handler.
+
+        This only adds the event to the queue, it doesn't write it.
+
+        Args:
+            topic (str): The MQTT topic of the message.
+            handler (str): The name of the handler.
+            duration (float): The duration of the handler in seconds.
+            site_id (str, optional): The site ID of the message.
+            session_id (str, optional): The session ID of the message.
+            **fields: Extra fields of the event. Values that can't be
+                serialized to JSON, such as a datetime, are written as
+                strings.
+
+        Returns:
+            bool: True if the event has been recorded; False if it has been
+            left out by sampling.
+        """
+        rate = self._sample_rate(topic) if topic else 1.0
+        if rate < 1.0:
+            if random.random() >= rate:
+                return False
+            fields['sampleRate'] = rate
+
+        fields.update(time=time.time(), topic=topic, siteId=site_id,
+                      sessionId=session_id, handler=handler,
+                      duration=round(duration, 6))
+        self._queue.append(fields)
+        return True
+
+    def record_call(self, topic, handler, call, site_id=None,
+                    session_id=None):
+        """Call a handler and record its event, also if it raises an
+        exception.
+
+        Args:
+            topic (str): The MQTT topic of the message.
+            handler (str): The name of the handler.
+            call (function): A function without arguments that calls the
+                handler.
+            site_id (str, optional): The site ID of the message.
+            session_id (str, optional): The session ID of the message.
+
+        Returns:
+            The return value of `call`.
+        """
+        start = time.perf_counter()
+        try:
+            result = call()
+        except Exception as error:
+            self.record(topic, handler, time.perf_counter() - start, site_id,
+                        session_id, error=type(error).__name__)
+            raise
+
+        self.record(topic, handler, time.perf_counter() - start, site_id,
+                    session_id)
+        return result
+
+    def flush(self):
+        """Write all events in the queue to the event log.
+
+        Returns:
+            int: The number of events written.
+        """
+        events = []
+        try:
+            while True:
+                events.append(self._queue.popleft())
+        except IndexError:
+            pass
+
+        if not events:
+            return 0
+
+        batch = ''.join(json.dumps(event, sort_keys=True, default=str) + '\n'
+                        for event in events)
+        try:
+            size = os.path.getsize(self.filename)
+        except OSError:
+            size = 0
+        if size and size + len(batch) > self.max_bytes:
+            _rotate_files(self.filename, self.backup_count)
+
+        with open(self.filename, 'at') as event_file:
+            event_file.write(batch)
+
+        return len(events)
+
+    def _flush_batch(self):
+        """Write a batch of events, reporting an error instead of raising
+        it."""
+        try:
+            self.flush()
+        except Exception as error:
+            self.last_error = error
+            print('Exception while writing the event log {}:'
+                  .format(self.filename), file=sys.stderr)
+            traceback.print_exception(type(error), error, error.__traceback__)
+
+    def _run(self):
+        """Write the events in batches until the event log is stopped.
+
+        If a batch can't be written, e.g. because the disk is full, the error
+        is reported and the thread keeps running.
+        """
+        while not self._stop.wait(self.flush_interval):
+            self._flush_batch()
+        self._flush_batch()
+
+    def start(self):
+        """Start writing the events in a daemon thread."""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop.clear()
+        self._thread = Thread(target=self._run, name='EventLog', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Stop the background thread after writing the remaining events.
+
+        Args:
+            timeout (float, optional): The maximum time in seconds to wait for
+                the thread to stop. Defaults to waiting until it has stopped.
+        """
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+def set_event_log(event_log):
+    """Install an event log for the whole process.
+
+    Args:
+        event_log (:class:`.EventLog`): The event log, or `None` to stop
+            logging events.
+    """
+    global _event_log
+    _event_log = event_log
+
+
+def get_event_log():
+    """Return the installed event log.
+
+    Returns:
+        :class:`.EventLog`: The event log, or `None` if no events are logged.
+    """
+    return _event_log
+
+
+def logged(handler, topic, handle):
+    """Wrap a function that handles a decoded MQTT payload, so each call is
+    recorded in the installed event log.
+
+    Args:
+        handler (str): The name of the handler.
+        topic (str): The MQTT topic of the message.
+        handle (function): The function that handles the decoded payload.
+
+    Returns:
+        function: The wrapped function.
+    """
+    def wrapped(payload):
+        event_log = _event_log
+        if event_log is None:
+            return handle(payload)
+
+        site_id = session_id = None
+        if isinstance(payload, dict):
+            site_id = payload.get('siteId')
+            session_id = payload.get('sessionId')
+
+        return event_log.record_call(topic, handler, lambda: handle(payload),
+                                     site_id, session_id)
+    return wrapped
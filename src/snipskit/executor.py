@@ -0,0 +1,149 @@
+"""This module contains an executor that runs callbacks in a pool of worker
+threads, keeping the order of the callbacks of each session.
+
+Callbacks that are called by a library on one thread, such as the callbacks
+of Hermes Python, block each other: a slow handler of one session delays the
+messages of all other sessions. A :class:`.SessionExecutor` object runs them
+on a bounded pool of threads instead. Callbacks with the same key, e.g. the
+session ID, still run one after another in the order they were submitted, so a
+handler never sees the sessionEnded message of a session before its intent.
+
+The class :class:`.HermesSnipsComponent` uses a :class:`.SessionExecutor`
+object for the callbacks that are offloaded with the `workers` attribute of the
+component or the :func:`snipskit.hermes.decorators.offload` decorator.
+
+Example:
+
+.. code-block:: python
+
+    from snipskit.executor import SessionExecutor
+
+    executor = SessionExecutor(max_workers=4)
+    executor.submit(session_id, handle_intent, hermes, intent_message)
+
+.. versionadded:: 0.7.0
+"""
+
+from collections import deque
+import sys
+from threading import BoundedSemaphore, Lock
+import traceback
+
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_PENDING = 1000
+
+
+def _print_error(error, key):
+    """Print the traceback of an exception in a callback to stderr."""
+    print('Exception in callback of session {}:'.format(key), file=sys.stderr)
+    traceback.print_exception(type(error), error, error.__traceback__)
+
+
+class SessionExecutor:
+    """This class runs callbacks in a pool of worker threads, in order per
+    key.
+
+    Attributes:
+        max_workers (int): The maximum number of worker threads.
+        max_pending (int): The maximum number of callbacks that are submitted
+            but haven't finished.
+        on_error (function): The function that is called with the exception
+            and the key when a callback raises an exception.
+        last_error (:exc:`Exception`): The last exception raised by a
+            callback, or `None`.
+    """
+
+    def __init__(self, max_workers=DEFAULT_WORKERS,
+                 max_pending=DEFAULT_MAX_PENDING, on_error=_print_error):
+        """Initialize a :class:`.SessionExecutor` object.
+
+        Args:
+            max_workers (int, optional): The maximum number of worker threads.
+                Defaults to 4.
+            max_pending (int, optional): The maximum number of callbacks that
+                are submitted but haven't finished. :meth:`submit` blocks when
+                this number is reached, so a flood of messages doesn't queue
+                up without bound. Defaults to 1000.
+            on_error (function, optional): A function that is called with the
+                exception and the key when a callback raises an exception.
+                Defaults to printing the traceback to stderr.
+        """
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.on_error = on_error
+        self.last_error = None
+
+        # concurrent.futures is slow to import, so only import it when it's
+        # needed.
+        from concurrent.futures import ThreadPoolExecutor
+
+        self._executor = ThreadPoolExecutor(max_workers)
+        self._pending = BoundedSemaphore(max_pending)
+        self._lock = Lock()
+        # The callbacks waiting for the running callback of their key.
+        self._queues = {}
+
+    def submit(self, key, function, *args):
+        """Run a function in a worker thread, after the functions submitted
+        earlier with the same key.
+
+        Args:
+            key: The key that orders the functions, e.g. a session ID. With
+                `None`, the function isn't ordered with other functions.
+            function (function): The function to run.
+            *args: The arguments of the function.
+        """
+        self._pending.acquire()
+        task = (key, function, args)
+
+        if key is None:
+            self._executor.submit(self._run, task)
+            return
+
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue is not None:
+                # A function with this key is running, wait for it.
+                queue.append(task)
+                return
+            self._queues[key] = deque()
+
+        self._executor.submit(self._run, task)
+
+    def _run(self, task):
+        """Run a task and then the tasks with the same key that are waiting.
+        """
+        key = task[0]
+        while task is not None:
+            _, function, args = task
+            try:
+                function(*args)
+            except Exception as error:
+                self.last_error = error
+                if self.on_error:
+                    try:
+                        self.on_error(error, key)
+                    except Exception as handler_error:
+                        # Never let a broken error handler strand the
+                        # callbacks waiting for this key.
+                        _print_error(handler_error, key)
+            finally:
+                self._pending.release()
+
+                task = None
+                if key is not None:
+                    with self._lock:
+                        queue = self._queues[key]
+                        if queue:
+                            task = queue.popleft()
+                        else:
+                            del self._queues[key]
+
+    def shutdown(self, wait=True):
+        """Stop the worker threads after running the submitted functions.
+
+        Args:
+            wait (bool, optional): Whether to wait until the functions have
+                finished. Defaults to True.
+        """
+        self._executor.shutdown(wait)
@@ -25,9 +25,11 @@ Example:
             print('I received intent "User:ExampleIntent"')
 """
 
-from hermes_python.hermes import Hermes
-from hermes_python.ontology import MqttOptions
+from functools import wraps
+
 from snipskit.components import SnipsComponent
+from snipskit.executor import DEFAULT_MAX_PENDING, DEFAULT_WORKERS, \
+    SessionExecutor
 
 
 class HermesSnipsComponent(SnipsComponent):
@@ -36,13 +38,35 @@ class HermesSnipsComponent(SnipsComponent):
     Attributes:
         snips (:class:`.SnipsConfig`): The Snips configuration.
         hermes (:class:`hermes_python.hermes.Hermes`): The Hermes object.
-
+        workers (int): The number of worker threads that run the callbacks.
+            With the default value 0, the callbacks run on the callback
+            thread of Hermes Python, except the callbacks with the
+            :func:`snipskit.hermes.decorators.offload` decorator, which run
+            on 4 worker threads. Set this class attribute in a subclass to run
+            all callbacks in worker threads, in order per session.
+        max_pending (int): The maximum number of offloaded callbacks that
+            haven't finished. The callback thread of Hermes Python waits when
+            this number is reached.
+        executor (:class:`.SessionExecutor`): The executor of the offloaded
+            callbacks, or `None` if no callbacks are offloaded.
+
+    .. versionchanged:: 0.7.0
+       The attributes `workers`, `max_pending` and `executor`.
     """
 
+    workers = 0
+    max_pending = DEFAULT_MAX_PENDING
+    executor = None
+
     def _connect(self):
         """Connect with the MQTT broker referenced in the snips configuration
         file.
         """
+        # Loading the native library of Hermes Python is slow, so only do it
+        # when a component connects.
+        from hermes_python.hermes import Hermes
+        from hermes_python.ontology import MqttOptions
+
         mqtt_options = self.snips.mqtt
         self.hermes = Hermes(mqtt_options=MqttOptions(mqtt_options.broker_address,
                                                       mqtt_options.auth.username,
@@ -75,6 +99,8 @@ class HermesSnipsComponent(SnipsComponent):
             # of the decorators.
             if hasattr(callable_name, 'subscribe_method'):
                 subscribe_method = getattr(callable_name, 'subscribe_method')
+                if getattr(callable_name, 'offload', self.workers > 0):
+                    callable_name = self._offloaded(callable_name)
                 # If we have given the method a subscribe_parameter attribute
                 # by one of the decorators.
                 if hasattr(callable_name, 'subscribe_parameter'):
@@ -88,3 +114,16 @@ class HermesSnipsComponent(SnipsComponent):
                     # Register callable_name as a callback with
                     # subscribe_method.
                     getattr(self.hermes, subscribe_method)(callable_name)
+
+    def _offloaded(self, callback):
+        """Wrap a callback so it runs in the worker threads of the component,
+        in order per session."""
+        if self.executor is None:
+            self.executor = SessionExecutor(self.workers or DEFAULT_WORKERS,
+                                            self.max_pending)
+
+        @wraps(callback)
+        def offloaded(hermes, message):
+            self.executor.submit(getattr(message, 'session_id', None),
+                                 callback, hermes, message)
+        return offloaded
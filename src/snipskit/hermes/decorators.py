@@ -20,22 +20,111 @@ Example:
         @intent('User:ExampleIntent')
         def example_intent(self, hermes, intent_message):
             print('I received intent "User:ExampleIntent"')
+
+If a tracer is installed with :func:`snipskit.tracing.set_tracer`, each call of
+a decorated method is traced as a span of the session of the message. If an
+event log is installed with :func:`snipskit.events.set_event_log`, each call is
+logged.
 """
 
+from functools import wraps
+
+from snipskit.events import get_event_log
+from snipskit.tracing import get_tracer, span
+
+INTENT = 'hermes/intent/{}'
 
-def intent(intent_name):
+
+def _instrumented(method, topic=None):
+    """Wrap a callback so its calls are traced in the session of the message
+    and logged.
+
+    The topic of an intent message is derived from the intent name if it's
+    not given.
+    """
+    @wraps(method)
+    def wrapped(self, hermes, message):
+        event_log = get_event_log()
+        if event_log is None and get_tracer() is None:
+            # Don't pay for a span if nothing is traced or logged.
+            return method(self, hermes, message)
+
+        session_id = getattr(message, 'session_id', None)
+        with span(method.__name__, session_id):
+            if event_log is None:
+                return method(self, hermes, message)
+
+            message_topic = topic
+            if message_topic is None:
+                intent = getattr(message, 'intent', None)
+                message_topic = INTENT.format(getattr(intent, 'intent_name',
+                                                      '+'))
+            return event_log.record_call(message_topic, method.__name__,
+                                         lambda: method(self, hermes,
+                                                        message),
+                                         getattr(message, 'site_id', None),
+                                         session_id)
+    return wrapped
+
+
+def intent(intent_name, offload=None):
     """Apply this decorator to a method of class :class:`.HermesSnipsComponent`
     to register it as a callback to be triggered when the intent `intent_name`
     is recognized.
 
     Args:
         intent_name (str): The intent you want to subscribe to.
+        offload (bool, optional): Whether the callback runs in the worker
+            threads of the component, see :func:`offload`. Defaults to `None`,
+            which follows the `workers` attribute of the component.
 
+    .. versionchanged:: 0.7.0
+       The argument `offload`.
     """
     def inner(method):
         """The method to apply the decorator to."""
+        method = _instrumented(method, INTENT.format(intent_name))
         method.subscribe_method = 'subscribe_intent'
         method.subscribe_parameter = intent_name
+        if offload is not None:
+            method.offload = offload
+        return method
+    return inner
+
+
+def offload(enabled=True):
+    """Apply this decorator to a method of class :class:`.HermesSnipsComponent`
+    above one of the other decorators, to choose whether the callback runs in
+    the worker threads of the component or on the callback thread of Hermes
+    Python.
+
+    Offloaded callbacks of the same session run one after another, in the
+    order of their messages, but they don't block the callbacks of other
+    sessions.
+
+    Args:
+        enabled (bool, optional): Whether the callback runs in the worker
+            threads. Defaults to True.
+
+    The decorator can also be applied without parentheses, as `@offload`.
+
+    Example:
+
+        >>> @offload()
+        ... @intent('User:Weather')
+        ... def weather(self, hermes, intent_message):
+        ...     forecast = slow_web_service()
+
+    .. versionadded:: 0.7.0
+    """
+    if callable(enabled):
+        # The decorator is applied without parentheses.
+        enabled.offload = True
+        return enabled
+
+    def inner(method):
+        """The method to apply the decorator to."""
+        method.offload = enabled
         return method
     return inner
 
@@ -45,6 +134,8 @@ def intent_not_recognized(method):
     to register it as a callback to be triggered when the dialogue manager
     doesn't recognize an intent.
     """
+    method = _instrumented(method,
+                           'hermes/dialogueManager/intentNotRecognized')
     method.subscribe_method = 'subscribe_intent_not_recognized'
     return method
 
@@ -54,6 +145,7 @@ def intents(method):
     to register it as a callback to be triggered everytime an intent is
     recognized.
     """
+    method = _instrumented(method)
     method.subscribe_method = 'subscribe_intents'
     return method
 
@@ -63,6 +155,7 @@ def session_ended(method):
     to register it as a callback to be triggered when the dialogue manager ends
     a session.
     """
+    method = _instrumented(method, 'hermes/dialogueManager/sessionEnded')
     method.subscribe_method = 'subscribe_session_ended'
     return method
 
@@ -72,6 +165,7 @@ def session_queued(method):
     to register it as a callback to be triggered when the dialogue manager
     queues the current session.
     """
+    method = _instrumented(method, 'hermes/dialogueManager/sessionQueued')
     method.subscribe_method = 'subscribe_session_queued'
     return method
 
@@ -81,5 +175,6 @@ def session_started(method):
     to register it as a callback to be triggered when the dialogue manager
     queues starts a new session.
     """
+    method = _instrumented(method, 'hermes/dialogueManager/sessionStarted')
     method.subscribe_method = 'subscribe_session_started'
     return method
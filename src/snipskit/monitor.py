@@ -0,0 +1,412 @@
+"""This module contains a class to monitor the resource usage of the Snips
+services continuously.
+
+A :class:`.ServiceMonitor` object samples the CPU usage, resident memory,
+number of threads and number of file descriptors of all `snips-*` processes
+at a fixed interval, in a background thread. The samples of each service are
+stored in fixed-size ring buffers (:class:`.RingBuffer`) backed by arrays, so
+the memory usage of the monitor doesn't grow over time.
+
+The monitor computes rolling statistics over the samples in its buffers,
+including the trend of a metric, calls callbacks when a metric crosses a
+threshold and can publish a compact summary on an MQTT broker.
+
+Example:
+
+.. code-block:: python
+
+    from snipskit.monitor import ServiceMonitor
+
+    def memory_creep(service, metric, value):
+        print('{} uses {} bytes of memory'.format(service, value))
+
+    monitor = ServiceMonitor(interval=10)
+    monitor.add_threshold('snips-asr', 'rss', 500 * 1024 * 1024,
+                          memory_creep)
+    monitor.start()
+
+    # Later:
+    print(monitor.statistics('snips-nlu', 'cpu'))
+    print(monitor.trend('snips-asr', 'rss'))  # bytes per second
+
+.. versionadded:: 0.7.0
+"""
+
+from array import array
+import json
+import socket
+import sys
+from threading import Event, Lock, Thread
+import time
+import traceback
+
+DEFAULT_INTERVAL = 5.0
+DEFAULT_SIZE = 720
+SERVICE_PREFIX = 'snips-'
+SUMMARY_TOPIC = 'snipskit/monitor/{}/summary'
+
+METRICS = ('cpu', 'rss', 'threads', 'fds')
+
+
+class RingBuffer:
+    """This class represents a fixed-size buffer of numbers that overwrites
+    its oldest values when it's full.
+
+    The values are stored in an :class:`array.array` object.
+
+    Attributes:
+        capacity (int): The maximum number of values in the buffer.
+    """
+
+    def __init__(self, capacity, typecode='d'):
+        """Initialize a :class:`.RingBuffer` object.
+
+        Args:
+            capacity (int): The maximum number of values in the buffer.
+            typecode (str, optional): The type code of the values, as used by
+                :class:`array.array`. Defaults to 'd' (float).
+        """
+        self.capacity = capacity
+        self._values = array(typecode, [0]) * capacity
+        self._start = 0
+        self._length = 0
+
+    def append(self, value):
+        """Add a value to the buffer, overwriting the oldest value if the
+        buffer is full.
+
+        Args:
+            value (float): The value.
+        """
+        if self._length < self.capacity:
+            self._values[(self._start + self._length) % self.capacity] = value
+            self._length += 1
+        else:
+            self._values[self._start] = value
+            self._start = (self._start + 1) % self.capacity
+
+    def values(self):
+        """Return the values in the buffer, from the oldest to the newest.
+
+        Returns:
+            :class:`array.array`: A copy of the values.
+        """
+        end = self._start + self._length
+        if end <= self.capacity:
+            return self._values[self._start:end]
+        return self._values[self._start:] + \
+            self._values[:end - self.capacity]
+
+    def last(self):
+        """Return the newest value in the buffer.
+
+        Returns:
+            float: The newest value, or `None` if the buffer is empty.
+        """
+        if not self._length:
+            return None
+        return self._values[(self._start + self._length - 1) % self.capacity]
+
+    def __len__(self):
+        return self._length
+
+
+def _sample_process(process):
+    """Return the metrics of a process as a tuple in the order of METRICS."""
+    with process.oneshot():
+        cpu = process.cpu_percent()
+        rss = process.memory_info().rss
+        threads = process.num_threads()
+        try:
+            fds = process.num_fds()
+        except AttributeError:
+            # Windows has handles instead of file descriptors.
+            fds = process.num_handles()
+    return (cpu, rss, threads, fds)
+
+
+class ServiceMonitor:
+    """This class samples the resource usage of the Snips services at a fixed
+    interval.
+
+    The metrics of all processes of a service are added up. They are:
+
+    - 'cpu': the CPU usage in percent of one CPU since the previous sample;
+    - 'rss': the resident set size in bytes;
+    - 'threads': the number of threads;
+    - 'fds': the number of file descriptors.
+
+    Attributes:
+        interval (float): The time in seconds between two samples.
+        size (int): The number of samples kept for each service.
+        client (`paho.mqtt.client.Client`_): The MQTT client to publish a
+            summary after each sample with, or `None`.
+        topic (str): The MQTT topic of the summary.
+        last_error (:exc:`Exception`): The last exception raised while
+            sampling in the thread of the monitor, or `None`.
+
+    .. _`paho.mqtt.client.Client`: https://www.eclipse.org/paho/clients/python/docs/#client
+    """
+
+    def __init__(self, interval=DEFAULT_INTERVAL, size=DEFAULT_SIZE,
+                 client=None, topic=None):
+        """Initialize a :class:`.ServiceMonitor` object.
+
+        Args:
+            interval (float, optional): The time in seconds between two
+                samples. Defaults to 5.
+            size (int, optional): The number of samples kept for each
+                service. Defaults to 720 (one hour with the default interval).
+            client (`paho.mqtt.client.Client`_, optional): An MQTT client to
+                publish a summary after each sample with. Defaults to `None`,
+                which doesn't publish anything.
+            topic (str, optional): The MQTT topic of the summary. Defaults to
+                'snipskit/monitor/<hostname>/summary'.
+
+        .. _`paho.mqtt.client.Client`: https://www.eclipse.org/paho/clients/python/docs/#client
+        """
+        self.interval = interval
+        self.size = size
+        self.client = client
+        if topic is None:
+            topic = SUMMARY_TOPIC.format(socket.gethostname())
+        self.topic = topic
+        self.last_error = None
+
+        self._buffers = {}
+        self._processes = {}
+        self._thresholds = []
+        self._lock = Lock()
+        self._stop = Event()
+        self._thread = None
+
+    @property
+    def services(self):
+        """Return the names of the services that have been sampled.
+
+        Returns:
+            list: The names of the services, sorted.
+        """
+        with self._lock:
+            return sorted(self._buffers)
+
+    def add_threshold(self, service, metric, limit, callback):
+        """Call a function when a metric of a service rises above a limit.
+
+        The function is called once when the metric crosses the limit, and
+        again only after the metric has fallen to the limit or below.
+
+        Args:
+            service (str): The name of the service, e.g. 'snips-asr'.
+            metric (str): The metric: 'cpu', 'rss', 'threads' or 'fds'.
+            limit (float): The limit.
+            callback (function): The function to call with the signature
+                callback(service, metric, value).
+
+        Raises:
+            :exc:`ValueError`: If the metric doesn't exist.
+        """
+        if metric not in METRICS:
+            raise ValueError('Unknown metric {}'.format(metric))
+
+        with self._lock:
+            self._thresholds.append([service, metric, limit, callback, False])
+
+    def _scan(self):
+        """Return the current processes of the Snips services, reusing the
+        process objects of earlier samples so their CPU usage is measured
+        since the previous sample."""
+        from psutil import process_iter
+
+        processes = {}
+        for process in process_iter(['name']):
+            name = process.info['name']
+            if name and name.startswith(SERVICE_PREFIX):
+                processes[process.pid] = self._processes.get(process.pid,
+                                                             process)
+        self._processes = processes
+        return processes
+
+    def sample(self):
+        """Sample the resource usage of the Snips services once.
+
+        Returns:
+            dict: A dict with the service names as keys and a dict with the
+            metrics as values.
+        """
+        from psutil import Error
+
+        now = time.time()
+        samples = {}
+        for process in self._scan().values():
+            try:
+                metrics = _sample_process(process)
+            except Error:
+                # The process has exited or isn't accessible.
+                continue
+            name = process.info['name']
+            totals = samples.setdefault(name, [0] * len(METRICS))
+            for index, value in enumerate(metrics):
+                totals[index] += value
+
+        alarms = []
+        with self._lock:
+            for name, totals in samples.items():
+                buffers = self._buffers.get(name)
+                if buffers is None:
+                    buffers = {metric: RingBuffer(self.size)
+                               for metric in ('time',) + METRICS}
+                    self._buffers[name] = buffers
+                buffers['time'].append(now)
+                for metric, value in zip(METRICS, totals):
+                    buffers[metric].append(value)
+
+            for threshold in self._thresholds:
+                service, metric, limit, callback, triggered = threshold
+                if service not in samples:
+                    continue
+                value = samples[service][METRICS.index(metric)]
+                threshold[4] = value > limit
+                if value > limit and not triggered:
+                    alarms.append((callback, service, metric, value))
+
+        for callback, service, metric, value in alarms:
+            callback(service, metric, value)
+
+        if self.client is not None:
+            self.client.publish(self.topic, json.dumps(self.summary()))
+
+        return {name: dict(zip(METRICS, totals))
+                for name, totals in samples.items()}
+
+    def values(self, service, metric):
+        """Return the sampled values of a metric of a service.
+
+        Args:
+            service (str): The name of the service.
+            metric (str): The metric: 'time', 'cpu', 'rss', 'threads' or
+                'fds'. The 'time' metric is the time of the samples in seconds
+                since the epoch.
+
+        Returns:
+            :class:`array.array`: The values from the oldest to the newest.
+            The array is empty if the service hasn't been sampled.
+        """
+        with self._lock:
+            buffers = self._buffers.get(service)
+            if buffers is None:
+                return array('d')
+            return buffers[metric].values()
+
+    def statistics(self, service, metric):
+        """Return rolling statistics of a metric of a service over the samples
+        in the buffer.
+
+        Args:
+            service (str): The name of the service.
+            metric (str): The metric: 'cpu', 'rss', 'threads' or 'fds'.
+
+        Returns:
+            dict: A dict with the keys 'last', 'mean', 'min' and 'max', or
+            `None` if the service hasn't been sampled.
+        """
+        values = self.values(service, metric)
+        if not values:
+            return None
+        return {'last': values[-1],
+                'mean': sum(values) / len(values),
+                'min': min(values),
+                'max': max(values)}
+
+    def trend(self, service, metric):
+        """Return the trend of a metric of a service over the samples in the
+        buffer, e.g. to detect memory creep.
+
+        The trend is the slope of the least-squares line through the samples.
+
+        Args:
+            service (str): The name of the service.
+            metric (str): The metric: 'cpu', 'rss', 'threads' or 'fds'.
+
+        Returns:
+            float: The change of the metric per second, or `None` if there are
+            fewer than two samples.
+        """
+        with self._lock:
+            buffers = self._buffers.get(service)
+            if buffers is None:
+                return None
+            times = buffers['time'].values()
+            values = buffers[metric].values()
+
+        count = len(values)
+        if count < 2:
+            return None
+
+        mean_time = sum(times) / count
+        mean_value = sum(values) / count
+        covariance = sum((t - mean_time) * (v - mean_value)
+                         for t, v in zip(times, values))
+        variance = sum((t - mean_time) ** 2 for t in times)
+        if not variance:
+            return None
+        return covariance / variance
+
+    def summary(self):
+        """Return a compact summary of the last sample and the rolling
+        statistics of all services.
+
+        Returns:
+            dict: A dict with the service names as keys and a dict with the
+            metrics as keys and a list [last, mean, max] as values.
+        """
+        summary = {}
+        for service in self.services:
+            summary[service] = {}
+            for metric in METRICS:
+                statistics = self.statistics(service, metric)
+                summary[service][metric] = [round(statistics['last'], 1),
+                                            round(statistics['mean'], 1),
+                                            round(statistics['max'], 1)]
+        return summary
+
+    def _run(self):
+        """Sample the resource usage until the monitor is stopped.
+
+        An exception while sampling, e.g. in a threshold callback or while
+        publishing the summary, is reported and the next sample is taken as
+        usual.
+        """
+        while not self._stop.is_set():
+            try:
+                self.sample()
+            except Exception as error:
+                self.last_error = error
+                print('Exception while sampling the Snips services:',
+                      file=sys.stderr)
+                traceback.print_exception(type(error), error,
+                                          error.__traceback__)
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """Start sampling in a daemon thread."""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop.clear()
+        self._thread = Thread(target=self._run, name='ServiceMonitor',
+                              daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Stop sampling.
+
+        Args:
+            timeout (float, optional): The maximum time in seconds to wait for
+                the thread of the monitor to stop. Defaults to waiting until
+                it has stopped.
+        """
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
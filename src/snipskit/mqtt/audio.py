@@ -0,0 +1,275 @@
+"""This module contains a decorator_ to analyze the audio stream of Snips and a
+class to play sounds on the Snips audio server in a
+:class:`.MQTTSnipsComponent` object.
+
+.. _decorator: https://docs.python.org/3/glossary.html#term-decorator
+
+By applying the :func:`audio_features` decorator to a method of a
+:class:`.MQTTSnipsComponent` object, this method is registered as a callback
+for the audioFrame messages of the Snips audio server. The audio is analyzed
+by an :class:`.AudioAnalyzer` object per site and the method is called with the
+features of each batch of complete frames.
+
+Example:
+
+.. code-block:: python
+
+    from snipskit.mqtt.apps import MQTTSnipsApp
+    from snipskit.mqtt.audio import audio_features
+
+    class NoiseMonitor(MQTTSnipsApp):
+
+        @audio_features(frame_length=512, publish=True)
+        def noise(self, site_id, features):
+            if features['rms'].max() > 0.5:
+                print('Loud noise on site {}'.format(site_id))
+
+An :class:`.AudioPlayer` object publishes memory-mapped sound files
+(:class:`.AudioAsset`) to the audio server of one or more sites and tracks
+which ones have finished playing:
+
+.. code-block:: python
+
+    from snipskit.mqtt.apps import MQTTSnipsApp
+    from snipskit.mqtt.audio import AudioPlayer
+
+    class DingApp(MQTTSnipsApp):
+
+        def initialize(self):
+            self.player = AudioPlayer(self)
+            self.player.play('/usr/share/sounds/ding.wav',
+                             ['kitchen', 'bedroom'])
+
+.. note::
+   This module requires NumPy. Install SnipsKit with `pip3 install
+   snipskit[audio]` to pull in this dependency.
+
+.. versionadded:: 0.7.0
+"""
+
+from collections import OrderedDict
+import json
+from threading import Lock
+import time
+from uuid import uuid4
+
+from snipskit.audio import AudioAnalyzer, AudioAsset, DEFAULT_FRAME_LENGTH, \
+    DEFAULT_VOICE_MAX_ZCR, DEFAULT_VOICE_THRESHOLD, features_summary
+
+AUDIO_FRAME = 'hermes/audioServer/{}/audioFrame'
+AUDIO_FEATURES = 'snipskit/audioServer/{}/features'
+PLAY_BYTES = 'hermes/audioServer/{}/playBytes/{}'
+DEFAULT_PLAY_TIMEOUT = 300.0
+PLAY_FINISHED = 'hermes/audioServer/{}/playFinished'
+
+
+def audio_features(site_id='+', frame_length=DEFAULT_FRAME_LENGTH,
+                   hop_length=None, voice_threshold=DEFAULT_VOICE_THRESHOLD,
+                   voice_max_zcr=DEFAULT_VOICE_MAX_ZCR, publish=False):
+    """Apply this decorator to a method of class :class:`.MQTTSnipsComponent`
+    to register it as a callback to be triggered with the features of the
+    audio stream of a site.
+
+    The callback needs to have the following signature:
+
+    method(self, site_id, features)
+
+    The `features` argument is a dict as returned by
+    :func:`snipskit.audio.frame_features`. The callback is only called when at
+    least one complete frame has been received.
+
+    Args:
+        site_id (str, optional): The site ID of the audio stream you want to
+            analyze. The default value '+' analyzes the audio streams of all
+            sites, each one separately.
+        frame_length (int, optional): The number of samples in a frame.
+            Defaults to 256.
+        hop_length (int, optional): The number of samples between the start of
+            two consecutive frames. Defaults to `frame_length`.
+        voice_threshold (float, optional): The minimum RMS energy of a voiced
+            frame. Defaults to 0.02.
+        voice_max_zcr (float, optional): The maximum zero-crossing rate of a
+            voiced frame. Defaults to 0.25.
+        publish (bool, optional): Whether or not a summary of the features
+            (see :func:`snipskit.audio.features_summary`) is published on the
+            MQTT topic `snipskit/audioServer/<siteId>/features`. The default
+            value is False.
+    """
+    def wrapper(method):
+        def wrapped(self, client, userdata, msg):
+            """This is the callback with the signature that Paho MQTT expects.
+            """
+            site = msg.topic.split('/')[2]
+
+            # Keep an analyzer per site and per decorated method on the
+            # component, so the buffered samples of the streams don't mix.
+            analyzers = self.__dict__.setdefault('_audio_analyzers', {})
+            key = (method.__name__, site)
+            if key not in analyzers:
+                analyzers[key] = AudioAnalyzer(frame_length, hop_length,
+                                               voice_threshold, voice_max_zcr)
+
+            features = analyzers[key].feed(msg.payload)
+            if not len(features['rms']):
+                return
+
+            if publish:
+                self.publish(AUDIO_FEATURES.format(site),
+                             features_summary(features))
+
+            # This is the callback with the signature that SnipsKit expects.
+            method(self, site, features)
+
+        wrapped.topic = AUDIO_FRAME.format(site_id)
+        return wrapped
+    return wrapper
+
+
+class AudioPlayer:
+    """This class plays sound files on the Snips audio server of one or more
+    sites.
+
+    Each sound file is opened once as an :class:`.AudioAsset` object and
+    converted once to the format of the player. The resulting WAV file is
+    published to all sites without creating it again.
+
+    The player subscribes to the playFinished messages of the audio server to
+    track which requests are still playing, also after the component
+    reconnects to the MQTT broker. A request that hasn't finished after
+    `timeout` seconds, e.g. because the site is offline, is forgotten.
+
+    .. note:: Create the player in the :meth:`.SnipsComponent.initialize`
+       method of your component, when the component is connected to the MQTT
+       broker.
+
+    Attributes:
+        component (:class:`.MQTTSnipsComponent`): The component to publish the
+            sounds with.
+        sample_rate (int): The sample rate of the published WAV files, or
+            `None` to keep the sample rate of each sound file.
+        channels (int): The number of channels of the published WAV files, or
+            `None` to keep the number of channels of each sound file.
+        sample_width (int): The sample width of the published WAV files, or
+            `None` to keep the sample width of each sound file.
+        pending (dict): The requests that haven't finished playing, with the
+            request ID as key and a tuple (site ID, start time) as value.
+        timeout (float): The time in seconds after which a request that
+            hasn't finished playing is forgotten.
+    """
+
+    def __init__(self, component, sample_rate=None, channels=None,
+                 sample_width=None, timeout=DEFAULT_PLAY_TIMEOUT):
+        """Initialize an :class:`.AudioPlayer` object.
+
+        Args:
+            component (:class:`.MQTTSnipsComponent`): The component to publish
+                the sounds with.
+            sample_rate (int, optional): The sample rate of the published WAV
+                files. Defaults to the sample rate of each sound file.
+            channels (int, optional): The number of channels of the published
+                WAV files. Defaults to the number of channels of each sound
+                file.
+            sample_width (int, optional): The sample width in bytes of the
+                published WAV files. Defaults to the sample width of each sound
+                file.
+            timeout (float, optional): The time in seconds after which a
+                request that hasn't finished playing is forgotten, without
+                calling its `on_finished` function. Defaults to 300.
+        """
+        self.component = component
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.sample_width = sample_width
+        self.timeout = timeout
+        self.pending = OrderedDict()
+
+        self._assets = {}
+        self._callbacks = {}
+        self._lock = Lock()
+
+        component.subscribe(PLAY_FINISHED.format('+'), self._play_finished)
+
+    def asset(self, filename):
+        """Return the :class:`.AudioAsset` object of a sound file.
+
+        The sound file is only opened the first time.
+
+        Args:
+            filename (str): The filename of the WAV file.
+
+        Returns:
+            :class:`.AudioAsset`: The audio asset of the sound file.
+        """
+        filename = str(filename)
+        with self._lock:
+            if filename not in self._assets:
+                self._assets[filename] = AudioAsset(filename)
+            return self._assets[filename]
+
+    def play(self, filename, site_ids, on_finished=None):
+        """Play a sound file on the audio server of one or more sites.
+
+        Args:
+            filename (str): The filename of the WAV file.
+            site_ids (list): The site IDs to play the sound on. A single site
+                ID as a str is also accepted.
+            on_finished (function, optional): A function to call when a site
+                has finished playing the sound, with the signature
+                on_finished(site_id, request_id).
+
+        Returns:
+            list: The request IDs of the playBytes messages, one for each site.
+        """
+        if isinstance(site_ids, str):
+            site_ids = [site_ids]
+
+        wav = self.asset(filename).wav(self.sample_rate, self.channels,
+                                       self.sample_width)
+
+        request_ids = []
+        for site_id in site_ids:
+            request_id = str(uuid4())
+            now = time.monotonic()
+            with self._lock:
+                self._expire(now)
+                self.pending[request_id] = (site_id, now)
+                if on_finished:
+                    self._callbacks[request_id] = on_finished
+
+            self.component.publish(PLAY_BYTES.format(site_id, request_id),
+                                   wav, json_encode=False)
+            request_ids.append(request_id)
+
+        return request_ids
+
+    def _expire(self, now):
+        """Forget the requests that are older than the timeout.
+
+        The pending requests are ordered by their start time, so only the
+        oldest ones are checked.
+        """
+        while self.pending:
+            request_id, (_, start) = next(iter(self.pending.items()))
+            if now - start < self.timeout:
+                break
+            del self.pending[request_id]
+            self._callbacks.pop(request_id, None)
+
+    def _play_finished(self, client, userdata, msg):
+        """Handle a playFinished message of the audio server."""
+        payload = json.loads(msg.payload.decode('utf-8'))
+        request_id = payload.get('id')
+
+        with self._lock:
+            request = self.pending.pop(request_id, None)
+            on_finished = self._callbacks.pop(request_id, None)
+
+        if request and on_finished:
+            on_finished(request[0], request_id)
+
+    def close(self):
+        """Close all sound files that are opened by this player."""
+        with self._lock:
+            for asset in self._assets.values():
+                asset.close()
+            self._assets.clear()
@@ -0,0 +1,380 @@
+"""This module contains a benchmark that compares the per-message overhead of
+the decorators of :mod:`snipskit.mqtt.decorators` with the decorators of
+:mod:`snipskit.hermes.decorators`.
+
+For each backend, the benchmark runs a component with one handler decorated
+with `@intent`, publishes intent messages to the MQTT broker at a fixed rate
+and measures the time between publishing a message and the call of the
+handler. Both backends receive the same messages from the same broker, so the
+difference in latency is the difference in the cost of receiving, parsing and
+dispatching a message: the pure-Python parsing of the MQTT backend versus the
+native library of Hermes Python.
+
+You can run the benchmark on the command line with the `snipskit-benchmark`
+command. It reads the MQTT connection settings from snips.toml. The Hermes
+backend is skipped if Hermes Python isn't installed:
+
+.. code-block:: sh
+
+    snipskit-benchmark --messages 1000 --rate 200
+
+.. versionadded:: 0.7.0
+"""
+
+import argparse
+import json
+from threading import Event, Thread
+import time
+from uuid import uuid4
+
+from paho.mqtt.client import Client
+from snipskit.config import SnipsConfig
+from snipskit.mqtt.client import connect
+from snipskit.mqtt.decorators import INTENT
+from snipskit.mqtt.loadgen import percentile, positive_float
+
+BACKENDS = ('mqtt', 'hermes')
+DEFAULT_INTENT = 'snipskit:Benchmark'
+SITE_ID = 'benchmark'
+WARMUP = 'warmup'
+
+
+class BenchmarkResult:
+    """This class represents the results of a run of the benchmark for one
+    backend.
+
+    Attributes:
+        backend (str): The name of the backend, 'mqtt' or 'hermes'.
+        sent (int): The number of messages published.
+        duration (float): The time in seconds between publishing the first
+            message and the call of the handler for the last message.
+        latencies (list): The sorted latencies in seconds between publishing
+            a message and the call of the handler, for all messages that were
+            handled.
+    """
+
+    def __init__(self, backend, sent, duration, latencies):
+        """Initialize a :class:`.BenchmarkResult` object.
+
+        Args:
+            backend (str): The name of the backend.
+            sent (int): The number of messages published.
+            duration (float): The duration of the run in seconds.
+            latencies (list): The latencies in seconds of all handled
+                messages.
+        """
+        self.backend = backend
+        self.sent = sent
+        self.duration = duration
+        self.latencies = sorted(latencies)
+
+    @property
+    def handled(self):
+        """Return the number of messages that were handled.
+
+        Returns:
+            int: The number of handled messages.
+        """
+        return len(self.latencies)
+
+    @property
+    def throughput(self):
+        """Return the number of handled messages per second.
+
+        Returns:
+            float: The throughput.
+        """
+        if not self.duration:
+            return 0.0
+        return self.handled / self.duration
+
+    def latency(self, percent):
+        """Return a percentile of the latencies.
+
+        Args:
+            percent (float): The percentile, between 0 and 100.
+
+        Returns:
+            float: The latency in seconds, or `None` if no message has been
+            handled.
+        """
+        return percentile(self.latencies, percent)
+
+    def __str__(self):
+        lines = ['Backend:            {}'.format(self.backend),
+                 'Messages sent:      {}'.format(self.sent),
+                 'Messages handled:   {}'.format(self.handled),
+                 'Duration:           {:.2f} s'.format(self.duration),
+                 'Throughput:         {:.2f} messages/s'.format(self.throughput)]
+
+        for percent in (50, 90, 99, 100):
+            latency = self.latency(percent)
+            if latency is not None:
+                line = 'Latency p{:<3}       {:.3f} ms'
+                lines.append(line.format(percent, 1000 * latency))
+
+        return '\n'.join(lines)
+
+
+class _Receiver:
+    """Collect the latencies of the messages handled by a benchmark
+    component.
+
+    The custom data of each message is the value of :func:`time.perf_counter`
+    when it was published.
+    """
+
+    def __init__(self, count):
+        self.count = count
+        self.latencies = []
+        self.last = None
+        self.warmed_up = Event()
+        self.done = Event()
+
+    def receive(self, custom_data):
+        """Record the latency of a message with its custom data."""
+        now = time.perf_counter()
+        if custom_data == WARMUP:
+            self.warmed_up.set()
+            return
+
+        try:
+            published = float(custom_data)
+        except (TypeError, ValueError):
+            return
+
+        self.latencies.append(now - published)
+        self.last = now
+        if len(self.latencies) >= self.count:
+            self.done.set()
+
+
+def _mqtt_component(receiver, intent_name, components):
+    """Create a subclass of :class:`.MQTTSnipsComponent` that passes the
+    messages of an intent to a receiver."""
+    from snipskit.mqtt.components import MQTTSnipsComponent
+    from snipskit.mqtt.decorators import intent
+
+    class MQTTBenchmarkComponent(MQTTSnipsComponent):
+
+        def initialize(self):
+            components.append(self)
+
+        @intent(intent_name)
+        def handle_intent(self, topic, payload):
+            receiver.receive(payload['customData'])
+
+        def stop(self):
+            self.mqtt.disconnect()
+
+    return MQTTBenchmarkComponent
+
+
+def _hermes_component(receiver, intent_name, components):
+    """Create a subclass of :class:`.HermesSnipsComponent` that passes the
+    messages of an intent to a receiver."""
+    from snipskit.hermes.components import HermesSnipsComponent
+    from snipskit.hermes.decorators import intent
+
+    class HermesBenchmarkComponent(HermesSnipsComponent):
+
+        def initialize(self):
+            components.append(self)
+
+        @intent(intent_name)
+        def handle_intent(self, hermes, intent_message):
+            receiver.receive(intent_message.custom_data)
+
+        def stop(self):
+            self.hermes.disconnect()
+
+    return HermesBenchmarkComponent
+
+
+class Benchmark:
+    """This class measures the per-message overhead of the decorators of a
+    backend.
+
+    Attributes:
+        client (`paho.mqtt.client.Client`_): The MQTT client object that
+            publishes the messages, connected to the MQTT broker.
+        snips (:class:`.SnipsConfig`): The Snips configuration of the
+            benchmark components.
+        messages (int): The number of messages to publish.
+        rate (float): The number of messages published per second.
+        timeout (float): The time in seconds to wait for the component to
+            start and to handle the last message.
+        intent (str): The name of the intent to publish.
+
+    .. _`paho.mqtt.client.Client`: https://www.eclipse.org/paho/clients/python/docs/#client
+    """
+
+    def __init__(self, client, snips, messages=1000, rate=100.0,
+                 timeout=10.0, intent=DEFAULT_INTENT):
+        """Initialize a :class:`.Benchmark` object.
+
+        The client must have a running network loop, e.g. started with its
+        `loop_start()` method.
+
+        Args:
+            client (`paho.mqtt.client.Client`_): The MQTT client object,
+                connected to the MQTT broker.
+            snips (:class:`.SnipsConfig`): The Snips configuration of the
+                benchmark components.
+            messages (int, optional): The number of messages to publish.
+                Defaults to 1000.
+            rate (float, optional): The number of messages published per
+                second. Defaults to 100.
+            timeout (float, optional): The time in seconds to wait for the
+                component to start and to handle the last message. Defaults
+                to 10.
+            intent (str, optional): The name of the intent to publish.
+                Defaults to 'snipskit:Benchmark'.
+
+        Raises:
+            ValueError: If the rate isn't greater than 0.
+
+        .. _`paho.mqtt.client.Client`: https://www.eclipse.org/paho/clients/python/docs/#client
+        """
+        if not rate > 0:
+            raise ValueError('The rate must be greater than 0.')
+
+        self.client = client
+        self.snips = snips
+        self.messages = messages
+        self.rate = rate
+        self.timeout = timeout
+        self.intent = intent
+
+    def _publish(self, custom_data):
+        """Publish an intent message with custom data."""
+        self.client.publish(INTENT.format(self.intent),
+                            json.dumps({'sessionId': str(uuid4()),
+                                        'siteId': SITE_ID,
+                                        'customData': custom_data,
+                                        'input': 'benchmark',
+                                        'intent': {'intentName': self.intent,
+                                                   'confidenceScore': 1.0},
+                                        'slots': []}))
+
+    def run(self, backend):
+        """Run the benchmark for a backend.
+
+        The component of the backend is started in a daemon thread. The
+        benchmark publishes warmup messages until the component handles one,
+        so the component is subscribed before the measurement starts.
+
+        Args:
+            backend (str): The name of the backend, 'mqtt' or 'hermes'.
+
+        Returns:
+            :class:`.BenchmarkResult`: The results of the run.
+
+        Raises:
+            ValueError: If the backend is unknown.
+            TimeoutError: If the component doesn't handle a warmup message
+                within the timeout.
+        """
+        if backend == 'mqtt':
+            create_component = _mqtt_component
+        elif backend == 'hermes':
+            create_component = _hermes_component
+        else:
+            raise ValueError('Unknown backend: {}'.format(backend))
+
+        receiver = _Receiver(self.messages)
+        components = []
+        component_class = create_component(receiver, self.intent, components)
+        Thread(target=component_class, args=(self.snips,), daemon=True).start()
+
+        try:
+            deadline = time.monotonic() + self.timeout
+            while not receiver.warmed_up.is_set():
+                if time.monotonic() > deadline:
+                    raise TimeoutError('The {} component did not handle a '
+                                       'message.'.format(backend))
+                self._publish(WARMUP)
+                receiver.warmed_up.wait(0.1)
+
+            interval = 1 / self.rate
+            start = time.perf_counter()
+            for sent in range(self.messages):
+                self._publish(str(time.perf_counter()))
+
+                delay = start + (sent + 1) * interval - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+            receiver.done.wait(self.timeout)
+            end = receiver.last or time.perf_counter()
+            return BenchmarkResult(backend, self.messages, end - start,
+                                   list(receiver.latencies))
+        finally:
+            for component in components:
+                component.stop()
+
+
+def main(args=None):
+    """Run the benchmark from the command line.
+
+    Args:
+        args (list, optional): The command line arguments. Defaults to the
+            arguments of the process.
+    """
+    parser = argparse.ArgumentParser(prog='snipskit-benchmark',
+                                     description='Compare the per-message '
+                                                 'overhead of the MQTT and '
+                                                 'Hermes decorators.')
+    parser.add_argument('-c', '--config',
+                        help='path of snips.toml (default: search path)')
+    parser.add_argument('-n', '--messages', type=int, default=1000,
+                        help='number of messages per backend (default: 1000)')
+    parser.add_argument('-r', '--rate', type=positive_float, default=100.0,
+                        help='messages per second (default: 100)')
+    parser.add_argument('-t', '--timeout', type=float, default=10.0,
+                        help='timeout in seconds (default: 10)')
+    parser.add_argument('-i', '--intent', default=DEFAULT_INTENT,
+                        help='intent name (default: {})'.format(DEFAULT_INTENT))
+    parser.add_argument('--backend', choices=BACKENDS, action='append',
+                        help='backend to measure, can be repeated (default: '
+                             'all)')
+    args = parser.parse_args(args)
+
+    backends = args.backend or BACKENDS
+    snips = SnipsConfig(args.config)
+
+    client = Client()
+    connect(client, snips.mqtt)
+    client.loop_start()
+
+    try:
+        benchmark = Benchmark(client, snips, args.messages, args.rate,
+                              args.timeout, args.intent)
+        results = {}
+        for backend in backends:
+            if backend == 'hermes':
+                try:
+                    import hermes_python  # noqa: F401
+                except ImportError:
+                    print('Skipping the hermes backend: Hermes Python is not '
+                          'installed.')
+                    continue
+
+            result = benchmark.run(backend)
+            results[backend] = result
+            print(result)
+            print()
+
+        if results.get('mqtt') and results.get('hermes'):
+            mqtt = results['mqtt'].latency(50)
+            hermes = results['hermes'].latency(50)
+            if mqtt is not None and hermes:
+                print('Median latency of mqtt relative to hermes: {:.2f}x'
+                      .format(mqtt / hermes))
+    finally:
+        client.loop_stop()
+        client.disconnect()
+
+
+if __name__ == '__main__':
+    main()
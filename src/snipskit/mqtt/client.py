@@ -1,9 +1,27 @@
 """This module contains helper functions to use the Paho MQTT library with the
 MQTT broker defined in a :class:`.MQTTConfig` object.
+
+The helper functions use the connection parameters that the
+:attr:`.MQTTConfig.connection` attribute resolves once, so they don't parse
+the settings again on each call.
+
+If the :class:`.MQTTConfig` object has several brokers, :func:`connect`
+probes them, connects to the reachable broker with the lowest round-trip time
+(or a random reachable broker to spread the clients) and installs a
+:class:`.BrokerFailover` object that switches the client to the next broker
+when reconnecting fails repeatedly, and back to the first broker when it's
+reachable again. A :class:`.MQTTSnipsComponent` object subscribes
+to its topics again after each connection.
 """
 import json
+import random
+import socket
+from threading import Timer
+import time
 
-from paho.mqtt.publish import single
+DEFAULT_MAX_FAILURES = 3
+DEFAULT_PRIMARY_INTERVAL = 300.0
+DEFAULT_PROBE_TIMEOUT = 2.0
 
 
 def auth_params(mqtt_config):
@@ -19,14 +37,7 @@ def auth_params(mqtt_config):
 
     .. versionadded:: 0.6.0
     """
-    # Set up a dict containing authentication parameters for the MQTT client.
-    if mqtt_config.auth.username:
-        # The password can be None.
-        return {'username': mqtt_config.auth.username,
-                'password': mqtt_config.auth.password}
-    # Or use no authentication.
-    else:
-        return None
+    return mqtt_config.connection.auth_params()
 
 
 def host_port(mqtt_config):
@@ -37,20 +48,16 @@ def host_port(mqtt_config):
 
     Returns:
         (str, int): A tuple with the host and port defined in the MQTT
-        connection settings.
+        connection settings. The host of an IPv6 address doesn't have square
+        brackets.
 
     .. versionadded:: 0.6.0
-    """
-    host_port = mqtt_config.broker_address.split(':')
 
-    if mqtt_config.tls.hostname:
-        host = mqtt_config.tls.hostname
-    else:
-        host = host_port[0]
-
-    port = int(host_port[1])
-
-    return (host, port)
+    .. versionchanged:: 0.7.0
+       IPv6 addresses are supported and the port defaults to 1883.
+    """
+    connection = mqtt_config.connection
+    return (connection.host, connection.port)
 
 
 def tls_params(mqtt_config):
@@ -67,15 +74,7 @@ def tls_params(mqtt_config):
 
     .. versionadded:: 0.6.0
     """
-    # Set up a dict containing TLS configuration parameters for the MQTT
-    # client.
-    if mqtt_config.tls.hostname:
-        return {'ca_certs': mqtt_config.tls.ca_file,
-                'certfile': mqtt_config.tls.client_cert,
-                'keyfile': mqtt_config.tls.client_key}
-    # Or don't use TLS.
-    else:
-        return None
+    return mqtt_config.connection.tls_params()
 
 
 def connect(client, mqtt_config, keepalive=60, bind_address=''):
@@ -91,25 +90,350 @@ def connect(client, mqtt_config, keepalive=60, bind_address=''):
             interface to bind this client to, assuming multiple interfaces
             exist. Defaults to ''.
 
+    Returns:
+        :class:`.BrokerFailover`: The object that handles the failover to the
+        other brokers if there are several brokers, otherwise `None`.
+
+    Raises:
+        :exc:`OSError`: If the client can't connect to any broker.
+
     .. _`paho.mqtt.client.Client`: https://www.eclipse.org/paho/clients/python/docs/#client
 
     .. versionadded:: 0.6.0
+
+    .. versionchanged:: 0.7.0
+       Several brokers are supported.
     """
-    host, port = host_port(mqtt_config)
+    connection = mqtt_config.connection
 
     # Set up MQTT authentication.
-    auth = auth_params(mqtt_config)
+    auth = connection.auth_params()
     if auth:
         client.username_pw_set(auth['username'], auth['password'])
 
-    # Set up an MQTT TLS connection.
-    tls = tls_params(mqtt_config)
-    if tls:
-        client.tls_set(ca_certs=tls['ca_certs'],
-                       certfile=tls['certfile'],
-                       keyfile=tls['keyfile'])
+    # Set up an MQTT TLS connection with a shared TLS context.
+    if connection.tls:
+        from snipskit.mqtt.tls import tls_context
+        client.tls_set_context(tls_context(connection))
+
+    if len(mqtt_config.brokers) > 1:
+        failover = BrokerFailover(client, rank_brokers(mqtt_config),
+                                  keepalive, bind_address)
+        failover.connect()
+        return failover
+
+    # The client keeps the host name to reconnect, so it's resolved by the
+    # client itself.
+    client.connect(connection.host, connection.port, keepalive, bind_address)
+    return None
+
+
+def subscribe(client, topic, callback):
+    """Subscribe an MQTT client to a topic with a callback, now and each time
+    the client connects to the MQTT broker again.
+
+    The client connects with a clean session, so the broker forgets its
+    subscriptions when the connection is lost. This function installs an
+    `on_connect` callback that subscribes to the topic again and then calls
+    the `on_connect` callback that was set before.
+
+    Args:
+        client (`paho.mqtt.client.Client`_): The MQTT client object.
+        topic (str): The MQTT topic to subscribe to.
+        callback (function): The callback with the signature that Paho MQTT
+            expects: callback(client, userdata, msg).
+
+    .. _`paho.mqtt.client.Client`: https://www.eclipse.org/paho/clients/python/docs/#client
+
+    .. versionadded:: 0.7.0
+    """
+    on_connect = client.on_connect
+
+    def subscribe_again(client, userdata, *args):
+        """Subscribe to the topic after each connection."""
+        client.subscribe(topic)
+        if on_connect:
+            on_connect(client, userdata, *args)
+
+    client.on_connect = subscribe_again
+    client.message_callback_add(topic, callback)
+    client.subscribe(topic)
+
+
+def probe(connection, timeout=DEFAULT_PROBE_TIMEOUT):
+    """Measure the round-trip time of a TCP connection to an MQTT broker.
+
+    The DNS lookup isn't part of the measurement.
+
+    Args:
+        connection (:class:`.MQTTConnection`): The connection parameters of
+            the broker.
+        timeout (float, optional): The maximum time in seconds to wait for
+            the connection. Defaults to 2.
+
+    Returns:
+        float: The round-trip time in seconds, or `None` if the broker isn't
+        reachable.
+
+    .. versionadded:: 0.7.0
+    """
+    try:
+        addresses = connection.addresses()
+    except OSError:
+        return None
+
+    # Try each address in turn, like socket.create_connection() does, e.g.
+    # for a broker that only listens on IPv4 on a dual-stack host.
+    for family, address in addresses:
+        start = time.monotonic()
+        try:
+            sock = socket.create_connection(address[:2], timeout)
+        except OSError:
+            continue
+        round_trip_time = time.monotonic() - start
+        sock.close()
+        return round_trip_time
+
+    return None
+
+
+def rank_brokers(mqtt_config, timeout=DEFAULT_PROBE_TIMEOUT):
+    """Probe all MQTT brokers of an :class:`.MQTTConfig` object at the same
+    time and order them by preference.
+
+    Reachable brokers come first, ordered by their round-trip time, or in a
+    random order if the :attr:`.MQTTConfig.spread` attribute is True.
+    Unreachable brokers follow in their configured order.
+
+    Args:
+        mqtt_config (:class:`.MQTTConfig`): The MQTT connection settings.
+        timeout (float, optional): The maximum time in seconds to wait for
+            the connection to a broker. Defaults to 2.
+
+    Returns:
+        list: The :class:`.MQTTConnection` objects of the brokers.
+
+    .. versionadded:: 0.7.0
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    connections = mqtt_config.connections
+    with ThreadPoolExecutor(len(connections)) as executor:
+        round_trip_times = list(executor.map(lambda connection:
+                                             probe(connection, timeout),
+                                             connections))
+
+    reachable = [(round_trip_time, index)
+                 for index, round_trip_time in enumerate(round_trip_times)
+                 if round_trip_time is not None]
+    if mqtt_config.spread:
+        random.shuffle(reachable)
+    else:
+        reachable.sort()
 
-    client.connect(host, port, keepalive, bind_address)
+    order = [index for _, index in reachable]
+    order += [index for index in range(len(connections)) if index not in order]
+
+    return [connections[index] for index in order]
+
+
+class BrokerFailover:
+    """This class switches an MQTT client to the next broker in a list when
+    reconnecting to the current broker fails repeatedly, and back to the first
+    broker when it's reachable again.
+
+    The client's own reconnect mechanism (e.g. in its `loop_forever()` method)
+    then connects to the new broker:
+
+    - If the connection is lost, e.g. by a keepalive timeout or a restart of
+      the broker, the client reconnects to the same broker first.
+    - After `max_failures` failed reconnects in a row, the client switches to
+      the next broker.
+    - If the connection to another broker than the first one is lost, the
+      client goes back to the first broker. While the client is connected to
+      another broker, the first broker is probed every `primary_interval`
+      seconds, and the connection is dropped to go back to it when it's
+      reachable.
+
+    Callbacks for the `on_disconnect` and `on_connect_fail` events that were
+    set before are still called.
+
+    .. versionadded:: 0.7.0
+
+    Attributes:
+        client (`paho.mqtt.client.Client`_): The MQTT client object.
+        connections (list): The :class:`.MQTTConnection` objects of the
+            brokers, in order of preference.
+        index (int): The position of the current broker in the list.
+        max_failures (int): The number of failed reconnects in a row after
+            which the client switches to the next broker.
+        primary_interval (float): The time in seconds between two probes of
+            the first broker while the client uses another broker, or `None`
+            to only go back to the first broker when the connection is lost.
+        failures (int): The number of failed reconnects in a row to the
+            current broker.
+
+    .. _`paho.mqtt.client.Client`: https://www.eclipse.org/paho/clients/python/docs/#client
+    """
+
+    def __init__(self, client, connections, keepalive=60, bind_address='',
+                 max_failures=DEFAULT_MAX_FAILURES,
+                 primary_interval=DEFAULT_PRIMARY_INTERVAL):
+        """Initialize a :class:`.BrokerFailover` object.
+
+        Args:
+            client (`paho.mqtt.client.Client`_): The MQTT client object.
+            connections (list): The :class:`.MQTTConnection` objects of the
+                brokers, in order of preference.
+            keepalive (int, optional): The maximum period in seconds allowed
+                between communications with the broker. Defaults to 60.
+            bind_address (str, optional): The IP address of a local network
+                interface to bind this client to. Defaults to ''.
+            max_failures (int, optional): The number of failed reconnects in
+                a row after which the client switches to the next broker.
+                Defaults to 3.
+            primary_interval (float, optional): The time in seconds between
+                two probes of the first broker while the client uses another
+                broker. Defaults to 300. With `None`, the client only goes
+                back to the first broker when the connection is lost.
+
+        .. _`paho.mqtt.client.Client`: https://www.eclipse.org/paho/clients/python/docs/#client
+        """
+        self.client = client
+        self.connections = list(connections)
+        self.index = 0
+        self.keepalive = keepalive
+        self.bind_address = bind_address
+        self.max_failures = max_failures
+        self.primary_interval = primary_interval
+        self.failures = 0
+
+        self._timer = None
+        self._on_disconnect = client.on_disconnect
+        self._on_connect_fail = getattr(client, 'on_connect_fail', None)
+        client.on_disconnect = self._disconnected
+        client.on_connect_fail = self._connect_failed
+
+    @property
+    def current(self):
+        """Return the connection parameters of the current broker.
+
+        Returns:
+            :class:`.MQTTConnection`: The current broker.
+        """
+        return self.connections[self.index]
+
+    def connect(self):
+        """Connect the client to the first broker that accepts the
+        connection, starting with the current broker.
+
+        Raises:
+            :exc:`OSError`: If the client can't connect to any broker.
+        """
+        error = None
+        for _ in self.connections:
+            connection = self.current
+            try:
+                self.client.connect(connection.host, connection.port,
+                                    self.keepalive, self.bind_address)
+                self._schedule_primary_check()
+                return
+            except OSError as connect_error:
+                error = connect_error
+                self.index = (self.index + 1) % len(self.connections)
+
+        raise error
+
+    def _use(self, index):
+        """Let the next reconnect of the client use the broker at a
+        position in the list."""
+        self.index = index
+        self.failures = 0
+        connection = self.current
+        self.client.connect_async(connection.host, connection.port,
+                                  self.keepalive, self.bind_address)
+        self._schedule_primary_check()
+
+    def _schedule_primary_check(self):
+        """Probe the first broker later if the client uses another broker."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if self.index != 0 and self.primary_interval:
+            self._timer = Timer(self.primary_interval, self._check_primary)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _check_primary(self):
+        """Drop the connection to go back to the first broker if it's
+        reachable."""
+        self._timer = None
+        if self.index == 0:
+            return
+
+        sock = self.client.socket()
+        if sock is None or probe(self.connections[0]) is None:
+            self._schedule_primary_check()
+            return
+
+        # The client sees a lost connection, so _disconnected switches it
+        # back to the first broker.
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            self._schedule_primary_check()
+
+    def _disconnected(self, client, userdata, *args):
+        """Reconnect to the same broker if the connection is lost, or to the
+        first broker if another broker was used.
+
+        The arguments after `userdata` depend on the callback API version of
+        the client: (rc) or (flags, reason code, properties).
+        """
+        reason_code = args[0] if len(args) == 1 else args[1]
+        if reason_code != 0:
+            # The disconnection wasn't requested.
+            self.failures = 0
+            if self.index != 0:
+                self._use(0)
+        elif self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if self._on_disconnect:
+            self._on_disconnect(client, userdata, *args)
+
+    def _connect_failed(self, client, userdata):
+        """Switch to the next broker if reconnecting to the current broker
+        fails repeatedly."""
+        self.failures += 1
+        if self.failures >= self.max_failures:
+            self._use((self.index + 1) % len(self.connections))
+
+        if self._on_connect_fail:
+            self._on_connect_fail(client, userdata)
+
+
+def _resolved_hosts(connection):
+    """Return the hosts to try in turn for a short-lived connection: the
+    addresses of the host from the DNS cache, or the host itself if TLS is
+    used (the certificate is checked against the host name) or if it can't be
+    resolved (the connection reports the error).
+    """
+    if connection.tls:
+        return [connection.host]
+
+    try:
+        addresses = connection.addresses()
+    except OSError:
+        return [connection.host]
+
+    hosts = []
+    for _, address in addresses:
+        if address[0] not in hosts:
+            hosts.append(address[0])
+    return hosts or [connection.host]
 
 
 def publish_single(mqtt_config, topic, payload=None, json_encode=True):
@@ -133,11 +457,26 @@ def publish_single(mqtt_config, topic, payload=None, json_encode=True):
 
     .. versionadded:: 0.6.0
     """
-    host, port = host_port(mqtt_config)
-    auth = auth_params(mqtt_config)
-    tls = tls_params(mqtt_config)
+    from paho.mqtt.publish import single
+
+    connection = mqtt_config.connection
 
     if json_encode:
         payload = json.dumps(payload)
 
-    single(topic, payload, hostname=host, port=port, auth=auth, tls=tls)
+    tls = None
+    if connection.tls:
+        from snipskit.mqtt.tls import tls_context
+        tls = tls_context(connection)
+
+    # Try each address of the host in turn, as the client would do with the
+    # host name.
+    hosts = _resolved_hosts(connection)
+    for host in hosts:
+        try:
+            single(topic, payload, hostname=host, port=connection.port,
+                   auth=connection.auth_params(), tls=tls)
+            return
+        except OSError:
+            if host == hosts[-1]:
+                raise
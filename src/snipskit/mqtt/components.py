@@ -25,10 +25,17 @@ Example:
             print('Hotword on {} is toggled on.'.format(payload['siteId']))
 """
 import json
+import socket
 
-from paho.mqtt.client import Client
+from snipskit import tracing
 from snipskit.components import SnipsComponent
 from snipskit.mqtt.client import connect
+from snipskit.profiler import DEFAULT_DURATION, DEFAULT_INTERVAL
+
+PROFILE_CONTROL_TOPIC = 'snipskit/profile/{}/control'
+PROFILE_RESULT_TOPIC = 'snipskit/profile/{}/result'
+# The maximum duration in seconds of a run started with the control topic.
+MAX_PROFILE_DURATION = 3600.0
 
 
 class MQTTSnipsComponent(SnipsComponent):
@@ -45,8 +52,11 @@ class MQTTSnipsComponent(SnipsComponent):
         """Connect with the MQTT broker referenced in the Snips configuration
         file.
         """
+        from paho.mqtt.client import Client
+
         self.mqtt = Client()
         self.mqtt.on_connect = self._subscribe_topics
+        self._subscriptions = {}
         connect(self.mqtt, self.snips.mqtt)
 
     def _start(self):
@@ -69,6 +79,32 @@ class MQTTSnipsComponent(SnipsComponent):
                 self.mqtt.message_callback_add(getattr(callable_name, 'topic'),
                                                callable_name)
 
+        for topic in self._subscriptions:
+            self.mqtt.subscribe(topic)
+
+        if self.profiler is not None:
+            self._subscribe_profile_control()
+
+    def subscribe(self, topic, callback):
+        """Subscribe to an MQTT topic with a callback, now and each time the
+        component connects to the MQTT broker again.
+
+        The client connects with a clean session, so the broker forgets its
+        subscriptions when the connection is lost. Objects that subscribe to
+        a topic of their own, such as an :class:`.AudioPlayer` object, use this
+        method so they keep receiving their messages after a reconnect.
+
+        Args:
+            topic (str): The MQTT topic to subscribe to.
+            callback (function): The callback with the signature that Paho
+                MQTT expects: callback(client, userdata, msg).
+
+        .. versionadded:: 0.7.0
+        """
+        self._subscriptions[topic] = callback
+        self.mqtt.message_callback_add(topic, callback)
+        self.mqtt.subscribe(topic)
+
     def publish(self, topic, payload, json_encode=True):
         """Publish a payload on an MQTT topic on the MQTT broker of this object.
 
@@ -85,8 +121,99 @@ class MQTTSnipsComponent(SnipsComponent):
             publication of the message.
 
         .. versionadded:: 0.5.0
+
+        .. versionchanged:: 0.7.0
+           The publication is traced if a tracer is installed with
+           :func:`snipskit.tracing.set_tracer`, in the session of the payload
+           or of the running span.
         """
+        if tracing.get_tracer() is not None:
+            session_id = None
+            if isinstance(payload, dict):
+                session_id = payload.get('sessionId')
+            with tracing.span('publish', session_id, topic=topic):
+                if json_encode:
+                    payload = json.dumps(payload)
+                return self.mqtt.publish(topic, payload)
+
         if json_encode:
             payload = json.dumps(payload)
 
         return self.mqtt.publish(topic, payload)
+
+    def enable_profiling(self, signum=None, directory=None,
+                         duration=DEFAULT_DURATION, interval=DEFAULT_INTERVAL,
+                         handlers_only=True, name=None):
+        """Enable on-demand profiling of the running component with a
+        :class:`.SamplingProfiler` object.
+
+        Besides the signal of :meth:`.SnipsComponent.enable_profiling`, the
+        profiler is controlled with a JSON message on the MQTT topic
+        `snipskit/profile/<name>/control`: {"action": "start", "duration": 10}
+        starts the profiler, with an optional duration in seconds of at most
+        one hour, and {"action": "stop"} stops it. Invalid messages are
+        ignored. When a run has finished, the profile is
+        published on the topic `snipskit/profile/<name>/result` as a JSON
+        message with the keys 'samples', 'duration' and 'folded', the stacks in
+        the collapsed format of FlameGraph.
+
+        Args:
+            signum (int, optional): A signal that starts the profiler, or stops
+                it if it's running. Defaults to `None`.
+            directory (str, optional): The directory to write the profiles to.
+                Defaults to `None`.
+            duration (float, optional): The default maximum time in seconds of
+                a run of the profiler. Defaults to 30.
+            interval (float, optional): The time in seconds between two
+                samples. Defaults to 5 milliseconds.
+            handlers_only (bool, optional): Whether to count only the samples
+                of threads that are running a method of the component. Defaults
+                to True.
+            name (str, optional): The name of the component in the MQTT topics.
+                Defaults to '<hostname>/<class name>'.
+
+        .. versionadded:: 0.7.0
+        """
+        super().enable_profiling(signum, directory, duration, interval,
+                                 handlers_only)
+
+        if name is None:
+            name = '{}/{}'.format(socket.gethostname(), type(self).__name__)
+        self.profile_name = name
+
+        if self.mqtt.is_connected():
+            self._subscribe_profile_control()
+
+    def _subscribe_profile_control(self):
+        """Subscribe to the profiling control topic."""
+        control_topic = PROFILE_CONTROL_TOPIC.format(self.profile_name)
+        self.mqtt.subscribe(control_topic)
+        self.mqtt.message_callback_add(control_topic, self._profile_control)
+
+    def _profile_control(self, client, userdata, msg):
+        """Start or stop the profiler on a message on the control topic."""
+        try:
+            command = json.loads(msg.payload.decode('utf-8'))
+            action = command['action']
+        except (ValueError, KeyError, TypeError):
+            return
+
+        if action == 'start':
+            duration = command.get('duration', self.profile_duration)
+            # bool is a subclass of int, but not a duration.
+            if isinstance(duration, bool) or \
+                    not isinstance(duration, (int, float)) or \
+                    not 0 < duration <= MAX_PROFILE_DURATION:
+                return
+            self.profiler.start(duration)
+        elif action == 'stop':
+            # Don't wait, this would block the network loop.
+            self.profiler.stop(wait=False)
+
+    def _profile_finished(self, profile):
+        """Publish a profile on the result topic."""
+        self.publish(PROFILE_RESULT_TOPIC.format(self.profile_name),
+                     {'samples': profile.samples,
+                      'duration': profile.duration,
+                      'folded': profile.folded()})
+        super()._profile_finished(profile)
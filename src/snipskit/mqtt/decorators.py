@@ -20,10 +20,48 @@ Example:
         @topic('hermes/hotword/toggleOn')
         def hotword_on(self, topic, payload):
             print('Hotword on {} is toggled on.'.format(payload['siteId']))
+
+The decorators :func:`intent`, :func:`intents`, :func:`intent_not_recognized`,
+:func:`session_started`, :func:`session_ended` and :func:`session_queued` have
+the same names as the decorators in :mod:`snipskit.hermes.decorators`, but they
+subscribe directly to the MQTT topics of the intents and the dialogue manager.
+The payload is decoded as JSON by the :mod:`json` module, so they don't need
+the native library of Hermes Python:
+
+.. code-block:: python
+
+    from snipskit.mqtt.apps import MQTTSnipsApp
+    from snipskit.mqtt.decorators import intent
+
+    class SimpleSnipsApp(MQTTSnipsApp):
+
+        @intent('User:ExampleIntent')
+        def example_intent(self, topic, payload):
+            print('I received intent "User:ExampleIntent" on site {}'
+                  .format(payload['siteId']))
 """
 
 import json
 
+from snipskit import events, tracing
+
+INTENT = 'hermes/intent/{}'
+INTENTS = 'hermes/intent/#'
+DM_INTENT_NOT_RECOGNIZED = 'hermes/dialogueManager/intentNotRecognized'
+DM_SESSION_ENDED = 'hermes/dialogueManager/sessionEnded'
+DM_SESSION_QUEUED = 'hermes/dialogueManager/sessionQueued'
+DM_SESSION_STARTED = 'hermes/dialogueManager/sessionStarted'
+
+
+def _decode(payload):
+    """Decode a JSON payload."""
+    return json.loads(payload.decode('utf-8'))
+
+
+def _raw(payload):
+    """Return a binary payload as-is."""
+    return payload
+
 
 def topic(topic_name, json_decode=True):
     """Apply this decorator to a method of class :class:`.MQTTSnipsComponent`
@@ -39,11 +77,28 @@ def topic(topic_name, json_decode=True):
         json_decode (bool, optional): Whether or not the payload will be
             decoded as JSON to a dict. The default value is True. Set this to
             False if you want to subscribe to a topic with a binary payload.
+
+    .. versionchanged:: 0.7.0
+       The message is traced if a tracer is installed with
+       :func:`snipskit.tracing.set_tracer`, and logged if an event log is
+       installed with :func:`snipskit.events.set_event_log`.
     """
     def wrapper(method):
         def wrapped(self, client, userdata, msg):
             """This is the callback with the signature that Paho MQTT expects.
             """
+            event_log = events.get_event_log()
+            if event_log is not None or tracing.get_tracer() is not None:
+                def handle(payload):
+                    method(self, msg.topic, payload)
+
+                if event_log is not None:
+                    handle = events.logged(method.__name__, msg.topic, handle)
+                tracing.trace_message(method.__name__, msg.topic, msg.payload,
+                                      _decode if json_decode else _raw,
+                                      handle)
+                return
+
             if json_decode:
                 payload = json.loads(msg.payload.decode('utf-8'))
             else:
@@ -55,3 +110,75 @@ def topic(topic_name, json_decode=True):
         wrapped.topic = topic_name
         return wrapped
     return wrapper
+
+
+def intent(intent_name):
+    """Apply this decorator to a method of class :class:`.MQTTSnipsComponent`
+    to register it as a callback to be triggered when the intent `intent_name`
+    is recognized.
+
+    The callback needs to have the following signature:
+
+    method(self, topic, payload)
+
+    The payload is the intent message decoded as a dict, with keys such as
+    'sessionId', 'siteId', 'input', 'intent' and 'slots'.
+
+    Args:
+        intent_name (str): The intent you want to subscribe to.
+
+    .. versionadded:: 0.7.0
+    """
+    return topic(INTENT.format(intent_name))
+
+
+def intent_not_recognized(method):
+    """Apply this decorator to a method of class :class:`.MQTTSnipsComponent`
+    to register it as a callback to be triggered when the dialogue manager
+    doesn't recognize an intent.
+
+    .. versionadded:: 0.7.0
+    """
+    return topic(DM_INTENT_NOT_RECOGNIZED)(method)
+
+
+def intents(method):
+    """Apply this decorator to a method of class :class:`.MQTTSnipsComponent`
+    to register it as a callback to be triggered everytime an intent is
+    recognized.
+
+    The name of the intent is in `payload['intent']['intentName']`.
+
+    .. versionadded:: 0.7.0
+    """
+    return topic(INTENTS)(method)
+
+
+def session_ended(method):
+    """Apply this decorator to a method of class :class:`.MQTTSnipsComponent`
+    to register it as a callback to be triggered when the dialogue manager ends
+    a session.
+
+    .. versionadded:: 0.7.0
+    """
+    return topic(DM_SESSION_ENDED)(method)
+
+
+def session_queued(method):
+    """Apply this decorator to a method of class :class:`.MQTTSnipsComponent`
+    to register it as a callback to be triggered when the dialogue manager
+    queues the current session.
+
+    .. versionadded:: 0.7.0
+    """
+    return topic(DM_SESSION_QUEUED)(method)
+
+
+def session_started(method):
+    """Apply this decorator to a method of class :class:`.MQTTSnipsComponent`
+    to register it as a callback to be triggered when the dialogue manager
+    starts a new session.
+
+    .. versionadded:: 0.7.0
+    """
+    return topic(DM_SESSION_STARTED)(method)
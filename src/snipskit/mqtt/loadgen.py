@@ -0,0 +1,385 @@
+"""This module contains a load generator that simulates Snips satellites to
+measure how well a Snips app keeps up with many sites.
+
+Each simulated site runs complete dialogue flows, as the Snips platform would:
+
+1. the hotword is detected (`hermes/hotword/default/detected`);
+2. a session is started (`hermes/dialogueManager/sessionStarted`);
+3. an intent is recognized (`hermes/intent/<intentName>`);
+4. the app replies with a continueSession or endSession message;
+5. the session is ended (`hermes/dialogueManager/sessionEnded`).
+
+The load generator measures the time between publishing the intent and
+receiving the reply of the app, and counts the sessions that didn't get a
+reply in time.
+
+You can run the load generator on the command line with the `snipskit-loadgen`
+command. It reads the MQTT connection settings from snips.toml:
+
+.. code-block:: sh
+
+    snipskit-loadgen --sites 20 --rate 5 --duration 60 --intent User:Lights
+
+.. versionadded:: 0.7.0
+"""
+
+import argparse
+import json
+import math
+from threading import Event, Lock
+import time
+from uuid import uuid4
+
+from paho.mqtt.client import Client
+from snipskit.config import MQTTConfig, SnipsConfig
+from snipskit.mqtt.client import connect
+from snipskit.mqtt.dialogue import DM_CONTINUE_SESSION, DM_END_SESSION
+
+DM_SESSION_ENDED = 'hermes/dialogueManager/sessionEnded'
+DM_SESSION_STARTED = 'hermes/dialogueManager/sessionStarted'
+HOTWORD_DETECTED = 'hermes/hotword/default/detected'
+INTENT = 'hermes/intent/{}'
+
+DEFAULT_INTENT = 'snipskit:LoadTest'
+SITE_ID = 'loadgen-{}'
+
+
+def percentile(values, percent):
+    """Return a percentile of a list of values, using the nearest-rank method.
+
+    Args:
+        values (list): The values, sorted in ascending order.
+        percent (float): The percentile, between 0 and 100.
+
+    Returns:
+        float: The percentile, or `None` if the list is empty.
+    """
+    if not values:
+        return None
+
+    rank = max(1, math.ceil(percent / 100 * len(values)))
+    return values[min(rank, len(values)) - 1]
+
+
+def positive_float(value):
+    """Convert a command line argument to a number greater than 0.
+
+    Args:
+        value (str): The command line argument.
+
+    Returns:
+        float: The number.
+
+    Raises:
+        :exc:`argparse.ArgumentTypeError`: If the argument isn't a number
+            greater than 0.
+    """
+    try:
+        number = float(value)
+    except ValueError:
+        number = math.nan
+
+    if not number > 0:
+        raise argparse.ArgumentTypeError('{} is not a number greater than '
+                                         '0'.format(value))
+
+    return number
+
+
+class LoadReport:
+    """This class represents the results of a run of the load generator.
+
+    Attributes:
+        started (int): The number of sessions started.
+        completed (int): The number of sessions that got a reply in time.
+        timed_out (int): The number of sessions that got a reply after the
+            timeout.
+        lost (int): The number of sessions that never got a reply.
+        duration (float): The duration of the run in seconds.
+        latencies (list): The sorted latencies in seconds between publishing
+            an intent and receiving the reply, for all sessions that got a
+            reply.
+    """
+
+    def __init__(self, started, completed, timed_out, lost, duration,
+                 latencies):
+        """Initialize a :class:`.LoadReport` object.
+
+        Args:
+            started (int): The number of sessions started.
+            completed (int): The number of sessions that got a reply in time.
+            timed_out (int): The number of sessions that got a reply after the
+                timeout.
+            lost (int): The number of sessions that never got a reply.
+            duration (float): The duration of the run in seconds.
+            latencies (list): The latencies in seconds of all replies.
+        """
+        self.started = started
+        self.completed = completed
+        self.timed_out = timed_out
+        self.lost = lost
+        self.duration = duration
+        self.latencies = sorted(latencies)
+
+    @property
+    def throughput(self):
+        """Return the number of completed sessions per second.
+
+        Returns:
+            float: The throughput.
+        """
+        if not self.duration:
+            return 0.0
+        return self.completed / self.duration
+
+    def latency(self, percent):
+        """Return a percentile of the latencies.
+
+        Args:
+            percent (float): The percentile, between 0 and 100.
+
+        Returns:
+            float: The latency in seconds, or `None` if there are no replies.
+        """
+        return percentile(self.latencies, percent)
+
+    def __str__(self):
+        lines = ['Sessions started:   {}'.format(self.started),
+                 'Sessions completed: {}'.format(self.completed),
+                 'Sessions timed out: {}'.format(self.timed_out),
+                 'Sessions lost:      {}'.format(self.lost),
+                 'Duration:           {:.2f} s'.format(self.duration),
+                 'Throughput:         {:.2f} sessions/s'.format(self.throughput)]
+
+        for percent in (50, 90, 99, 100):
+            latency = self.latency(percent)
+            if latency is not None:
+                line = 'Latency p{:<3}       {:.1f} ms'
+                lines.append(line.format(percent, 1000 * latency))
+
+        return '\n'.join(lines)
+
+
+class LoadGenerator:
+    """This class simulates Snips satellites running dialogue flows.
+
+    Attributes:
+        client (`paho.mqtt.client.Client`_): The MQTT client object, connected
+            to the MQTT broker.
+        sites (int): The number of simulated sites.
+        rate (float): The number of sessions started per second over all
+            sites.
+        timeout (float): The time in seconds an app has to reply to an intent.
+        intent (str): The name of the intent to publish.
+        text (str): The input text of the intent.
+
+    .. _`paho.mqtt.client.Client`: https://www.eclipse.org/paho/clients/python/docs/#client
+    """
+
+    def __init__(self, client, sites=10, rate=1.0, timeout=5.0,
+                 intent=DEFAULT_INTENT, text='load test'):
+        """Initialize a :class:`.LoadGenerator` object.
+
+        The client must have a running network loop, e.g. started with its
+        `loop_start()` method.
+
+        Args:
+            client (`paho.mqtt.client.Client`_): The MQTT client object,
+                connected to the MQTT broker.
+            sites (int, optional): The number of simulated sites. Defaults to
+                10.
+            rate (float, optional): The number of sessions started per second
+                over all sites. Defaults to 1.
+            timeout (float, optional): The time in seconds an app has to reply
+                to an intent. Defaults to 5.
+            intent (str, optional): The name of the intent to publish.
+                Defaults to 'snipskit:LoadTest'.
+            text (str, optional): The input text of the intent. Defaults to
+                'load test'.
+
+        Raises:
+            ValueError: If the number of sites or the rate isn't greater than
+                0.
+
+        .. _`paho.mqtt.client.Client`: https://www.eclipse.org/paho/clients/python/docs/#client
+        """
+        if sites < 1:
+            raise ValueError('The number of sites must be greater than 0.')
+        if not rate > 0:
+            raise ValueError('The rate must be greater than 0.')
+
+        self.client = client
+        self.sites = sites
+        self.rate = rate
+        self.timeout = timeout
+        self.intent = intent
+        self.text = text
+
+        self._lock = Lock()
+        self._sessions = {}
+        self._latencies = []
+        self._timed_out = 0
+        self._all_replied = Event()
+
+        for topic in (DM_CONTINUE_SESSION, DM_END_SESSION):
+            client.message_callback_add(topic, self._reply)
+            client.subscribe(topic)
+
+    def _publish(self, topic, payload):
+        """Publish a payload encoded as JSON."""
+        self.client.publish(topic, json.dumps(payload))
+
+    def start_session(self, site_id):
+        """Start a dialogue flow on a site and publish its intent.
+
+        Args:
+            site_id (str): The site ID of the simulated satellite.
+
+        Returns:
+            str: The session ID.
+        """
+        session_id = str(uuid4())
+
+        self._publish(HOTWORD_DETECTED, {'siteId': site_id,
+                                         'modelId': 'default'})
+        self._publish(DM_SESSION_STARTED, {'sessionId': session_id,
+                                           'siteId': site_id,
+                                           'customData': None})
+
+        with self._lock:
+            self._sessions[session_id] = (site_id, time.monotonic())
+            self._all_replied.clear()
+
+        self._publish(INTENT.format(self.intent),
+                      {'sessionId': session_id,
+                       'siteId': site_id,
+                       'customData': None,
+                       'input': self.text,
+                       'intent': {'intentName': self.intent,
+                                  'confidenceScore': 1.0},
+                       'slots': []})
+
+        return session_id
+
+    def _reply(self, client, userdata, msg):
+        """Handle the reply of the app to an intent and end the session."""
+        now = time.monotonic()
+        try:
+            session_id = json.loads(msg.payload.decode('utf-8'))['sessionId']
+        except (ValueError, KeyError):
+            return
+
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is None:
+                # A reply to a session of someone else.
+                return
+
+            site_id, start = session
+            latency = now - start
+            self._latencies.append(latency)
+            if latency > self.timeout:
+                self._timed_out += 1
+            if not self._sessions:
+                self._all_replied.set()
+
+        self._publish(DM_SESSION_ENDED, {'sessionId': session_id,
+                                         'siteId': site_id,
+                                         'customData': None,
+                                         'termination': {'reason': 'nominal'}})
+
+    def run(self, duration=60.0):
+        """Run dialogue flows on all sites at the configured rate.
+
+        After starting the last session, the load generator waits for the
+        replies of the app for at most the timeout.
+
+        Args:
+            duration (float, optional): The time in seconds to start new
+                sessions. Defaults to 60.
+
+        Returns:
+            :class:`.LoadReport`: The results of the run.
+        """
+        interval = 1 / self.rate
+        start = time.monotonic()
+        started = 0
+
+        while time.monotonic() - start < duration:
+            self.start_session(SITE_ID.format(started % self.sites))
+            started += 1
+
+            delay = start + started * interval - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+        with self._lock:
+            waiting = bool(self._sessions)
+        if waiting:
+            self._all_replied.wait(self.timeout)
+
+        with self._lock:
+            lost = len(self._sessions)
+            self._sessions.clear()
+            latencies = self._latencies
+            timed_out = self._timed_out
+            self._latencies = []
+            self._timed_out = 0
+
+        return LoadReport(started, len(latencies) - timed_out, timed_out,
+                          lost, time.monotonic() - start, latencies)
+
+
+def main(args=None):
+    """Run the load generator from the command line.
+
+    Args:
+        args (list, optional): The command line arguments. Defaults to the
+            arguments of the process.
+    """
+    parser = argparse.ArgumentParser(prog='snipskit-loadgen',
+                                     description='Simulate Snips satellites '
+                                                 'running dialogue flows.')
+    parser.add_argument('-c', '--config',
+                        help='path of snips.toml (default: search path)')
+    parser.add_argument('-b', '--broker',
+                        help='MQTT broker address host:port (default: from '
+                             'snips.toml)')
+    parser.add_argument('-s', '--sites', type=int, default=10,
+                        help='number of simulated sites (default: 10)')
+    parser.add_argument('-r', '--rate', type=positive_float, default=1.0,
+                        help='sessions per second (default: 1)')
+    parser.add_argument('-d', '--duration', type=float, default=60.0,
+                        help='duration in seconds (default: 60)')
+    parser.add_argument('-t', '--timeout', type=float, default=5.0,
+                        help='reply timeout in seconds (default: 5)')
+    parser.add_argument('-i', '--intent', default=DEFAULT_INTENT,
+                        help='intent name (default: {})'.format(DEFAULT_INTENT))
+    parser.add_argument('--text', default='load test',
+                        help='input text of the intent')
+    args = parser.parse_args(args)
+
+    if args.sites < 1:
+        parser.error('argument -s/--sites: {} is not greater than '
+                     '0'.format(args.sites))
+
+    if args.broker:
+        mqtt_config = MQTTConfig(args.broker)
+    else:
+        mqtt_config = SnipsConfig(args.config).mqtt
+
+    client = Client()
+    connect(client, mqtt_config)
+    client.loop_start()
+
+    try:
+        generator = LoadGenerator(client, args.sites, args.rate, args.timeout,
+                                  args.intent, args.text)
+        print(generator.run(args.duration))
+    finally:
+        client.loop_stop()
+        client.disconnect()
+
+
+if __name__ == '__main__':
+    main()
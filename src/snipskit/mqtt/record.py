@@ -0,0 +1,331 @@
+"""This module contains classes and functions to record the MQTT traffic of a
+:class:`.MQTTSnipsComponent` object and replay it later, e.g. to reproduce an
+incident or to measure the throughput of your callbacks with realistic
+messages.
+
+The traffic is recorded in a compact append-only binary file. After a header,
+each message is stored as a record with:
+
+- the timestamp (float64, seconds since the epoch);
+- the length of the topic (uint16);
+- the length of the payload (uint32);
+- the topic (UTF-8);
+- the payload.
+
+All numbers are little-endian.
+
+Example:
+
+.. code-block:: python
+
+    from snipskit.mqtt.record import TrafficLog, TrafficRecorder, \\
+        dispatcher, replay
+
+    # In the initialize() method of your component:
+    self.recorder = TrafficRecorder('traffic.log')
+    self.recorder.attach(self.mqtt)
+
+    # Later, without an MQTT broker:
+    with TrafficLog('traffic.log') as log:
+        replay(log, dispatcher(component), speed=None)
+
+.. versionadded:: 0.7.0
+"""
+
+from collections import defaultdict
+import mmap
+import os
+from pathlib import Path
+import struct
+from threading import Lock
+import time
+
+from paho.mqtt.client import MQTTMessage, topic_matches_sub
+
+MAGIC = b'SKTRAFF\x01'
+
+_RECORD_HEADER = struct.Struct('<dHI')
+
+
+class TrafficRecorder:
+    """This class records MQTT messages in an append-only binary file.
+
+    Attributes:
+        filename (str): The filename of the traffic log.
+        count (int): The number of messages recorded by this object.
+    """
+
+    def __init__(self, filename):
+        """Initialize a :class:`.TrafficRecorder` object.
+
+        If the file already exists, new messages are appended to it.
+
+        Args:
+            filename (str): The filename of the traffic log.
+
+        Raises:
+            :exc:`ValueError`: If the file exists but isn't a traffic log.
+        """
+        self.filename = str(filename)
+        self.count = 0
+        self._lock = Lock()
+        self._file = Path(self.filename).open('ab')
+
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+        else:
+            with Path(self.filename).open('rb') as log:
+                if log.read(len(MAGIC)) != MAGIC:
+                    self._file.close()
+                    raise ValueError('{} is not a traffic log'.format(self.filename))
+
+    def attach(self, client):
+        """Record all messages that an MQTT client receives.
+
+        Args:
+            client (`paho.mqtt.client.Client`_): The MQTT client object, e.g.
+                the `mqtt` attribute of a :class:`.MQTTSnipsComponent`
+                object.
+
+        .. _`paho.mqtt.client.Client`: https://www.eclipse.org/paho/clients/python/docs/#client
+        """
+        client.message_callback_add('#', self._on_message)
+
+    def detach(self, client):
+        """Stop recording the messages that an MQTT client receives.
+
+        Args:
+            client (`paho.mqtt.client.Client`_): The MQTT client object.
+
+        .. _`paho.mqtt.client.Client`: https://www.eclipse.org/paho/clients/python/docs/#client
+        """
+        client.message_callback_remove('#')
+
+    def _on_message(self, client, userdata, msg):
+        """Record a message received by an MQTT client."""
+        self.record(msg.topic, msg.payload)
+
+    def record(self, topic, payload, timestamp=None):
+        """Append a message to the traffic log.
+
+        Args:
+            topic (str): The MQTT topic of the message.
+            payload (bytes): The payload of the message.
+            timestamp (float, optional): The time of the message in seconds
+                since the epoch. Defaults to the current time.
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        topic = topic.encode('utf-8')
+        if isinstance(payload, str):
+            payload = payload.encode('utf-8')
+
+        record = _RECORD_HEADER.pack(timestamp, len(topic), len(payload))
+        with self._lock:
+            self._file.write(record + topic + payload)
+            self.count += 1
+
+    def flush(self):
+        """Flush the recorded messages to disk."""
+        with self._lock:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        """Flush the recorded messages and close the traffic log."""
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class TrafficLog:
+    """This class reads a traffic log recorded by a :class:`.TrafficRecorder`
+    object.
+
+    The file is memory-mapped and indexed once, so you can access the messages
+    by their position or by their topic without reading the whole file.
+
+    Attributes:
+        filename (str): The filename of the traffic log.
+        topics (dict): The positions of the messages for each topic.
+
+    Example:
+        >>> log = TrafficLog('traffic.log')
+        >>> timestamp, topic, payload = log[0]
+        >>> len(log.topics['hermes/intent/koan:Intent1'])
+        42
+    """
+
+    def __init__(self, filename):
+        """Initialize a :class:`.TrafficLog` object.
+
+        A partially written record at the end of the file (e.g. after a crash
+        of the recorder) is ignored.
+
+        Args:
+            filename (str): The filename of the traffic log.
+
+        Raises:
+            :exc:`FileNotFoundError`: If the file doesn't exist.
+
+            :exc:`ValueError`: If the file isn't a traffic log.
+        """
+        self.filename = str(filename)
+        self.topics = defaultdict(list)
+        self._offsets = []
+
+        with Path(self.filename).open('rb') as log:
+            size = os.fstat(log.fileno()).st_size
+            if size < len(MAGIC) or log.read(len(MAGIC)) != MAGIC:
+                raise ValueError('{} is not a traffic log'.format(self.filename))
+            self._mmap = mmap.mmap(log.fileno(), 0, access=mmap.ACCESS_READ)
+
+        offset = len(MAGIC)
+        while offset + _RECORD_HEADER.size <= size:
+            _, topic_length, payload_length = \
+                _RECORD_HEADER.unpack_from(self._mmap, offset)
+            start = offset + _RECORD_HEADER.size
+            end = start + topic_length + payload_length
+            if end > size:
+                break
+
+            topic = self._mmap[start:start + topic_length].decode('utf-8')
+            self.topics[topic].append(len(self._offsets))
+            self._offsets.append(offset)
+            offset = end
+
+        self.topics = dict(self.topics)
+
+    def __len__(self):
+        """Return the number of messages in the traffic log."""
+        return len(self._offsets)
+
+    def __getitem__(self, index):
+        """Return the message at a position in the traffic log.
+
+        Args:
+            index (int): The position of the message.
+
+        Returns:
+            (float, str, bytes): A tuple with the timestamp, the topic and the
+            payload of the message.
+        """
+        offset = self._offsets[index]
+        timestamp, topic_length, payload_length = \
+            _RECORD_HEADER.unpack_from(self._mmap, offset)
+        start = offset + _RECORD_HEADER.size
+        topic = self._mmap[start:start + topic_length].decode('utf-8')
+        start += topic_length
+        return (timestamp, topic, self._mmap[start:start + payload_length])
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def messages(self, topic_filter='#'):
+        """Iterate over the messages with a topic matching a topic filter.
+
+        Args:
+            topic_filter (str, optional): An MQTT topic filter, which can
+                contain wildcards. Defaults to '#', which matches all messages.
+
+        Yields:
+            (float, str, bytes): A tuple with the timestamp, the topic and the
+            payload of each matching message, in the recorded order.
+        """
+        if topic_filter == '#':
+            yield from self
+            return
+
+        indexes = []
+        for topic, topic_indexes in self.topics.items():
+            if topic_matches_sub(topic_filter, topic):
+                indexes.extend(topic_indexes)
+
+        for index in sorted(indexes):
+            yield self[index]
+
+    def close(self):
+        """Unmap the traffic log."""
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def dispatcher(component):
+    """Return a function that feeds a message to the callbacks of a component,
+    as if it was received from the MQTT broker.
+
+    Args:
+        component (:class:`.MQTTSnipsComponent`): The component with methods
+            decorated by :func:`snipskit.mqtt.decorators.topic`.
+
+    Returns:
+        function: A function with the signature function(topic, payload) to
+        use with :func:`replay`.
+    """
+    callbacks = []
+    for name in dir(component):
+        callable_name = getattr(component, name)
+        if hasattr(callable_name, 'topic'):
+            callbacks.append((callable_name.topic, callable_name))
+
+    def dispatch(topic, payload):
+        msg = MQTTMessage(topic=topic.encode('utf-8'))
+        msg.payload = payload
+        for topic_filter, callback in callbacks:
+            if topic_matches_sub(topic_filter, topic):
+                callback(component.mqtt, None, msg)
+
+    return dispatch
+
+
+def replay(log, target, speed=1.0, topic_filter='#'):
+    """Replay the messages of a traffic log.
+
+    Args:
+        log (:class:`.TrafficLog`): The traffic log.
+        target (function): A function with the signature
+            function(topic, payload) that's called for each message, e.g. the
+            result of :func:`dispatcher` to feed the messages to a component,
+            or the `publish` method of a `paho.mqtt.client.Client`_ object to
+            publish them on an MQTT broker.
+        speed (float, optional): The speed relative to the recorded timing,
+            e.g. 1.0 for the original speed or 10.0 for ten times faster. Use
+            `None` to replay the messages as fast as possible. Defaults to
+            1.0.
+        topic_filter (str, optional): Only replay the messages with a topic
+            matching this MQTT topic filter. Defaults to '#'.
+
+    Returns:
+        (int, float): A tuple with the number of replayed messages and the
+        duration of the replay in seconds.
+
+    .. _`paho.mqtt.client.Client`: https://www.eclipse.org/paho/clients/python/docs/#client
+    """
+    count = 0
+    first_timestamp = None
+    start = time.monotonic()
+
+    for timestamp, topic, payload in log.messages(topic_filter):
+        if speed:
+            if first_timestamp is None:
+                first_timestamp = timestamp
+            delay = (timestamp - first_timestamp) / speed \
+                - (time.monotonic() - start)
+            if delay > 0:
+                time.sleep(delay)
+
+        target(topic, payload)
+        count += 1
+
+    return (count, time.monotonic() - start)
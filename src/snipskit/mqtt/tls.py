@@ -0,0 +1,163 @@
+"""This module contains a process-wide cache of TLS contexts for connections to
+MQTT brokers, with TLS session resumption.
+
+Creating a TLS context loads the CA certificates and the client certificate
+from disk, and a full TLS handshake is expensive on a small computer such as a
+Raspberry Pi. The function :func:`tls_context` returns the same
+:class:`ssl.SSLContext` object for all connections with the same TLS settings,
+and this context remembers the TLS session of the last connection to each
+broker, so a reconnect or the next :func:`snipskit.mqtt.client.publish_single`
+call can resume the session with an abbreviated handshake.
+
+The functions :func:`snipskit.mqtt.client.connect` and
+:func:`snipskit.mqtt.client.publish_single` use this cache automatically when
+TLS is enabled.
+
+.. note::
+   TLS session resumption requires Python 3.7 or higher. On older versions,
+   the contexts are still shared, but each connection does a full handshake.
+   Python 3.5 doesn't have the protocol `ssl.PROTOCOL_TLS_CLIENT`, so the
+   contexts use the generic protocol `ssl.PROTOCOL_TLS` (or
+   `ssl.PROTOCOL_SSLv23`) there, with the same certificate and hostname
+   checks.
+
+.. versionadded:: 0.7.0
+"""
+
+import os
+import ssl
+from threading import Lock
+
+# The protocol of a client context. PROTOCOL_TLS_CLIENT is new in Python 3.6
+# and PROTOCOL_TLS in Python 3.5.3.
+_PROTOCOL = getattr(ssl, 'PROTOCOL_TLS_CLIENT', None) or \
+    getattr(ssl, 'PROTOCOL_TLS', ssl.PROTOCOL_SSLv23)
+
+# The cache of TLS contexts, with a tuple of the TLS settings and the identity
+# of the certificate files as key.
+_contexts = {}
+_contexts_lock = Lock()
+
+
+class _ResumingSSLSocket(ssl.SSLSocket):
+    """An SSL socket that hands its TLS session to its context, so the next
+    connection to the same server can resume it."""
+
+    def do_handshake(self, *args, **kwargs):
+        super().do_handshake(*args, **kwargs)
+        self.context._save_session(self)
+
+    def close(self):
+        # With TLS 1.3, the session ticket only arrives after the handshake.
+        self.context._save_session(self)
+        super().close()
+
+
+class _ResumingSSLContext(ssl.SSLContext):
+    """An SSL context that resumes the last TLS session of each server."""
+
+    sslsocket_class = _ResumingSSLSocket
+
+    def __init__(self, protocol=None):
+        self._sessions = {}
+        self._sessions_lock = Lock()
+
+    def _session_key(self, sock, server_hostname):
+        """Return the key of the TLS session of a socket."""
+        try:
+            return (server_hostname, sock.getpeername()[:2])
+        except OSError:
+            return None
+
+    def _save_session(self, sock):
+        """Remember the TLS session of a connected SSL socket."""
+        try:
+            session = sock.session
+        except (AttributeError, ValueError):
+            return
+        if session is None:
+            return
+
+        key = self._session_key(sock, sock.server_hostname)
+        if key is not None:
+            with self._sessions_lock:
+                self._sessions[key] = session
+
+    def wrap_socket(self, sock, *args, **kwargs):
+        if kwargs.get('session') is None:
+            key = self._session_key(sock, kwargs.get('server_hostname'))
+            with self._sessions_lock:
+                session = self._sessions.get(key)
+            if session is not None:
+                kwargs['session'] = session
+
+        return super().wrap_socket(sock, *args, **kwargs)
+
+
+def _file_identity(filename):
+    """Return the identity of a certificate file, so a renewed certificate
+    gets a new context."""
+    if not filename:
+        return None
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def _create_context(connection):
+    """Create a TLS context with the settings of a connection."""
+    context = _ResumingSSLContext(_PROTOCOL)
+    context.verify_mode = ssl.CERT_REQUIRED
+    context.check_hostname = True
+
+    if connection.ca_file or connection.ca_path:
+        context.load_verify_locations(connection.ca_file, connection.ca_path)
+    elif not connection.disable_root_store:
+        context.load_default_certs()
+
+    if connection.client_cert:
+        context.load_cert_chain(connection.client_cert, connection.client_key)
+
+    return context
+
+
+def tls_context(connection):
+    """Return the shared TLS context for the TLS settings of a connection.
+
+    The context is created the first time and when one of the certificate
+    files has changed.
+
+    Args:
+        connection (:class:`.MQTTConnection`): The connection parameters,
+            e.g. the :attr:`.MQTTConfig.connection` attribute.
+
+    Returns:
+        :class:`ssl.SSLContext`: The TLS context, which resumes the TLS
+        sessions of earlier connections.
+
+    Raises:
+        :exc:`ssl.SSLError`: If a certificate file isn't valid.
+
+        :exc:`FileNotFoundError`: If a certificate file doesn't exist.
+    """
+    key = (connection.ca_file, connection.ca_path, connection.client_key,
+           connection.client_cert, connection.disable_root_store,
+           _file_identity(connection.ca_file),
+           _file_identity(connection.client_key),
+           _file_identity(connection.client_cert))
+
+    with _contexts_lock:
+        context = _contexts.get(key)
+        if context is None:
+            context = _create_context(connection)
+            _contexts[key] = context
+
+    return context
+
+
+def clear_tls_cache():
+    """Remove all TLS contexts and their TLS sessions from the cache."""
+    with _contexts_lock:
+        _contexts.clear()
@@ -0,0 +1,166 @@
+"""This module contains a class to let Snips say a text with a cache of
+synthesized audio, using the MQTT protocol directly.
+
+When a text is said for the first time, a :class:`.CachedTTS` object publishes
+a `hermes/tts/say` message and captures the audio the TTS service sends to the
+audio server in its playBytes message. The next time the same text is said, the
+cached audio is published in a playBytes message directly, without a new
+synthesis.
+
+Example:
+
+.. code-block:: python
+
+    from snipskit.mqtt.apps import MQTTSnipsApp
+    from snipskit.mqtt.decorators import topic
+    from snipskit.mqtt.tts import CachedTTS
+    from snipskit.tts import TTSCache
+
+
+    class GreetingApp(MQTTSnipsApp):
+
+        def initialize(self):
+            self.tts = CachedTTS(self.mqtt, TTSCache('/var/cache/greeting'))
+
+        @topic('hermes/hotword/+/detected')
+        def greet(self, topic, payload):
+            self.tts.say('Hello', payload['siteId'], language='en')
+
+A :class:`.HermesSnipsApp` object doesn't have an MQTT client of its own, but
+it can use the cache with a separate client:
+
+.. code-block:: python
+
+    from paho.mqtt.client import Client
+    from snipskit.mqtt.client import connect
+
+    client = Client()
+    connect(client, self.snips.mqtt)
+    client.loop_start()
+    self.tts = CachedTTS(client, TTSCache('/var/cache/greeting'))
+
+.. versionadded:: 0.7.0
+"""
+
+from collections import OrderedDict
+import json
+from threading import Lock
+import time
+from uuid import uuid4
+
+from snipskit.mqtt.client import subscribe
+
+PLAY_BYTES = 'hermes/audioServer/{}/playBytes/{}'
+TTS_SAY = 'hermes/tts/say'
+DEFAULT_SAY_TIMEOUT = 60.0
+
+
+class CachedTTS:
+    """This class says texts on a Snips site with the Snips TTS service or
+    with cached audio.
+
+    Attributes:
+        client (`paho.mqtt.client.Client`_): The MQTT client object.
+        cache (:class:`.TTSCache`): The cache of synthesized audio.
+        pending (dict): The say requests that are waiting for their audio, with
+            the request ID as key and a tuple (text, language, voice, start
+            time) as value.
+        timeout (float): The time in seconds after which a say request that
+            hasn't received its audio is forgotten.
+
+    .. _`paho.mqtt.client.Client`: https://www.eclipse.org/paho/clients/python/docs/#client
+    """
+
+    def __init__(self, client, cache, timeout=DEFAULT_SAY_TIMEOUT):
+        """Initialize a :class:`.CachedTTS` object.
+
+        This subscribes to the playBytes messages of all sites, now and each
+        time the client connects again, with
+        :func:`snipskit.mqtt.client.subscribe`.
+
+        Args:
+            client (`paho.mqtt.client.Client`_): The MQTT client object.
+            cache (:class:`.TTSCache`): The cache of synthesized audio.
+            timeout (float, optional): The time in seconds after which a say
+                request that hasn't received its audio is forgotten. Defaults
+                to 60.
+
+        .. _`paho.mqtt.client.Client`: https://www.eclipse.org/paho/clients/python/docs/#client
+        """
+        self.client = client
+        self.cache = cache
+        self.timeout = timeout
+        self.pending = OrderedDict()
+
+        self._lock = Lock()
+
+        subscribe(client, PLAY_BYTES.format('+', '+'), self._play_bytes)
+
+    def say(self, text, site_id='default', language=None, voice=None,
+            session_id=None):
+        """Say a text on a site.
+
+        Args:
+            text (str): The text to say.
+            site_id (str, optional): The site ID to say the text on. Defaults
+                to 'default'.
+            language (str, optional): The language of the text. Defaults to
+                the language of the TTS service.
+            voice (str, optional): The voice of the TTS service. This is only
+                used as part of the cache key: the voice itself is configured
+                in snips.toml.
+            session_id (str, optional): The session ID of the say request, if
+                the text is said in a dialogue session.
+
+        Returns:
+            (str, bool): A tuple of the request ID and whether the text was
+            found in the cache.
+        """
+        request_id = str(uuid4())
+
+        wav = self.cache.get(text, language, voice)
+        if wav is not None:
+            self.client.publish(PLAY_BYTES.format(site_id, request_id), wav)
+            return (request_id, True)
+
+        payload = {'text': text, 'siteId': site_id, 'id': request_id}
+        if language:
+            payload['lang'] = language
+        if session_id:
+            payload['sessionId'] = session_id
+
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            self.pending[request_id] = (text, language, voice, now)
+
+        self.client.publish(TTS_SAY, json.dumps(payload))
+        return (request_id, False)
+
+    def _expire(self, now):
+        """Forget the say requests that are older than the timeout, e.g.
+        because the TTS service didn't answer.
+
+        The pending requests are ordered by their start time, so only the
+        oldest ones are checked.
+        """
+        while self.pending:
+            request_id, request = next(iter(self.pending.items()))
+            if now - request[3] < self.timeout:
+                break
+            del self.pending[request_id]
+
+    def _play_bytes(self, client, userdata, msg):
+        """Capture the audio of a pending say request.
+
+        The TTS service uses the ID of the say request as the request ID of
+        its playBytes message.
+        """
+        request_id = msg.topic.rsplit('/', 1)[-1]
+
+        with self._lock:
+            request = self.pending.pop(request_id, None)
+
+        if request:
+            text, language, voice, _ = request
+            self.cache.put(text, msg.payload, language, voice)
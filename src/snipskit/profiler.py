@@ -0,0 +1,228 @@
+"""This module contains a sampling profiler to profile a running Snips
+component without restarting it.
+
+A :class:`.SamplingProfiler` object samples the stacks of all threads of the
+process at a fixed interval in a background thread, for a limited time. It
+doesn't trace each function call like :mod:`cProfile`, so the component keeps
+handling messages at nearly its normal speed while it's being profiled.
+
+The result is a :class:`.Profile` object with the number of samples of each
+stack. Its :meth:`.Profile.folded` method returns the stacks in the collapsed
+format of FlameGraph_, which tools such as speedscope_ also read.
+
+.. _FlameGraph: https://github.com/brendangregg/FlameGraph
+
+.. _speedscope: https://www.speedscope.app
+
+A Snips component starts and stops a profiler with the method
+:meth:`.SnipsComponent.enable_profiling` on a signal, and a
+:class:`.MQTTSnipsComponent` object also on a message on its profiling control
+topic.
+
+Example:
+
+.. code-block:: python
+
+    from snipskit.profiler import SamplingProfiler
+
+    profiler = SamplingProfiler()
+    profiler.start(duration=10)
+    # ...
+    profile = profiler.stop()
+    profile.write('app.folded')
+
+.. versionadded:: 0.7.0
+"""
+
+import sys
+from threading import current_thread, enumerate as enumerate_threads, \
+    Event, Lock, Thread
+import time
+
+DEFAULT_INTERVAL = 0.005
+DEFAULT_DURATION = 30.0
+
+
+def _frame_label(frame):
+    """Return the label of a frame in a folded stack."""
+    code = frame.f_code
+    return '{} ({}:{})'.format(code.co_name, code.co_filename,
+                               code.co_firstlineno).replace(';', ':')
+
+
+class Profile:
+    """This class represents the result of a run of a
+    :class:`.SamplingProfiler` object.
+
+    Attributes:
+        stacks (dict): A dict with the stacks as keys and their number of
+            samples as values. A stack is a tuple of the thread name and the
+            labels of the frames, from the outermost to the innermost frame.
+        samples (int): The number of times the threads were sampled.
+        duration (float): The duration of the run in seconds.
+    """
+
+    def __init__(self, stacks, samples, duration):
+        """Initialize a :class:`.Profile` object.
+
+        Args:
+            stacks (dict): A dict with the stacks as keys and their number of
+                samples as values.
+            samples (int): The number of times the threads were sampled.
+            duration (float): The duration of the run in seconds.
+        """
+        self.stacks = stacks
+        self.samples = samples
+        self.duration = duration
+
+    def folded(self):
+        """Return the stacks in the collapsed format of FlameGraph.
+
+        Returns:
+            str: A line 'thread;outer frame;...;inner frame count' for each
+            stack, with the most sampled stacks first.
+        """
+        lines = ['{} {}'.format(';'.join(stack), count)
+                 for stack, count
+                 in sorted(self.stacks.items(), key=lambda item: -item[1])]
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    def write(self, filename):
+        """Write the stacks in the collapsed format of FlameGraph to a file.
+
+        Args:
+            filename (str): The path of the file.
+        """
+        with open(filename, 'wt') as profile_file:
+            profile_file.write(self.folded())
+
+
+class SamplingProfiler:
+    """This class samples the stacks of the threads of the process.
+
+    Attributes:
+        interval (float): The time in seconds between two samples.
+        focus (set): The code objects to focus on, or `None`. If this is set,
+            only stacks with a frame of one of these code objects are counted,
+            starting from the outermost of these frames.
+        on_finish (function): The function that is called with the
+            :class:`.Profile` object when a run has finished, or `None`.
+        profile (:class:`.Profile`): The result of the last run, or `None`.
+    """
+
+    def __init__(self, interval=DEFAULT_INTERVAL, focus=None, on_finish=None):
+        """Initialize a :class:`.SamplingProfiler` object.
+
+        Args:
+            interval (float, optional): The time in seconds between two
+                samples. Defaults to 5 milliseconds.
+            focus (set, optional): The code objects to focus on, e.g. the
+                `__code__` attributes of the handlers of a component. Defaults
+                to `None`, which counts all stacks.
+            on_finish (function, optional): A function that is called with
+                the :class:`.Profile` object in the thread of the profiler
+                when a run has finished. Defaults to `None`.
+        """
+        self.interval = interval
+        self.focus = focus
+        self.on_finish = on_finish
+        self.profile = None
+
+        self._lock = Lock()
+        self._stop = Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        """Check whether the profiler is running.
+
+        Returns:
+            bool: True if the profiler is running; False otherwise.
+        """
+        thread = self._thread
+        return thread is not None and thread.is_alive()
+
+    def _stack(self, thread_name, frame):
+        """Return the stack of a frame, or `None` if it's out of focus."""
+        frames = []
+        while frame is not None:
+            frames.append(frame)
+            frame = frame.f_back
+        frames.reverse()
+
+        if self.focus is not None:
+            for index, frame in enumerate(frames):
+                if frame.f_code in self.focus:
+                    frames = frames[index:]
+                    break
+            else:
+                return None
+
+        return (thread_name,) + tuple(_frame_label(frame) for frame in frames)
+
+    def _run(self, duration):
+        """Sample the threads until the profiler is stopped or the duration
+        has passed."""
+        stacks = {}
+        samples = 0
+        own_id = current_thread().ident
+        start = time.monotonic()
+        deadline = start + duration
+
+        while not self._stop.is_set() and time.monotonic() < deadline:
+            names = {thread.ident: thread.name
+                     for thread in enumerate_threads()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = self._stack(names.get(thread_id, str(thread_id)),
+                                    frame)
+                if stack is not None:
+                    stacks[stack] = stacks.get(stack, 0) + 1
+            samples += 1
+            self._stop.wait(self.interval)
+
+        self.profile = Profile(stacks, samples, time.monotonic() - start)
+        if self.on_finish:
+            self.on_finish(self.profile)
+
+    def start(self, duration=DEFAULT_DURATION):
+        """Start sampling in a daemon thread.
+
+        Args:
+            duration (float, optional): The maximum time in seconds to sample.
+                Defaults to 30.
+
+        Returns:
+            bool: True if the profiler has been started; False if it was
+            already running.
+        """
+        with self._lock:
+            if self.running:
+                return False
+
+            self._stop.clear()
+            self._thread = Thread(target=self._run, args=(duration,),
+                                  name='SamplingProfiler', daemon=True)
+            self._thread.start()
+            return True
+
+    def stop(self, wait=True):
+        """Stop sampling.
+
+        Args:
+            wait (bool, optional): Whether to wait until the profiler has
+                finished. Set this to False in a signal handler. Defaults to
+                True.
+
+        Returns:
+            :class:`.Profile`: The result of the run if `wait` is True, or
+            `None`.
+        """
+        self._stop.set()
+        thread = self._thread
+        if not wait or thread is None:
+            return None
+        if thread is not current_thread():
+            thread.join()
+        return self.profile
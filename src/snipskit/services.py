@@ -1,8 +1,25 @@
-"""This module contains some functions related to Snips services."""
+"""This module contains some functions related to Snips services.
 
-from psutil import process_iter, NoSuchProcess
+To check which Snips services are running, a :class:`.ProcessSnapshot` object
+scans the process table once and answers all questions about the Snips
+processes from this snapshot: whether they're running, their PIDs, their
+uptime and their number of instances.
+
+The output of `<service> --version` is cached for each binary until the binary
+changes, e.g. after an upgrade of Snips. The functions :func:`installed` and
+:func:`versions` run the commands of all binaries that aren't cached yet in
+parallel.
+
+The module :mod:`snipskit.aioservices` has coroutine versions of these
+functions for asyncio applications.
+"""
+
+import os
 import re
+import shutil
 from subprocess import check_output
+from threading import Lock
+import time
 
 SNIPS_SERVICES = ['snips-analytics', 'snips-asr', 'snips-asr-google',
                   'snips-audio-server', 'snips-dialogue', 'snips-hotword',
@@ -10,18 +27,12 @@ SNIPS_SERVICES = ['snips-analytics', 'snips-asr', 'snips-asr-google',
                   'snips-tts']
 VERSION_FLAG = '--version'
 
-
-def _state(state_function):
-    """Return a dict with the state of all Snips Services.
-
-    Args:
-        state_function: A function that returns a state for a Snips service.
-
-    Returns:
-        dict: A dict with all Snips services as keys and their state as value.
-    """
-    states = [state_function(service) for service in SNIPS_SERVICES]
-    return dict(zip(SNIPS_SERVICES, states))
+# The cache of the version outputs, with the path of the binary as key and a
+# tuple (identity of the binary, version output) as value.
+_version_cache = {}
+_version_cache_lock = Lock()
+# A lock for each binary, so it's only run once by concurrent callers.
+_version_locks = {}
 
 
 def _version_output(service):
@@ -40,16 +51,111 @@ def _version_output(service):
         >>> _version_output('snips-nlu')
         'snips-nlu 1.1.2 (0.62.3) [model_version: 0.19.0]'
     """
-    try:
-        version_output = check_output([service,
-                                       VERSION_FLAG]).decode('utf-8').strip()
+    path, identity = _binary(service)
+    if path is None:
+        return ''
+
+    with _version_cache_lock:
+        cached = _version_cache.get(path)
+        if cached and cached[0] == identity:
+            return cached[1]
+        lock = _version_locks.setdefault(path, Lock())
+
+    with lock:
+        # Another thread could have run the binary in the meantime.
+        version_output = _cached_version_output(path, identity)
+        if version_output is not None:
+            return version_output
+
+        try:
+            version_output = check_output([path, VERSION_FLAG])
+            version_output = version_output.decode('utf-8').strip()
+        except FileNotFoundError:
+            # The binary has been removed in the meantime.
+            version_output = ''
 
-    except FileNotFoundError:
-        version_output = ''
+        with _version_cache_lock:
+            _version_cache[path] = (identity, version_output)
 
     return version_output
 
 
+def _binary(service):
+    """Return the path and the identity of the binary of a service.
+
+    Returns:
+        (str, tuple): A tuple with the path of the binary and a tuple (inode,
+        modification time, size) of the binary, or (None, None) if the binary
+        isn't found.
+    """
+    path = shutil.which(service)
+    if path is None:
+        return (None, None)
+
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return (None, None)
+
+    return (path, (stat.st_ino, stat.st_mtime_ns, stat.st_size))
+
+
+def _cached_version_output(path, identity):
+    """Return the cached version output of a binary, or `None` if it isn't
+    cached or the binary has changed."""
+    with _version_cache_lock:
+        cached = _version_cache.get(path)
+    if cached and cached[0] == identity:
+        return cached[1]
+    return None
+
+
+def _version_outputs(services):
+    """Return the version outputs of services, running the binaries that
+    aren't cached in parallel.
+
+    Args:
+        services (list): The services to check the version of.
+
+    Returns:
+        dict: A dict with the services as keys and their version output as
+        value.
+    """
+    uncached = []
+    for service in services:
+        path, identity = _binary(service)
+        if path is not None and \
+                _cached_version_output(path, identity) is None:
+            uncached.append(service)
+
+    if len(uncached) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(len(uncached)) as executor:
+            list(executor.map(_version_output, uncached))
+
+    return {service: _version_output(service) for service in services}
+
+
+def _parse_version(version_output):
+    """Return the version number in the version output of a service, or an
+    empty string if the version output is empty."""
+    try:
+        return version_output.split()[1]
+    except IndexError:
+        # The version output is empty, so the service is not installed.
+        return ''
+
+
+def _parse_model_version(version_output):
+    """Return the model version in the version output of snips-nlu, or an
+    empty string if it isn't found."""
+    try:
+        return re.search(r'\[model_version: (.*)\]', version_output).group(1)
+    except (AttributeError, IndexError):
+        return ''
+
+
 def is_installed(service):
     """Check whether the Snips service `service` is installed.
 
@@ -85,16 +191,7 @@ def is_running(service):
 
     .. versionadded:: 0.5.3
     """
-    service_found = False
-    for process in process_iter():
-        try:
-            if service == process.name():
-                service_found = True
-                break
-        except NoSuchProcess:  # Happens when the process no longer exists.
-            pass
-
-    return service_found
+    return ProcessSnapshot([service]).is_running(service)
 
 
 def model_version():
@@ -111,14 +208,7 @@ def model_version():
 
     .. versionadded:: 0.5.3
     """
-    version_output = _version_output('snips-nlu')
-    try:
-        model_version = re.search(r'\[model_version: (.*)\]',
-                                  version_output).group(1)
-    except (AttributeError, IndexError):
-        model_version = ''
-
-    return model_version
+    return _parse_model_version(_version_output('snips-nlu'))
 
 
 def installed():
@@ -130,7 +220,9 @@ def installed():
 
     .. versionadded:: 0.5.3
     """
-    return _state(is_installed)
+    return {service: bool(version_output)
+            for service, version_output
+            in _version_outputs(SNIPS_SERVICES).items()}
 
 
 def running():
@@ -141,8 +233,11 @@ def running():
         (True or False) as value.
 
     .. versionadded:: 0.5.3
+
+    .. versionchanged:: 0.7.0
+       The process table is scanned only once.
     """
-    return _state(is_running)
+    return ProcessSnapshot().running()
 
 
 def versions():
@@ -155,7 +250,9 @@ def versions():
 
     .. versionadded:: 0.5.3
     """
-    return _state(version)
+    return {service: _parse_version(version_output)
+            for service, version_output
+            in _version_outputs(SNIPS_SERVICES).items()}
 
 
 def version(service=None):
@@ -183,11 +280,120 @@ def version(service=None):
     .. versionadded:: 0.5.3
     """
     if service:
-        try:
-            return _version_output(service).split()[1]
-        except IndexError:
-            # The version output is empty, so the service is not installed.
-            return ''
+        return _parse_version(_version_output(service))
     else:
         # Filter the empty versions and then compute the minimum value.
         return min([version for version in versions().values() if version])
+
+
+class ProcessSnapshot:
+    """This class represents the Snips processes that were running when the
+    object was created.
+
+    The process table is scanned once, fetching only the name, PID and
+    creation time of each process.
+
+    .. versionadded:: 0.7.0
+
+    Attributes:
+        services (list): The names of the services in the snapshot.
+        processes (dict): A dict with the service names as keys and a list of
+            tuples (PID, creation time) of their processes as values. The
+            creation time is in seconds since the epoch, or `None` if it's not
+            accessible.
+        time (float): The time of the snapshot in seconds since the epoch.
+
+    Example:
+
+        >>> snapshot = ProcessSnapshot()
+        >>> snapshot.is_running('snips-nlu')
+        True
+        >>> snapshot.pids('snips-nlu')
+        [1234]
+    """
+
+    def __init__(self, services=None):
+        """Initialize a :class:`.ProcessSnapshot` object by scanning the
+        process table.
+
+        Args:
+            services (list, optional): The names of the services to look for.
+                Defaults to all Snips services.
+        """
+        from psutil import process_iter
+
+        if services is None:
+            services = SNIPS_SERVICES
+        self.services = list(services)
+        self.processes = {service: [] for service in self.services}
+        self.time = time.time()
+
+        # Processes that exist no longer are skipped by process_iter, and
+        # attributes that aren't accessible are None.
+        for process in process_iter(['name', 'pid', 'create_time']):
+            info = process.info
+            instances = self.processes.get(info['name'])
+            if instances is not None:
+                instances.append((info['pid'], info['create_time']))
+
+    def is_running(self, service):
+        """Check whether a service was running.
+
+        Args:
+            service (str): The name of the service.
+
+        Returns:
+            bool: True if the service was running; False otherwise.
+        """
+        return bool(self.processes.get(service))
+
+    def instances(self, service):
+        """Return the number of running processes of a service.
+
+        Args:
+            service (str): The name of the service.
+
+        Returns:
+            int: The number of processes.
+        """
+        return len(self.processes.get(service, []))
+
+    def pids(self, service):
+        """Return the PIDs of the running processes of a service.
+
+        Args:
+            service (str): The name of the service.
+
+        Returns:
+            list: The PIDs of the processes, sorted.
+        """
+        return sorted(pid for pid, _ in self.processes.get(service, []))
+
+    def uptime(self, service):
+        """Return the uptime of a service: the time since its oldest running
+        process was started.
+
+        Args:
+            service (str): The name of the service.
+
+        Returns:
+            float: The uptime in seconds at the time of the snapshot, or
+            `None` if the service wasn't running or its creation time isn't
+            accessible.
+        """
+        create_times = [create_time
+                        for _, create_time in self.processes.get(service, [])
+                        if create_time is not None]
+        if not create_times:
+            return None
+        return max(0.0, self.time - min(create_times))
+
+    def running(self):
+        """Return a dict with the running state of all services in the
+        snapshot.
+
+        Returns:
+            dict: A dict with the services as keys and their running state
+            (True or False) as value.
+        """
+        return {service: self.is_running(service) for service in self.services}
@@ -1,15 +1,21 @@
 """This module contains some useful tools for the snipskit library."""
 
+import json
+import os
 from pathlib import Path
 import re
-from urllib.request import urlopen
-
-# Workaround for occasional errors when downloading the release notes.
-import http.client
-http.client._MAXHEADERS = 1000
+import time
 
 _RELEASE_NOTES_URL = 'https://docs.snips.ai/additional-resources/release-notes'
 _LATEST_VERSION_REGEX = r'<span data-offset-key="\S*">Platform Update (\d*\.\d*\.\d*)\s'
+_LATEST_VERSION_PATTERN = re.compile(_LATEST_VERSION_REGEX.encode('ascii'))
+
+_CACHE_FILENAME = 'latest_snips_version.json'
+_CHUNK_SIZE = 16384
+# The number of bytes at the end of a chunk that are scanned again with the
+# next chunk, so a version that's split over two chunks is found.
+_CHUNK_OVERLAP = 1024
+DEFAULT_TTL = 24 * 60 * 60
 
 
 def find_path(paths):
@@ -40,9 +46,93 @@ def find_path(paths):
     return None
 
 
-def latest_snips_version():
+def _default_cache_file():
+    """Return the default path of the cache file of
+    :func:`latest_snips_version`."""
+    cache_home = os.environ.get('XDG_CACHE_HOME') or \
+        str(Path.home() / '.cache')
+    return str(Path(cache_home) / 'snipskit' / _CACHE_FILENAME)
+
+
+def _read_cache(cache_file, url):
+    """Return the cached result of :func:`latest_snips_version` for a URL, or
+    an empty dict."""
+    try:
+        with open(cache_file, 'rt') as cache:
+            cached = json.load(cache)
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(cached, dict) or cached.get('url') != url or \
+            not cached.get('version'):
+        return {}
+    return cached
+
+
+def _write_cache(cache_file, cached):
+    """Write the result of :func:`latest_snips_version` to the cache file,
+    ignoring errors."""
+    # snipskit.config imports this module.
+    from snipskit.config import _write_atomic
+
+    try:
+        Path(cache_file).parent.mkdir(parents=True, exist_ok=True)
+        _write_atomic(cache_file, json.dumps(cached))
+    except OSError:
+        pass
+
+
+def _scan_version(stream):
+    """Read a stream in chunks until the first Snips version is found.
+
+    This assumes that the release notes list the newest release first, as
+    they always have, so the first version is the latest one. Reading the
+    rest of the page to take the maximum of all versions isn't needed.
+
+    Args:
+        stream: A binary file-like object, e.g. an HTTP response.
+
+    Returns:
+        str: The first Snips version in the stream, or `None` if there's
+        none.
+    """
+    buffer = b''
+    while True:
+        chunk = stream.read(_CHUNK_SIZE)
+        if not chunk:
+            return None
+
+        buffer += chunk
+        match = _LATEST_VERSION_PATTERN.search(buffer)
+        if match:
+            return match.group(1).decode('ascii')
+
+        # Keep the end of the buffer, it could be the start of a match.
+        buffer = buffer[-_CHUNK_OVERLAP:]
+
+
+def latest_snips_version(cache_file=None, ttl=DEFAULT_TTL,
+                         url=_RELEASE_NOTES_URL):
     """Return the latest version of Snips, as published in the release notes.
 
+    The result is cached on disk. Within `ttl` seconds after the release
+    notes have been checked, the cached version is returned without a
+    request. After that, a conditional request is made with the ETag and
+    Last-Modified headers of the previous response, so the release notes are
+    only downloaded again when they have changed. The release notes are read
+    in chunks until the first version is found, which is the latest version
+    because the release notes list the newest release first.
+
+    Args:
+        cache_file (str, optional): The path of the cache file. Defaults to
+            `$XDG_CACHE_HOME/snipskit/latest_snips_version.json`, with
+            `~/.cache` as default value of `$XDG_CACHE_HOME`.
+        ttl (float, optional): The time in seconds a cached result is used
+            without checking the release notes. Defaults to one day. Use 0 to
+            check the release notes with a conditional request on each call.
+        url (str, optional): The URL of the release notes. Defaults to the
+            release notes on the Snips documentation website.
+
     Returns:
         str: The latest version of Snips.
 
@@ -50,9 +140,55 @@ def latest_snips_version():
         urllib.error.URLError: When the function runs into a problem
             downloading the release notes.
 
+        :exc:`ValueError`: When the release notes don't contain a version.
+
     .. versionadded:: 0.5.4
+
+    .. versionchanged:: 0.7.0
+       The result is cached and the release notes are downloaded with a
+       conditional request.
     """
-    url = urlopen(_RELEASE_NOTES_URL)
-    release_notes = url.read().decode('utf-8')
-    versions = re.findall(_LATEST_VERSION_REGEX, release_notes)
-    return max(versions)
+    # urllib.request is slow to import, so only import it when it's needed.
+    import http.client
+    from urllib.error import HTTPError
+    from urllib.request import Request, urlopen
+
+    if cache_file is None:
+        cache_file = _default_cache_file()
+
+    cached = _read_cache(cache_file, url)
+    now = time.time()
+    if cached and 0 <= now - cached.get('time', 0) < ttl:
+        return cached['version']
+
+    # Workaround for occasional errors when downloading the release notes.
+    http.client._MAXHEADERS = 1000
+
+    request = Request(url)
+    if cached.get('etag'):
+        request.add_header('If-None-Match', cached['etag'])
+    if cached.get('last_modified'):
+        request.add_header('If-Modified-Since', cached['last_modified'])
+
+    try:
+        with urlopen(request) as response:
+            version = _scan_version(response)
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+    except HTTPError as error:
+        if error.code != 304 or not cached:
+            raise
+        # The release notes haven't changed.
+        cached['time'] = now
+        _write_cache(cache_file, cached)
+        return cached['version']
+
+    if version is None:
+        raise ValueError('No Snips version found in {}'.format(url))
+
+    _write_cache(cache_file, {'url': url,
+                              'version': version,
+                              'etag': etag,
+                              'last_modified': last_modified,
+                              'time': now})
+    return version
@@ -0,0 +1,285 @@
+"""This module contains lightweight tracing of the dialogue sessions of a Snips
+component.
+
+A :class:`.Tracer` object writes spans to a file in the `Trace Event Format`_,
+which you can open in Perfetto_ or `chrome://tracing`. All spans of a session
+have the session ID as their ID, so the viewer shows all stages of a session
+on one track: the arrival of a message, its decoding, the handler and the
+reply that's published.
+
+.. _`Trace Event Format`: https://docs.google.com/document/d/1CvAClvFfyA5R-PhYUmn5OOQtYMH4h6I0nSsKchNAySU
+
+.. _Perfetto: https://ui.perfetto.dev
+
+Once a tracer is installed with :func:`set_tracer`, the following stages are
+traced automatically:
+
+- the arrival, the decoding and the handler of a message in a method with the
+  :func:`snipskit.mqtt.decorators.topic` decorator;
+- the handler of a method with one of the decorators in
+  :mod:`snipskit.hermes.decorators`;
+- the :meth:`.MQTTSnipsComponent.publish` method, e.g. with a continueSession
+  or endSession message.
+
+A handler can mark its own stages, such as a call to a web service, with the
+:func:`span` context manager. The span belongs to the session of the handler.
+
+Example:
+
+.. code-block:: python
+
+    from snipskit.mqtt.apps import MQTTSnipsApp
+    from snipskit.mqtt.decorators import topic
+    from snipskit.mqtt.dialogue import end_session
+    from snipskit.tracing import set_tracer, span, Tracer
+
+
+    class WeatherApp(MQTTSnipsApp):
+
+        def initialize(self):
+            set_tracer(Tracer('/var/log/weather-app/trace.json'))
+
+        @topic('hermes/intent/User:Weather')
+        def weather(self, topic, payload):
+            with span('weather API'):
+                forecast = get_forecast()
+            self.publish(*end_session(payload['sessionId'], forecast))
+
+Without a tracer, the decorators and the :func:`span` context manager don't
+record anything.
+
+.. versionadded:: 0.7.0
+"""
+
+from contextlib import contextmanager
+import json
+import os
+from pathlib import Path
+from threading import get_ident, local, Lock
+import time
+
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 3
+CATEGORY = 'snipskit'
+# The ID of spans that don't belong to a session.
+NO_SESSION = 'none'
+
+# The installed tracer.
+_tracer = None
+# The session of the span that's running in each thread.
+_local = local()
+
+
+def _rotate_files(filename, backup_count):
+    """Rename a file to <filename>.1, <filename>.1 to <filename>.2, and so on,
+    keeping at most `backup_count` rotated files."""
+    for index in range(backup_count - 1, 0, -1):
+        source = '{}.{}'.format(filename, index)
+        if os.path.exists(source):
+            os.replace(source, '{}.{}'.format(filename, index + 1))
+    if backup_count:
+        os.replace(filename, filename + '.1')
+    elif os.path.exists(filename):
+        os.remove(filename)
+
+
+class Tracer:
+    """This class writes spans to a file in the Trace Event Format, rotating
+    the file when it's too large.
+
+    The spans are asynchronous events with the session ID as ID. The file is a
+    JSON array that isn't closed, which the Trace Event Format allows, so each
+    event is on disk as soon as it's written.
+
+    Attributes:
+        filename (str): The path of the trace file.
+        max_bytes (int): The size in bytes at which the trace file is rotated.
+        backup_count (int): The number of rotated trace files that are kept,
+            as <filename>.1, <filename>.2, and so on.
+    """
+
+    def __init__(self, filename, max_bytes=DEFAULT_MAX_BYTES,
+                 backup_count=DEFAULT_BACKUP_COUNT):
+        """Initialize a :class:`.Tracer` object and open the trace file.
+
+        Args:
+            filename (str): The path of the trace file. An existing file is
+                rotated.
+            max_bytes (int, optional): The size in bytes at which the trace
+                file is rotated. Defaults to 10 MiB.
+            backup_count (int, optional): The number of rotated trace files
+                that are kept. Defaults to 3.
+        """
+        self.filename = str(filename)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+
+        self._pid = os.getpid()
+        # Timestamps are measured with a monotonic clock, relative to the
+        # wall clock at the start, so traces of several processes line up.
+        self._offset = time.time() - time.perf_counter()
+        self._lock = Lock()
+        self._file = None
+        self._size = 0
+
+        if Path(self.filename).exists():
+            self._rotate()
+        else:
+            self._open()
+
+    def now(self):
+        """Return the current timestamp.
+
+        Returns:
+            float: The timestamp in microseconds since the epoch.
+        """
+        return (self._offset + time.perf_counter()) * 1000000
+
+    def _open(self):
+        """Open a new trace file."""
+        self._file = open(self.filename, 'wt', buffering=1)
+        self._file.write('[\n')
+        self._size = 2
+
+    def _rotate(self):
+        """Rotate the trace files and open a new trace file."""
+        if self._file:
+            self._file.close()
+        _rotate_files(self.filename, self.backup_count)
+        self._open()
+
+    def event(self, phase, name, session_id=None, timestamp=None, args=None):
+        """Write an event to the trace file.
+
+        Args:
+            phase (str): The phase of the event: 'b' for the beginning of a
+                span, 'e' for the end of a span, 'n' for an instant event.
+            name (str): The name of the span.
+            session_id (str, optional): The session ID. Defaults to `None`,
+                which is written as the ID 'none'.
+            timestamp (float, optional): The timestamp of the event, as
+                returned by :meth:`now`. Defaults to now.
+            args (dict, optional): The arguments of the event. Defaults to
+                `None`.
+        """
+        event = {'name': name,
+                 'cat': CATEGORY,
+                 'ph': phase,
+                 'ts': round(self.now() if timestamp is None else timestamp),
+                 'pid': self._pid,
+                 'tid': get_ident(),
+                 'id': session_id or NO_SESSION}
+        if args:
+            event['args'] = args
+        line = json.dumps(event) + ',\n'
+
+        with self._lock:
+            if self._file is None:
+                return
+            if self._size + len(line) > self.max_bytes and self._size > 2:
+                self._rotate()
+            self._file.write(line)
+            self._size += len(line)
+
+    def close(self):
+        """Close the trace file."""
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+
+def set_tracer(tracer):
+    """Install a tracer for the whole process.
+
+    Args:
+        tracer (:class:`.Tracer`): The tracer, or `None` to stop tracing.
+    """
+    global _tracer
+    _tracer = tracer
+
+
+def get_tracer():
+    """Return the installed tracer.
+
+    Returns:
+        :class:`.Tracer`: The tracer, or `None` if tracing is disabled.
+    """
+    return _tracer
+
+
+def current_session():
+    """Return the session ID of the span that's running in this thread.
+
+    Returns:
+        str: The session ID, or `None`.
+    """
+    return getattr(_local, 'session_id', None)
+
+
+@contextmanager
+def span(name, session_id=None, **args):
+    """Trace a block of code as a span.
+
+    Args:
+        name (str): The name of the span.
+        session_id (str, optional): The session ID of the span. Defaults to
+            the session of the span that's running in this thread.
+        **args: Extra arguments of the span, which should be serializable to
+            JSON.
+
+    Example:
+
+        >>> with span('weather API', city='Brussels'):
+        ...     forecast = get_forecast('Brussels')
+    """
+    tracer = _tracer
+    if tracer is None:
+        yield
+        return
+
+    previous = current_session()
+    if session_id is None:
+        session_id = previous
+    _local.session_id = session_id
+
+    tracer.event('b', name, session_id, args=args)
+    try:
+        yield
+    finally:
+        tracer.event('e', name, session_id)
+        _local.session_id = previous
+
+
+def trace_message(name, topic, payload, decode, handle):
+    """Trace the arrival, decoding and handling of an MQTT message.
+
+    Args:
+        name (str): The name of the handler.
+        topic (str): The MQTT topic of the message.
+        payload (bytes): The raw payload of the message.
+        decode (function): A function that decodes the raw payload.
+        handle (function): A function that handles the decoded payload.
+    """
+    tracer = _tracer
+    if tracer is None:
+        handle(decode(payload))
+        return
+
+    arrived = tracer.now()
+    decoded = decode(payload)
+    decoded_at = tracer.now()
+
+    session_id = None
+    if isinstance(decoded, dict):
+        session_id = decoded.get('sessionId')
+
+    tracer.event('b', 'message', session_id, arrived,
+                 {'topic': topic, 'size': len(payload)})
+    tracer.event('b', 'decode', session_id, arrived)
+    tracer.event('e', 'decode', session_id, decoded_at)
+    try:
+        with span(name, session_id):
+            handle(decoded)
+    finally:
+        tracer.event('e', 'message', session_id)
@@ -0,0 +1,197 @@
+"""This module contains a class to cache audio synthesized by the Snips TTS
+(text-to-speech) service on disk.
+
+A :class:`.TTSCache` object stores the WAV file of each combination of text,
+language and voice it has seen, up to a maximum total size. When the cache is
+full, the least recently used WAV files are removed.
+
+The cache doesn't depend on a specific backend. The class
+:class:`snipskit.mqtt.tts.CachedTTS` uses it to play cached audio on the Snips
+audio server instead of asking the TTS service to synthesize the text again.
+
+.. versionadded:: 0.7.0
+"""
+
+from collections import OrderedDict
+from hashlib import sha256
+import json
+import os
+from pathlib import Path
+from threading import Lock
+from uuid import uuid4
+
+DEFAULT_MAX_SIZE = 50 * 1024 * 1024
+
+_SUFFIX = '.wav'
+
+
+class TTSCache:
+    """This class caches synthesized audio on disk, keyed by text, language
+    and voice, with a least recently used eviction policy.
+
+    Attributes:
+        directory (:class:`pathlib.Path`): The directory of the cached WAV
+            files.
+        max_size (int): The maximum total size in bytes of the cached WAV
+            files.
+        size (int): The current total size in bytes of the cached WAV files.
+
+    Example:
+        >>> cache = TTSCache('/var/cache/snips-app/tts')
+        >>> cache.put('Hello', wav, language='en')
+        >>> cache.get('Hello', language='en') == wav
+        True
+    """
+
+    def __init__(self, directory, max_size=DEFAULT_MAX_SIZE):
+        """Initialize a :class:`.TTSCache` object.
+
+        WAV files that are already in the directory are part of the cache, in
+        the order of their modification time.
+
+        Args:
+            directory (str): The directory of the cached WAV files. It's
+                created if it doesn't exist.
+            max_size (int, optional): The maximum total size in bytes of the
+                cached WAV files. Defaults to 50 MiB.
+        """
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self.size = 0
+
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        cached_files = []
+        for path in self.directory.glob('*' + _SUFFIX):
+            stat = path.stat()
+            cached_files.append((stat.st_mtime, path.stem, stat.st_size))
+
+        for _, key, size in sorted(cached_files):
+            self._entries[key] = size
+            self.size += size
+
+        with self._lock:
+            self._evict()
+
+    @staticmethod
+    def key(text, language=None, voice=None):
+        """Return the cache key of a text in a language with a voice.
+
+        Args:
+            text (str): The text.
+            language (str, optional): The language of the text.
+            voice (str, optional): The voice of the synthesized text.
+
+        Returns:
+            str: A hexadecimal hash of the arguments.
+        """
+        key = json.dumps([text, language, voice])
+        return sha256(key.encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        """Return the path of the WAV file with the cache key `key`."""
+        return self.directory / (key + _SUFFIX)
+
+    def get(self, text, language=None, voice=None):
+        """Return the cached WAV file of a text in a language with a voice.
+
+        Args:
+            text (str): The text.
+            language (str, optional): The language of the text.
+            voice (str, optional): The voice of the synthesized text.
+
+        Returns:
+            bytes: The content of the WAV file, or `None` if the text isn't
+            cached.
+        """
+        key = self.key(text, language, voice)
+
+        with self._lock:
+            if key not in self._entries:
+                return None
+
+            try:
+                wav = self._path(key).read_bytes()
+            except FileNotFoundError:
+                # Someone removed the file behind our back.
+                self.size -= self._entries.pop(key)
+                return None
+
+            self._entries.move_to_end(key)
+
+        # Keep the order of the files on disk for the next initialization.
+        try:
+            os.utime(str(self._path(key)))
+        except OSError:
+            pass
+
+        return wav
+
+    def put(self, text, wav, language=None, voice=None):
+        """Cache the WAV file of a text in a language with a voice.
+
+        The file is written to a temporary file first and then renamed, so the
+        cache never contains a partially written WAV file.
+
+        Args:
+            text (str): The text.
+            wav (bytes): The content of the WAV file.
+            language (str, optional): The language of the text.
+            voice (str, optional): The voice of the synthesized text.
+        """
+        if len(wav) > self.max_size:
+            return
+
+        key = self.key(text, language, voice)
+        path = self._path(key)
+        temporary_path = path.with_suffix('.{}.tmp'.format(uuid4().hex))
+        temporary_path.write_bytes(wav)
+        os.replace(str(temporary_path), str(path))
+
+        with self._lock:
+            self.size -= self._entries.pop(key, 0)
+            self._entries[key] = len(wav)
+            self.size += len(wav)
+            self._evict()
+
+    def __contains__(self, key):
+        """Check whether a text is cached.
+
+        Args:
+            key (tuple): A tuple (text, language, voice).
+        """
+        return self.key(*key) in self._entries
+
+    def __len__(self):
+        """Return the number of cached WAV files."""
+        return len(self._entries)
+
+    def clear(self):
+        """Remove all cached WAV files."""
+        with self._lock:
+            while self._entries:
+                self._remove_oldest()
+
+    def _evict(self):
+        """Remove the least recently used WAV files until the cache isn't
+        larger than its maximum size.
+
+        The caller must hold the lock.
+        """
+        while self.size > self.max_size and self._entries:
+            self._remove_oldest()
+
+    def _remove_oldest(self):
+        """Remove the least recently used WAV file.
+
+        The caller must hold the lock.
+        """
+        key, size = self._entries.popitem(last=False)
+        self.size -= size
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
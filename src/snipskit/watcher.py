@@ -0,0 +1,315 @@
+"""This module contains a class to reload the configuration of a Snips
+component when its configuration files change, without restarting the
+component.
+
+A :class:`.ConfigWatcher` object watches the files behind the `snips`,
+`assistant` and `config` attributes of a component: snips.toml
+(:class:`.SnipsConfig`), assistant.json (:class:`.AssistantConfig`) and the
+app's config.ini (:class:`.AppConfig`). When one of these files changes, the
+watcher parses it again in its own thread, replaces the corresponding
+attribute of the component by the new object and calls the
+:meth:`.SnipsComponent.on_config_reload` method of the component.
+
+On Linux the watcher is woken up by inotify_ when a file in the directory of
+a configuration file changes. On other systems, or if inotify isn't available,
+it polls the files. In both cases it only reloads a file if its identity
+(inode, modification time and size) has changed. The app's config.ini isn't
+reloaded when it has been written by the :class:`.AppConfig` object of the
+component itself.
+
+.. _inotify: http://man7.org/linux/man-pages/man7/inotify.7.html
+
+Example:
+
+.. code-block:: python
+
+    from snipskit.mqtt.apps import MQTTSnipsApp
+    from snipskit.watcher import ConfigWatcher
+
+
+    class SimpleSnipsApp(MQTTSnipsApp):
+
+        def initialize(self):
+            self.watcher = ConfigWatcher(self)
+            self.watcher.start()
+
+        def on_config_reload(self, changed):
+            print('Reloaded {}'.format(', '.join(changed)))
+
+.. note::
+   The MQTT connection isn't changed when snips.toml is reloaded. Restart the
+   component if you change the MQTT settings.
+
+.. versionadded:: 0.7.0
+"""
+
+import ctypes
+import ctypes.util
+import os
+from pathlib import Path
+import select
+import sys
+from threading import Event, Lock, Thread
+import traceback
+
+from snipskit.config import _read_text, AppConfig, AssistantConfig, \
+    SnipsConfig
+
+DEFAULT_INTERVAL = 1.0
+DEFAULT_SETTLE_TIME = 0.1
+
+# The flags of inotify_init1 and inotify_add_watch, see <sys/inotify.h>.
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_WATCH_MASK = _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM \
+    | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+
+
+def _identity(filename):
+    """Return the identity of a file, or `None` if it doesn't exist."""
+    try:
+        stat = os.stat(str(filename))
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+class _Inotify:
+    """A minimal inotify instance that only reports that something changed in
+    the watched directories."""
+
+    def __init__(self, directories):
+        """Create an inotify instance watching directories.
+
+        Raises:
+            :exc:`OSError`: If inotify isn't available.
+        """
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+            inotify_init1 = libc.inotify_init1
+            inotify_add_watch = libc.inotify_add_watch
+        except AttributeError:
+            raise OSError('inotify is not available')
+
+        self.fd = inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+
+        for directory in directories:
+            # A directory that doesn't exist (yet) is still polled.
+            inotify_add_watch(self.fd, os.fsencode(directory), _IN_WATCH_MASK)
+
+    def wait(self, timeout):
+        """Wait at most `timeout` seconds for changes.
+
+        Returns:
+            bool: Whether changes were reported.
+        """
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return False
+
+        # The events themselves don't matter, the file identities are checked
+        # afterwards.
+        try:
+            while os.read(self.fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self):
+        """Close the inotify instance."""
+        os.close(self.fd)
+
+
+class ConfigWatcher:
+    """This class reloads the configuration of a Snips component when its
+    configuration files change.
+
+    Attributes:
+        component (:class:`.SnipsComponent`): The component with the
+            configuration to reload.
+        interval (float): The time in seconds between two checks of the
+            files if no change is reported by inotify.
+        use_inotify (bool): Whether inotify is used to detect changes.
+        last_error (:exc:`Exception`): The last error that happened while
+            reloading a configuration file or in the
+            :meth:`.SnipsComponent.on_config_reload` method called by the
+            watcher thread, or `None`. The component keeps its current
+            configuration object if a file can't be reloaded.
+    """
+
+    def __init__(self, component, interval=DEFAULT_INTERVAL, use_inotify=True):
+        """Initialize a :class:`.ConfigWatcher` object.
+
+        The current state of the configuration files is the reference: only
+        changes after this point are reloaded.
+
+        Args:
+            component (:class:`.SnipsComponent`): The component with the
+                configuration to reload. Its attributes `snips`, `assistant`
+                and `config` are watched if they exist and aren't `None`.
+            interval (float, optional): The time in seconds between two checks
+                of the files if no change is reported by inotify. Defaults to
+                1.
+            use_inotify (bool, optional): Whether inotify is used to detect
+                changes if it's available. Defaults to True.
+        """
+        self.component = component
+        self.interval = interval
+        self.use_inotify = use_inotify
+        self.last_error = None
+
+        self._identities = {}
+        for name, filename in self._files():
+            self._identities[name] = _identity(filename)
+
+        self._lock = Lock()
+        self._stop = Event()
+        self._thread = None
+
+    def _files(self):
+        """Return the attribute names and filenames of the watched
+        configuration objects."""
+        files = []
+        for name in ('snips', 'assistant', 'config'):
+            config = getattr(self.component, name, None)
+            filename = getattr(config, 'filename', None)
+            if filename:
+                files.append((name, filename))
+        return files
+
+    def _load(self, name, old):
+        """Parse a configuration file again into a new object of the same
+        kind."""
+        if name == 'snips':
+            return SnipsConfig(old.filename)
+        elif name == 'assistant':
+            return AssistantConfig(old.filename, lazy=old.lazy)
+        return AppConfig(old.filename, write_delay=old.write_delay)
+
+    def _written_by_component(self, name):
+        """Check whether the app's configuration file has the contents that
+        the component wrote last."""
+        if name != 'config':
+            return False
+
+        written = getattr(self.component.config, '_written', None)
+        return written is not None and written == _read_text(
+            self.component.config.filename)
+
+    def check(self):
+        """Check the configuration files once and reload the changed files.
+
+        The new configuration objects are all created before the attributes of
+        the component are replaced, so the callbacks of the component never
+        see a half-parsed configuration. If the app's configuration is changed
+        by someone else while the component has changes waiting to be
+        written, the delayed write is cancelled, so it doesn't overwrite the
+        change with the old configuration.
+
+        Returns:
+            list: The names of the reloaded attributes, e.g. ['assistant'].
+        """
+        with self._lock:
+            reloaded = {}
+            for name, filename in self._files():
+                identity = _identity(filename)
+                if identity is None or identity == self._identities.get(name):
+                    # The file is being replaced or hasn't changed.
+                    continue
+
+                self._identities[name] = identity
+                if self._written_by_component(name):
+                    # Don't reload the component's own changes.
+                    continue
+
+                old = getattr(self.component, name)
+                pending = isinstance(old, AppConfig) and old.cancel()
+                try:
+                    reloaded[name] = self._load(name, old)
+                except Exception as error:
+                    # Keep the current configuration until the file is fixed.
+                    self.last_error = error
+                    if pending:
+                        old.write()
+
+            for name, config in reloaded.items():
+                setattr(self.component, name, config)
+
+        changed = sorted(reloaded)
+        if changed:
+            self.component.on_config_reload(changed)
+
+        return changed
+
+    def _run(self):
+        """Check the configuration files until the watcher is stopped."""
+        inotify = None
+        if self.use_inotify:
+            directories = set(str(Path(filename).parent)
+                              for _, filename in self._files())
+            try:
+                inotify = _Inotify(directories)
+            except OSError:
+                inotify = None
+        self.use_inotify = inotify is not None
+
+        try:
+            while not self._stop.is_set():
+                if inotify:
+                    # Check the files after a timeout too, to catch changes
+                    # that inotify doesn't see, e.g. a replaced directory.
+                    if inotify.wait(self.interval):
+                        # Let the writer finish a burst of changes.
+                        self._stop.wait(DEFAULT_SETTLE_TIME)
+                elif self._stop.wait(self.interval):
+                    break
+
+                try:
+                    self.check()
+                except Exception as error:
+                    # Keep watching, e.g. if on_config_reload fails.
+                    self.last_error = error
+                    print('Exception while reloading the configuration:',
+                          file=sys.stderr)
+                    traceback.print_exception(type(error), error,
+                                              error.__traceback__)
+        finally:
+            if inotify:
+                inotify.close()
+
+    def start(self):
+        """Start watching the configuration files in a daemon thread.
+
+        The :meth:`.SnipsComponent.on_config_reload` method of the component is
+        called in this thread.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop.clear()
+        self._thread = Thread(target=self._run, name='ConfigWatcher',
+                              daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Stop watching the configuration files.
+
+        Args:
+            timeout (float, optional): The maximum time in seconds to wait for
+                the thread of the watcher to stop. Defaults to waiting until
+                it has stopped.
+        """
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
@@ -1,5 +1,9 @@
 """Tests for the `snipskit.config.AppConfig` class."""
 
+import os
+
+import pytest
+import snipskit.config
 from snipskit.config import AppConfig
 
 
@@ -63,3 +67,135 @@ def test_app_config_write_with_filename(fs):
 
     app_config2 = AppConfig()
     assert app_config2['secret']['api-key'] == 'barfoo'
+
+
+def test_app_config_write_atomic(fs):
+    """Test whether writing an `AppConfig` object replaces the file without
+    leaving temporary files behind.
+    """
+    config_file = 'config.ini'
+    fs.create_file(config_file, contents='[secret]\n'
+                                         'api-key=foobar\n')
+    os.chmod(config_file, 0o600)
+
+    app_config = AppConfig()
+    app_config['secret']['api-key'] = 'barfoo'
+    app_config.write()
+
+    assert not [name for name in os.listdir('.') if name.endswith('.tmp')]
+    assert os.stat(config_file).st_mode & 0o777 == 0o600
+    assert AppConfig()['secret']['api-key'] == 'barfoo'
+
+
+def test_app_config_write_delay(fs, mocker):
+    """Test whether an `AppConfig` object with a write delay collects the
+    changes and writes them once.
+    """
+    config_file = 'config.ini'
+    fs.create_file(config_file, contents='[state]\n'
+                                         'counter=0\n')
+    timer = mocker.patch('snipskit.config.Timer')
+    write_atomic = mocker.spy(snipskit.config, '_write_atomic')
+
+    app_config = AppConfig(write_delay=5)
+    for counter in range(1, 4):
+        app_config['state']['counter'] = str(counter)
+        app_config.write()
+
+    timer.assert_called_once_with(5, app_config.flush)
+    assert app_config.pending
+    assert AppConfig()['state']['counter'] == '0'
+
+    # The timer expires.
+    app_config.flush()
+    assert not app_config.pending
+    timer.return_value.cancel.assert_called_once_with()
+    assert write_atomic.call_count == 1
+    assert AppConfig()['state']['counter'] == '3'
+
+    # Unchanged contents aren't written again.
+    app_config.flush()
+    assert write_atomic.call_count == 1
+
+
+def test_app_config_flush_at_exit(fs, mocker):
+    """Test whether pending changes are written when the interpreter exits.
+    """
+    config_file = 'config.ini'
+    fs.create_file(config_file, contents='[state]\n'
+                                         'counter=0\n')
+    mocker.patch('snipskit.config.Timer')
+
+    app_config = AppConfig(write_delay=60)
+    app_config['state']['counter'] = '1'
+    app_config.write()
+
+    snipskit.config._flush_app_configs()
+    assert not app_config.pending
+    assert AppConfig()['state']['counter'] == '1'
+
+
+def test_app_config_flush_error(fs, mocker):
+    """Test whether changes stay pending if writing them fails.
+    """
+    config_file = 'config.ini'
+    fs.create_file(config_file, contents='[state]\n'
+                                         'counter=0\n')
+    mocker.patch('snipskit.config.Timer')
+    mocker.patch('snipskit.config._write_atomic',
+                 side_effect=OSError('No space left on device'))
+
+    app_config = AppConfig(write_delay=60)
+    app_config['state']['counter'] = '1'
+    app_config.write()
+
+    with pytest.raises(OSError):
+        app_config.flush()
+    assert app_config.pending
+
+    mocker.stopall()
+    snipskit.config._flush_app_configs()
+    assert not app_config.pending
+    assert AppConfig()['state']['counter'] == '1'
+
+
+def test_app_config_change_lock(fs, mocker):
+    """Test whether changes wait until the configuration is written.
+    """
+    config_file = 'config.ini'
+    fs.create_file(config_file, contents='[state]\n'
+                                         'counter=0\n')
+
+    app_config = AppConfig()
+    lock = mocker.patch.object(app_config, '_change_lock')
+
+    app_config['state']['counter'] = '1'
+    app_config.add_section('new')
+    app_config['other'] = {'key': 'value'}
+    app_config.remove_section('new')
+    app_config.write()
+
+    assert lock.__enter__.call_count >= 5
+    assert lock.__enter__.call_count == lock.__exit__.call_count
+    assert AppConfig()['other']['key'] == 'value'
+
+
+def test_app_config_write_recreates_file(fs):
+    """Test whether writing an unchanged `AppConfig` object recreates a file
+    that has been deleted or changed by someone else.
+    """
+    config_file = 'config.ini'
+    fs.create_file(config_file, contents='[secret]\n'
+                                         'api-key=foobar\n')
+
+    app_config = AppConfig()
+    app_config.write()
+
+    os.remove(config_file)
+    app_config.write()
+    assert AppConfig()['secret']['api-key'] == 'foobar'
+
+    with open(config_file, 'wt') as config:
+        config.write('[secret]\napi-key=changed\n')
+    app_config.write()
+    assert AppConfig()['secret']['api-key'] == 'foobar'
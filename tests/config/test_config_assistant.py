@@ -69,3 +69,124 @@ def test_assistant_config_no_config_file(fs):
     """
     with pytest.raises(AssistantConfigNotFoundError):
         assistant_config = AssistantConfig()
+
+
+def test_assistant_config_lazy(tmp_path):
+    """Test whether a lazy `AssistantConfig` object only parses the sections
+    that are accessed."""
+    assistant_file = tmp_path / 'assistant.json'
+    assistant_file.write_text('{"language": "en", "name": "Koan",\n'
+                              ' "intents": [{"id": "koan:Intent1",'
+                              ' "slots": [{"name": "a,b}"}]}],\n'
+                              ' "version": {"nluModel": "0.19.0"}}')
+
+    assistant_config = AssistantConfig(str(assistant_file), lazy=True)
+    assert assistant_config.lazy
+    assert len(assistant_config) == 4
+    assert list(assistant_config) == ['language', 'name', 'intents',
+                                      'version']
+    assert 'intents' in assistant_config
+    assert assistant_config.data._sections == {}
+
+    assert assistant_config['language'] == 'en'
+    assert assistant_config['intents'][0]['slots'] == [{'name': 'a,b}'}]
+    assert list(assistant_config.data._sections) == ['language', 'intents']
+
+    with pytest.raises(KeyError):
+        assistant_config['foo']
+    with pytest.raises(TypeError):
+        assistant_config['language'] = 'fr'
+
+    # A changed file is indexed again, also for sections that have already
+    # been parsed.
+    assistant_file.write_text('{"language": "fr", "name": "Koan"}')
+    assert assistant_config['language'] == 'fr'
+    assert assistant_config['name'] == 'Koan'
+    assert len(assistant_config) == 2
+
+
+def test_assistant_config_lazy_fake_fs(fs):
+    """Test whether a lazy `AssistantConfig` object works on a file system
+    without mmap support."""
+    assistant_file = '/usr/share/snips/assistant/assistant.json'
+    fs.create_file(assistant_file, contents='{"language": "en"}')
+
+    assistant_config = AssistantConfig(lazy=True)
+    assert assistant_config.filename == assistant_file
+    assert assistant_config['language'] == 'en'
+    assert dict(assistant_config) == {'language': 'en'}
+
+
+def test_assistant_config_lazy_broken_json(tmp_path):
+    """Test whether a lazy `AssistantConfig` object raises `JSONDecodeError`
+    when the file doesn't contain a complete JSON object."""
+    assistant_file = tmp_path / 'assistant.json'
+    assistant_file.write_text('{"language": "en", "intents": [')
+
+    with pytest.raises(JSONDecodeError):
+        AssistantConfig(str(assistant_file), lazy=True)
+
+
+ASSISTANT_WITH_INTENTS = '''{
+  "language": "en",
+  "intents": [
+    {"id": "koan:lightsTurnOn", "name": "lightsTurnOn",
+     "slots": [{"name": "room", "entityId": "house_room"}]},
+    {"id": "koan:lightsTurnOff", "name": "lightsTurnOff", "slots": []}
+  ],
+  "entities": {
+    "house_room": {"data": [{"value": "kitchen",
+                             "synonyms": ["cooking room"]},
+                            {"value": "bedroom", "synonyms": []}]},
+    "house_floor": {"values": ["kitchen", "attic"]}
+  }
+}'''
+
+
+def test_assistant_config_indexes(fs):
+    """Test whether the intents, slots and entities of an `AssistantConfig`
+    object are looked up correctly."""
+    assistant_file = '/opt/assistant/assistant.json'
+    fs.create_file(assistant_file, contents=ASSISTANT_WITH_INTENTS)
+
+    assistant_config = AssistantConfig(assistant_file)
+
+    intent = assistant_config.intent_by_name('lightsTurnOn')
+    assert intent['id'] == 'koan:lightsTurnOn'
+    assert assistant_config.intent_by_name('koan:lightsTurnOn') is intent
+    assert assistant_config.intent_by_id('koan:lightsTurnOff')['name'] == 'lightsTurnOff'
+    assert assistant_config.intent_by_name('foo') is None
+    assert assistant_config.intent_by_id('lightsTurnOn') is None
+
+    assert assistant_config.slots('koan:lightsTurnOn')['room']['entityId'] == 'house_room'
+    assert assistant_config.slots('lightsTurnOff') == {}
+    assert assistant_config.slots('foo') == {}
+
+    assert assistant_config.entity('house_floor') == {'values': ['kitchen',
+                                                                 'attic']}
+    assert assistant_config.entity('foo') is None
+    assert assistant_config.entities_for_value('kitchen') == ('house_room',
+                                                              'house_floor')
+    assert assistant_config.entities_for_value('cooking room') == ('house_room',)
+    assert assistant_config.entities_for_value('garage') == ()
+
+    # The indexes are only built once.
+    index = assistant_config._indexes()
+    assert assistant_config._indexes() is index
+
+
+def test_assistant_config_indexes_lazy_changed(tmp_path):
+    """Test whether the indexes of a lazy `AssistantConfig` object are rebuilt
+    when the configuration changes."""
+    assistant_file = tmp_path / 'assistant.json'
+    assistant_file.write_text(ASSISTANT_WITH_INTENTS)
+
+    assistant_config = AssistantConfig(str(assistant_file), lazy=True)
+    assert assistant_config.intent_by_name('lightsTurnOff') is not None
+
+    # The indexes are rebuilt without accessing a section first.
+    assistant_file.write_text('{"language": "fr", "intents": [{"id": '
+                              '"koan:Intent1", "name": "Intent1"}]}')
+
+    assert assistant_config.intent_by_name('lightsTurnOff') is None
+    assert assistant_config.intent_by_name('Intent1')['id'] == 'koan:Intent1'
@@ -0,0 +1,72 @@
+"""Tests for the cache of parsed configuration files in `snipskit.config`."""
+
+import copy
+import json
+import os
+
+import pytest
+from snipskit.config import AssistantConfig, SnipsConfig, invalidate_cache
+
+
+def test_config_cache_shared(fs):
+    """Test whether configuration objects of the same file share the parsed
+    data."""
+    fs.create_file('/etc/snips.toml', contents='[snips-hotword]\n'
+                                               'audio = ["+@mqtt"]\n')
+    fs.create_file('/opt/assistant/assistant.json',
+                   contents='{"language": "en", "intents": [{"id": "1"}]}')
+
+    assert SnipsConfig().data is SnipsConfig('/etc/snips.toml').data
+    assert AssistantConfig('/opt/assistant/assistant.json').data is \
+        AssistantConfig('/opt/assistant/assistant.json').data
+
+
+def test_config_cache_read_only(fs):
+    """Test whether the cached data is read-only but still behaves like dicts
+    and lists."""
+    fs.create_file('/opt/assistant/assistant.json',
+                   contents='{"language": "en", "intents": [{"id": "1"}]}')
+    assistant = AssistantConfig('/opt/assistant/assistant.json')
+
+    with pytest.raises(TypeError):
+        assistant['language'] = 'fr'
+    with pytest.raises(TypeError):
+        assistant['intents'].append({'id': '2'})
+    with pytest.raises(TypeError):
+        assistant['intents'][0]['id'] = '2'
+
+    assert assistant['intents'] == [{'id': '1'}]
+    assert json.loads(json.dumps(assistant.data)) == assistant.data
+
+    intents = copy.deepcopy(assistant['intents'])
+    assert intents == [{'id': '1'}]
+
+
+def test_config_cache_changed_file(fs):
+    """Test whether a changed file is parsed again."""
+    fs.create_file('/etc/snips.toml', contents='[snips-common]\n'
+                                               'mqtt = "host1:1883"\n')
+    assert SnipsConfig().mqtt.broker_address == 'host1:1883'
+
+    with open('/etc/snips.toml', 'wt') as config:
+        config.write('[snips-common]\nmqtt = "otherhost:1883"\n')
+
+    assert SnipsConfig().mqtt.broker_address == 'otherhost:1883'
+
+
+def test_config_cache_invalidate(fs):
+    """Test whether a file is parsed again after invalidating the cache."""
+    fs.create_file('/etc/snips.toml', contents='[snips-common]\n'
+                                               'mqtt = "host1:1883"\n')
+    stat = os.stat('/etc/snips.toml')
+    snips = SnipsConfig()
+
+    # Change the file without changing its identity.
+    with open('/etc/snips.toml', 'wt') as config:
+        config.write('[snips-common]\nmqtt = "host2:1883"\n')
+    os.utime('/etc/snips.toml', ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert SnipsConfig().data is snips.data
+
+    invalidate_cache('/etc/snips.toml')
+    assert SnipsConfig().mqtt.broker_address == 'host2:1883'
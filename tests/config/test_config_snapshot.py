@@ -0,0 +1,116 @@
+"""Tests for the binary snapshots of parsed configuration files in the
+`snipskit.config` module."""
+
+import datetime
+import os
+
+import pytest
+from snipskit.config import invalidate_cache, load_cached, \
+    set_snapshot_directory, SnipsConfig
+
+
+class CountingLoader:
+    """A loader that counts how many times it has parsed a file."""
+
+    __name__ = 'counting_loader'
+
+    def __init__(self, data):
+        self.data = data
+        self.calls = 0
+
+    def __call__(self, filename):
+        self.calls += 1
+        return self.data
+
+
+@pytest.fixture
+def snapshots(tmp_path):
+    directory = tmp_path / 'snapshots'
+    set_snapshot_directory(str(directory))
+    return directory
+
+
+def test_snapshot_used_by_new_process(tmp_path, snapshots):
+    """Test whether a snapshot is written on the first parse and used instead
+    of parsing the file again when the in-memory cache is empty."""
+    config_file = tmp_path / 'config.json'
+    config_file.write_text('{"language": "en"}')
+    loader = CountingLoader({'language': 'en', 'intents': [1, 2]})
+
+    assert load_cached(str(config_file), loader) == loader.data
+    assert loader.calls == 1
+    assert len(list(snapshots.iterdir())) == 1
+    assert snapshots.stat().st_mode & 0o777 == 0o700
+
+    # Simulate a new process.
+    invalidate_cache()
+    assert load_cached(str(config_file), loader) == loader.data
+    assert loader.calls == 1
+
+
+def test_snapshot_source_changed(tmp_path, snapshots):
+    """Test whether a snapshot is regenerated when its source file changes,
+    but not when only its modification time changes."""
+    config_file = tmp_path / 'config.json'
+    config_file.write_text('{"language": "en"}')
+    loader = CountingLoader({'language': 'en'})
+    load_cached(str(config_file), loader)
+
+    stat = config_file.stat()
+    os.utime(str(config_file), ns=(stat.st_atime_ns,
+                                   stat.st_mtime_ns + 10 ** 9))
+    invalidate_cache()
+    load_cached(str(config_file), loader)
+    assert loader.calls == 1
+
+    config_file.write_text('{"language": "fr"}')
+    loader.data = {'language': 'fr'}
+    invalidate_cache()
+    assert load_cached(str(config_file), loader) == {'language': 'fr'}
+    assert loader.calls == 2
+
+    invalidate_cache()
+    assert load_cached(str(config_file), loader) == {'language': 'fr'}
+    assert loader.calls == 2
+
+
+def test_snapshot_invalid(tmp_path, snapshots):
+    """Test whether a corrupt snapshot is ignored and rewritten."""
+    config_file = tmp_path / 'config.json'
+    config_file.write_text('{"language": "en"}')
+    loader = CountingLoader({'language': 'en'})
+    load_cached(str(config_file), loader)
+
+    snapshot, = snapshots.iterdir()
+    snapshot.write_bytes(snapshot.read_bytes()[:20])
+    invalidate_cache()
+    assert load_cached(str(config_file), loader) == {'language': 'en'}
+    assert loader.calls == 2
+
+    invalidate_cache()
+    load_cached(str(config_file), loader)
+    assert loader.calls == 2
+
+
+def test_snapshot_unsupported_data(tmp_path, snapshots):
+    """Test whether data that can't be stored in a snapshot is still parsed
+    and cached in memory."""
+    config_file = tmp_path / 'config.toml'
+    config_file.write_text('date = 2019-04-01')
+    loader = CountingLoader({'date': datetime.date(2019, 4, 1)})
+
+    assert load_cached(str(config_file), loader) == loader.data
+    assert not snapshots.exists() or not list(snapshots.iterdir())
+
+
+def test_snapshot_snips_config(tmp_path, snapshots):
+    """Test whether a `SnipsConfig` object is initialized from a snapshot."""
+    config_file = tmp_path / 'snips.toml'
+    config_file.write_text('[snips-common]\n'
+                           'mqtt = "mqtt.example.com:1883"\n')
+    SnipsConfig(str(config_file))
+
+    invalidate_cache()
+    snips = SnipsConfig(str(config_file))
+    assert snips.mqtt.broker_address == 'mqtt.example.com:1883'
+    assert len(list(snapshots.iterdir())) == 1
@@ -2,7 +2,17 @@
 class.
 """
 
-from snipskit.config import SnipsConfig
+import pytest
+import snipskit.config
+from snipskit.config import MQTTAuthConfig, MQTTConfig, MQTTConnection, \
+    MQTTTLSConfig, parse_broker_address, SnipsConfig
+
+
+@pytest.fixture(autouse=True)
+def dns_cache():
+    snipskit.config._dns_cache.clear()
+    yield
+    snipskit.config._dns_cache.clear()
 
 
 def test_snips_config_mqtt_default(fs):
@@ -100,3 +110,116 @@ def test_snips_config_mqtt_tls(fs):
     assert snips_config.mqtt.tls.client_cert is None
     assert snips_config.mqtt.tls.disable_root_store is False
     assert snips_config.mqtt.tls.enabled is True
+
+
+@pytest.mark.parametrize('broker_address,expected', [
+    ('mqtt.example.com:8883', ('mqtt.example.com', 8883)),
+    ('mqtt.example.com', ('mqtt.example.com', 1883)),
+    ('192.0.2.1:1883', ('192.0.2.1', 1883)),
+    ('[fd00::1]:8883', ('fd00::1', 8883)),
+    ('[fd00::1]', ('fd00::1', 1883)),
+    ('fd00::1', ('fd00::1', 1883)),
+])
+def test_parse_broker_address(broker_address, expected):
+    """Test whether broker addresses are split into host and port."""
+    assert parse_broker_address(broker_address) == expected
+
+
+@pytest.mark.parametrize('broker_address', ['', ':1883', '[fd00::1',
+                                            '[fd00::1]8883', 'host:port'])
+def test_parse_broker_address_invalid(broker_address):
+    """Test whether invalid broker addresses are refused."""
+    with pytest.raises(ValueError):
+        parse_broker_address(broker_address)
+
+
+def test_mqtt_config_connection():
+    """Test whether the connection parameters of an `MQTTConfig` object are
+    resolved once into an immutable and hashable object."""
+    config = MQTTConfig('[fd00::1]:1883',
+                        auth=MQTTAuthConfig('foo', 'bar'))
+    connection = config.connection
+
+    assert connection is config.connection
+    assert connection == MQTTConnection('fd00::1', 1883, 'foo', 'bar', False,
+                                        None, None, None, None, False)
+    assert connection.ipv6
+    assert connection.broker_address == '[fd00::1]:1883'
+    assert connection.auth_params() == {'username': 'foo', 'password': 'bar'}
+    assert connection.tls_params() is None
+    assert 'bar' not in repr(connection)
+    assert {connection: 1}[MQTTConfig('[fd00::1]:1883',
+                                      auth=MQTTAuthConfig('foo', 'bar'))
+                           .connection] == 1
+
+    with pytest.raises(AttributeError):
+        connection.port = 8883
+
+    config.tls = MQTTTLSConfig(hostname='mqtt.example.com', ca_file='ca')
+    connection = config.connection
+    assert connection.host == 'mqtt.example.com'
+    assert connection.tls
+    assert not connection.ipv6
+    assert connection.tls_params() == {'ca_certs': 'ca', 'certfile': None,
+                                       'keyfile': None}
+
+
+def test_mqtt_connection_addresses(mocker):
+    """Test whether the DNS results of a connection are cached with a TTL."""
+    getaddrinfo = mocker.patch('socket.getaddrinfo',
+                               return_value=[(2, 1, 6, '',
+                                              ('192.0.2.1', 1883))])
+    monotonic = mocker.patch('time.monotonic', return_value=100)
+    connection = MQTTConfig('mqtt.example.com:1883').connection
+
+    assert connection.addresses(ttl=10) == [(2, ('192.0.2.1', 1883))]
+    monotonic.return_value = 109
+    assert MQTTConfig('mqtt.example.com').connection.addresses(ttl=10) == \
+        [(2, ('192.0.2.1', 1883))]
+    assert getaddrinfo.call_count == 1
+
+    monotonic.return_value = 111
+    connection.addresses(ttl=10)
+    assert getaddrinfo.call_count == 2
+
+
+def test_snips_config_mqtt_brokers(fs):
+    """Test whether a `SnipsConfig` object with a list of MQTT brokers is
+    initialized correctly.
+    """
+    config_file = '/etc/snips.toml'
+    fs.create_file(config_file,
+                   contents='[snips-common]\n'
+                            'mqtt=["mqtt1.example.com:1883", "[fd00::2]:1883"]\n'
+                            'mqtt_spread=true\n'
+                            'mqtt_tls_hostname="mqtt1.example.com"\n')
+
+    snips_config = SnipsConfig()
+    assert snips_config.mqtt.broker_address == 'mqtt1.example.com:1883'
+    assert snips_config.mqtt.brokers == ['mqtt1.example.com:1883',
+                                         '[fd00::2]:1883']
+    assert snips_config.mqtt.spread is True
+
+    connections = snips_config.mqtt.connections
+    assert [(connection.host, connection.port, connection.tls)
+            for connection in connections] == [('mqtt1.example.com', 1883,
+                                                True),
+                                               ('fd00::2', 1883, True)]
+
+
+def test_mqtt_config_brokers():
+    """Test whether the list of brokers of an `MQTTConfig` object is kept in
+    sync with its broker address."""
+    config = MQTTConfig()
+    assert config.brokers == ['localhost:1883']
+    assert config.spread is False
+    assert config.connections == [config.connection]
+
+    config = MQTTConfig(['mqtt1.example.com', 'mqtt2.example.com'])
+    config.broker_address = 'mqtt3.example.com'
+    assert config.brokers == ['mqtt3.example.com', 'mqtt2.example.com']
+    assert [connection.host for connection in config.connections] == \
+        ['mqtt3.example.com', 'mqtt2.example.com']
+
+    with pytest.raises(ValueError):
+        MQTTConfig([])
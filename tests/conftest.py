@@ -16,6 +16,20 @@ def mqtt_server():
     mosquitto.kill()
 
 
+@pytest.fixture(autouse=True)
+def config_cache():
+    """Start each test with an empty cache of parsed configuration files and
+    without snapshots, so files in a fake file system of a previous test aren't
+    used."""
+    from snipskit.config import invalidate_cache, set_snapshot_directory
+
+    invalidate_cache()
+    set_snapshot_directory(None)
+    yield
+    invalidate_cache()
+    set_snapshot_directory(None)
+
+
 try:
     # This environment variable is used by Travis CI to define which
     # dependencies are installed. Pytest uses it to define which modules
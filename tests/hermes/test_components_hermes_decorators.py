@@ -4,7 +4,7 @@ class.
 
 from snipskit.hermes.components import HermesSnipsComponent
 from snipskit.hermes.decorators import intent, intent_not_recognized, \
-    intents, session_ended, session_queued, session_started
+    intents, offload, session_ended, session_queued, session_started
 
 
 class DecoratedHermesComponent(HermesSnipsComponent):
@@ -72,3 +72,100 @@ def test_snips_component_hermes_decorators(fs, mocker):
 
     assert component.callback_session_started.subscribe_method == 'subscribe_session_started'
     component.hermes.subscribe_session_started.assert_called_once_with(component.callback_session_started)
+
+
+class OffloadedHermesComponent(HermesSnipsComponent):
+
+    @offload()
+    @intent('koan:Intent1')
+    def callback_intent1(self, hermes, intent_message):
+        pass
+
+    @intent('koan:Intent2', offload=True)
+    def callback_intent2(self, hermes, intent_message):
+        pass
+
+    @session_ended
+    def callback_session_ended(self, hermes, session_ended_message):
+        pass
+
+
+def test_snips_component_hermes_offload(fs, mocker):
+    """Test whether offloaded callbacks are registered with a wrapper that
+    runs them in the executor of the component.
+    """
+
+    config_file = '/etc/snips.toml'
+    fs.create_file(config_file, contents='[snips-common]\n')
+
+    mocker.patch('hermes_python.hermes.Hermes.connect')
+    mocker.patch('hermes_python.hermes.Hermes.loop_forever')
+    mocker.patch('hermes_python.hermes.Hermes.subscribe_intent')
+    mocker.patch('hermes_python.hermes.Hermes.subscribe_session_ended')
+
+    component = OffloadedHermesComponent()
+
+    component.hermes.subscribe_session_ended.assert_called_once_with(component.callback_session_ended)
+
+    assert component.hermes.subscribe_intent.call_count == 2
+    callbacks = {call[0][0]: call[0][1]
+                 for call in component.hermes.subscribe_intent.call_args_list}
+    assert callbacks['koan:Intent1'] != component.callback_intent1
+    assert callbacks['koan:Intent2'] != component.callback_intent2
+
+    submit = mocker.patch.object(component.executor, 'submit')
+    message = mocker.Mock(session_id='session-1')
+    callbacks['koan:Intent1'](component.hermes, message)
+    submit.assert_called_once_with('session-1', component.callback_intent1,
+                                   component.hermes, message)
+
+
+class WorkersHermesComponent(HermesSnipsComponent):
+
+    workers = 2
+
+    @intent('koan:Intent1', offload=False)
+    def callback_intent1(self, hermes, intent_message):
+        pass
+
+    @session_ended
+    def callback_session_ended(self, hermes, session_ended_message):
+        pass
+
+
+def test_snips_component_hermes_workers(fs, mocker):
+    """Test whether all callbacks are offloaded when the component has
+    workers, except the callbacks that opt out.
+    """
+
+    config_file = '/etc/snips.toml'
+    fs.create_file(config_file, contents='[snips-common]\n')
+
+    mocker.patch('hermes_python.hermes.Hermes.connect')
+    mocker.patch('hermes_python.hermes.Hermes.loop_forever')
+    mocker.patch('hermes_python.hermes.Hermes.subscribe_intent')
+    mocker.patch('hermes_python.hermes.Hermes.subscribe_session_ended')
+
+    component = WorkersHermesComponent()
+
+    component.hermes.subscribe_intent.assert_called_once_with('koan:Intent1',
+                                                              component.callback_intent1)
+    assert component.hermes.subscribe_session_ended.call_args[0][0] != component.callback_session_ended
+    assert component.executor.max_workers == 2
+
+
+def test_offload_without_parentheses():
+    """Test whether the @offload decorator can be applied without
+    parentheses."""
+
+    class BareOffloadedHermesComponent(HermesSnipsComponent):
+
+        @offload
+        @intent('koan:Intent1')
+        def callback_intent1(self, hermes, intent_message):
+            pass
+
+    callback = BareOffloadedHermesComponent.callback_intent1
+    assert callback.offload is True
+    assert callback.subscribe_method == 'subscribe_intent'
+    assert callback.subscribe_parameter == 'koan:Intent1'
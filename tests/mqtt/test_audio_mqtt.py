@@ -0,0 +1,124 @@
+"""Tests for the `snipskit.mqtt.audio.audio_features` decorator."""
+
+import io
+import wave
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from paho.mqtt.client import MQTTMessage
+from snipskit.mqtt.audio import AudioPlayer, audio_features
+from snipskit.mqtt.components import MQTTSnipsComponent
+
+
+class AudioMQTTComponent(MQTTSnipsComponent):
+    """A simple Snips component analyzing audio to test."""
+
+    def initialize(self):
+        self.received = []
+
+    @audio_features(frame_length=128, publish=True)
+    def noise(self, site_id, features):
+        self.received.append((site_id, features))
+
+
+def audio_frame(site_id, samples):
+    """Return an audioFrame message with the specified samples."""
+    wav_file = io.BytesIO()
+    with wave.open(wav_file, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes(np.asarray(samples, dtype='<i2').tobytes())
+
+    msg = MQTTMessage(topic='hermes/audioServer/{}/audioFrame'.format(site_id).encode('utf-8'))
+    msg.payload = wav_file.getvalue()
+    return msg
+
+
+def test_audio_features_decorator(fs, mocker):
+    """Test whether the `audio_features` decorator analyzes the audio of each
+    site separately and publishes a summary."""
+
+    config_file = '/etc/snips.toml'
+    fs.create_file(config_file, contents='[snips-common]\n')
+
+    mocker.patch('paho.mqtt.client.Client.connect')
+    mocker.patch('paho.mqtt.client.Client.loop_forever')
+    mocker.patch('paho.mqtt.client.Client.publish')
+
+    component = AudioMQTTComponent()
+
+    assert component.noise.topic == 'hermes/audioServer/+/audioFrame'
+
+    component.noise(None, None, audio_frame('kitchen', [16384] * 100))
+    assert component.received == []
+    assert component.mqtt.publish.call_count == 0
+
+    component.noise(None, None, audio_frame('bedroom', [0] * 128))
+    component.noise(None, None, audio_frame('kitchen', [16384] * 100))
+
+    assert [site for site, features in component.received] == ['bedroom',
+                                                               'kitchen']
+    assert component.received[1][1]['rms'].tolist() == [0.5]
+    component.mqtt.publish.assert_called_with(
+        'snipskit/audioServer/kitchen/features',
+        '{"frames": 1, "rms": 0.5, "peak": 0.5, "zcr": 0.0, "voice": 1.0}')
+
+
+def test_audio_player(tmp_path, mocker):
+    """Test whether an `AudioPlayer` object publishes the same WAV file to
+    each site and tracks the playFinished messages."""
+    filename = tmp_path / 'ding.wav'
+    filename.write_bytes(audio_frame('default', [0, 16384] * 8).payload)
+
+    component = mocker.MagicMock()
+    on_finished = mocker.MagicMock()
+    player = AudioPlayer(component)
+
+    component.subscribe.assert_called_once_with('hermes/audioServer/+/playFinished',
+                                                player._play_finished)
+
+    request_ids = player.play(filename, ['kitchen', 'bedroom'], on_finished)
+
+    assert len(request_ids) == 2
+    assert set(player.pending) == set(request_ids)
+    assert player.asset(filename) is player.asset(str(filename))
+
+    calls = component.publish.call_args_list
+    assert calls[0][0][0] == 'hermes/audioServer/kitchen/playBytes/{}'.format(request_ids[0])
+    assert calls[1][0][0] == 'hermes/audioServer/bedroom/playBytes/{}'.format(request_ids[1])
+    assert calls[0][0][1] is calls[1][0][1]
+    assert calls[0][0][1] == filename.read_bytes()
+
+    msg = MQTTMessage(topic=b'hermes/audioServer/bedroom/playFinished')
+    msg.payload = '{{"id": "{}", "siteId": "bedroom"}}'.format(request_ids[1]).encode('utf-8')
+    player._play_finished(None, None, msg)
+
+    assert list(player.pending) == [request_ids[0]]
+    on_finished.assert_called_once_with('bedroom', request_ids[1])
+
+    player.close()
+
+
+def test_audio_player_timeout(tmp_path, mocker):
+    """Test whether an `AudioPlayer` object forgets requests that don't
+    finish playing."""
+    filename = tmp_path / 'ding.wav'
+    filename.write_bytes(audio_frame('default', [0, 16384] * 8).payload)
+    monotonic = mocker.patch('time.monotonic', return_value=1000.0)
+
+    player = AudioPlayer(mocker.MagicMock(), timeout=60)
+    first, = player.play(filename, 'kitchen', mocker.MagicMock())
+
+    monotonic.return_value = 1030.0
+    second, = player.play(filename, 'kitchen')
+    assert list(player.pending) == [first, second]
+
+    monotonic.return_value = 1070.0
+    third, = player.play(filename, 'kitchen')
+    assert list(player.pending) == [second, third]
+    assert player._callbacks == {}
+
+    player.close()
@@ -0,0 +1,105 @@
+"""Tests for the `snipskit.mqtt.benchmark` module."""
+
+import pytest
+from paho.mqtt.client import MQTTMessage
+from snipskit.mqtt.benchmark import _Receiver, Benchmark, BenchmarkResult, \
+    main
+from snipskit.mqtt.components import MQTTSnipsComponent
+
+
+class StandInClient:
+    """A stand-in for an MQTT broker that delivers each intent message to the
+    benchmark components."""
+
+    def __init__(self):
+        self.components = []
+        self.published = 0
+
+    def publish(self, topic, payload):
+        self.published += 1
+        msg = MQTTMessage(topic=topic.encode('utf-8'))
+        msg.payload = payload.encode('utf-8')
+        for component in list(self.components):
+            component.handle_intent(self, None, msg)
+
+    def disconnect(self):
+        self.components = []
+
+
+def test_benchmark_result():
+    """Test whether a `BenchmarkResult` object computes the throughput and
+    latencies."""
+    result = BenchmarkResult('mqtt', 4, 2.0, [0.003, 0.001, 0.002])
+
+    assert result.handled == 3
+    assert result.throughput == 1.5
+    assert result.latency(50) == 0.002
+    assert 'Messages handled:   3' in str(result)
+    assert 'Latency p100       3.000 ms' in str(result)
+
+
+def test_receiver(mocker):
+    """Test whether a `_Receiver` object computes the latencies from the
+    custom data."""
+    mocker.patch('time.perf_counter', return_value=10.5)
+    receiver = _Receiver(2)
+
+    receiver.receive('warmup')
+    receiver.receive('10.25')
+    receiver.receive(None)
+    assert receiver.warmed_up.is_set()
+    assert not receiver.done.is_set()
+
+    receiver.receive('10')
+    assert receiver.latencies == [0.25, 0.5]
+    assert receiver.done.is_set()
+
+
+def test_benchmark_mqtt(mocker):
+    """Test whether a `Benchmark` object runs an MQTT component and measures
+    the latency of each message."""
+    client = StandInClient()
+
+    def connect(component):
+        component.mqtt = client
+        client.components.append(component)
+
+    mocker.patch.object(MQTTSnipsComponent, '_connect', connect)
+    mocker.patch.object(MQTTSnipsComponent, '_start')
+
+    benchmark = Benchmark(client, mocker.Mock(), messages=20, rate=1000,
+                          timeout=5)
+    result = benchmark.run('mqtt')
+
+    assert result.backend == 'mqtt'
+    assert result.sent == 20
+    assert result.handled == 20
+    assert all(latency >= 0 for latency in result.latencies)
+    # The component is stopped after the run.
+    assert client.components == []
+
+
+def test_benchmark_unknown_backend():
+    with pytest.raises(ValueError):
+        Benchmark(StandInClient(), None).run('grpc')
+
+
+@pytest.mark.parametrize('rate', [0, -1])
+def test_benchmark_invalid_rate(rate, mocker):
+    """Test whether a `Benchmark` object rejects a rate that isn't greater
+    than 0."""
+    with pytest.raises(ValueError):
+        Benchmark(StandInClient(), mocker.Mock(), rate=rate)
+
+
+@pytest.mark.parametrize('rate', ['0', '-5', 'fast'])
+def test_main_invalid_rate(rate, mocker, capsys):
+    """Test whether the command line interface rejects a rate that isn't
+    greater than 0 before connecting to the broker."""
+    snips = mocker.patch('snipskit.mqtt.benchmark.SnipsConfig')
+
+    with pytest.raises(SystemExit):
+        main(['--rate', rate])
+
+    snips.assert_not_called()
+    assert 'not a number greater than 0' in capsys.readouterr().err
@@ -1,8 +1,10 @@
 """Unit tests for the helper functions of :mod:`snipskit.mqtt.client`.
 """
 
+import pytest
 from snipskit.config import MQTTAuthConfig, MQTTConfig, MQTTTLSConfig
-from snipskit.mqtt.client import auth_params, host_port, tls_params
+from snipskit.mqtt.client import auth_params, host_port, publish_single, \
+    tls_params
 
 
 # Test auth_params
@@ -47,6 +49,22 @@ def test_client_host_port_tls():
     assert port == 1883
 
 
+def test_client_host_port_ipv6():
+    config = MQTTConfig('[fd00::1]:8883')
+    host, port = host_port(config)
+
+    assert host == 'fd00::1'
+    assert port == 8883
+
+
+def test_client_host_port_without_port():
+    config = MQTTConfig('mqtt.example.com')
+    host, port = host_port(config)
+
+    assert host == 'mqtt.example.com'
+    assert port == 1883
+
+
 # Test tls_params
 def test_client_tls_params():
     config = MQTTConfig(tls=MQTTTLSConfig(hostname='example.com',
@@ -66,3 +84,42 @@ def test_client_tls_params_without_tls():
 
     assert tls is None
 
+
+# Test publish_single
+def test_client_publish_single(mocker):
+    single = mocker.patch('paho.mqtt.publish.single')
+    getaddrinfo = mocker.patch('socket.getaddrinfo',
+                               return_value=[(2, 1, 6, '',
+                                              ('192.0.2.1', 1883))])
+    config = MQTTConfig('mqtt.example.com:1883',
+                        auth=MQTTAuthConfig(username='foo', password='bar'))
+
+    publish_single(config, 'foo/bar', {'foo': 'bar'})
+    publish_single(config, 'foo/bar', b'foobar', json_encode=False)
+
+    # The host is only resolved once.
+    assert getaddrinfo.call_count == 1
+    single.assert_called_with('foo/bar', b'foobar', hostname='192.0.2.1',
+                              port=1883,
+                              auth={'username': 'foo', 'password': 'bar'},
+                              tls=None)
+
+
+def test_client_publish_single_all_addresses(mocker):
+    """Test whether each address of the broker is tried in turn."""
+    single = mocker.patch('paho.mqtt.publish.single',
+                          side_effect=[ConnectionRefusedError, None])
+    mocker.patch('socket.getaddrinfo',
+                 return_value=[(10, 1, 6, '', ('::1', 1883, 0, 0)),
+                               (2, 1, 6, '', ('127.0.0.1', 1883))])
+    config = MQTTConfig('localhost:1883')
+
+    publish_single(config, 'foo/bar', {'foo': 'bar'})
+
+    assert [call[1]['hostname'] for call in single.call_args_list] == \
+        ['::1', '127.0.0.1']
+
+    # The error of the last address is raised.
+    single.side_effect = ConnectionRefusedError
+    with pytest.raises(ConnectionRefusedError):
+        publish_single(config, 'foo/bar', {'foo': 'bar'})
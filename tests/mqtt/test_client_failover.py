@@ -0,0 +1,168 @@
+"""Unit tests for the connection to several MQTT brokers in
+:mod:`snipskit.mqtt.client`.
+"""
+
+import socket
+
+from paho.mqtt.client import Client
+import pytest
+from snipskit.config import MQTTConfig
+from snipskit.mqtt.client import BrokerFailover, connect, probe, rank_brokers
+
+
+@pytest.fixture
+def listening_port():
+    """Return the port of a TCP server on localhost."""
+    server = socket.socket()
+    server.bind(('127.0.0.1', 0))
+    server.listen(5)
+    yield server.getsockname()[1]
+    server.close()
+
+
+@pytest.fixture
+def closed_port():
+    """Return a port on localhost without a server."""
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def test_probe(listening_port, closed_port):
+    config = MQTTConfig(['127.0.0.1:{}'.format(listening_port),
+                         '127.0.0.1:{}'.format(closed_port)])
+    reachable, unreachable = config.connections
+
+    assert probe(reachable) >= 0
+    assert probe(unreachable) is None
+
+
+def test_probe_all_addresses(listening_port, closed_port, mocker):
+    """Test whether each address of a broker is probed in turn."""
+    connection = MQTTConfig('localhost:{}'.format(listening_port)).connection
+    mocker.patch('snipskit.config.MQTTConnection.addresses',
+                 return_value=[(2, ('127.0.0.1', closed_port)),
+                               (2, ('127.0.0.1', listening_port))])
+
+    assert probe(connection) >= 0
+
+
+def test_rank_brokers(listening_port, closed_port, mocker):
+    config = MQTTConfig(['127.0.0.1:{}'.format(closed_port),
+                         '127.0.0.1:{}'.format(listening_port)])
+
+    assert [connection.port for connection in rank_brokers(config)] == \
+        [listening_port, closed_port]
+
+    # Order the reachable brokers by round-trip time.
+    round_trip_times = {1883: 0.02, 1884: 0.01, 1885: None}
+    mocker.patch('snipskit.mqtt.client.probe',
+                 side_effect=lambda connection, timeout:
+                 round_trip_times[connection.port])
+    config = MQTTConfig(['127.0.0.1:1885', '127.0.0.1:1883',
+                         '127.0.0.1:1884'])
+
+    assert [connection.port for connection in rank_brokers(config)] == \
+        [1884, 1883, 1885]
+
+    # Spread the clients over the reachable brokers, which aren't sorted.
+    config.spread = True
+    shuffle = mocker.patch('random.shuffle')
+
+    assert [connection.port for connection in rank_brokers(config)] == \
+        [1883, 1884, 1885]
+    assert shuffle.call_count == 1
+
+
+def test_connect_failover(mocker):
+    """Test whether a client connects to the next broker if a broker doesn't
+    accept the connection."""
+    mocker.patch('snipskit.mqtt.client.rank_brokers',
+                 side_effect=lambda config: config.connections)
+    client = Client()
+    client_connect = mocker.patch.object(client, 'connect',
+                                         side_effect=[ConnectionRefusedError,
+                                                      None])
+    config = MQTTConfig(['mqtt1.example.com', 'mqtt2.example.com'])
+
+    failover = connect(client, config)
+
+    assert isinstance(failover, BrokerFailover)
+    assert failover.current.host == 'mqtt2.example.com'
+    client_connect.assert_called_with('mqtt2.example.com', 1883, 60, '')
+
+
+def test_connect_failover_no_broker(mocker):
+    mocker.patch('snipskit.mqtt.client.rank_brokers',
+                 side_effect=lambda config: config.connections)
+    client = Client()
+    mocker.patch.object(client, 'connect', side_effect=ConnectionRefusedError)
+
+    with pytest.raises(ConnectionRefusedError):
+        connect(client, MQTTConfig(['mqtt1.example.com', 'mqtt2.example.com']))
+
+
+def test_broker_failover_disconnect(mocker):
+    """Test whether the client reconnects to the same broker when the
+    connection is lost, and switches to the next broker after repeated
+    failed reconnects."""
+    client = Client()
+    on_disconnect = mocker.Mock()
+    client.on_disconnect = on_disconnect
+    connect_async = mocker.patch.object(client, 'connect_async')
+    config = MQTTConfig(['mqtt1.example.com', 'mqtt2.example.com:8883'])
+
+    failover = BrokerFailover(client, config.connections, keepalive=30,
+                              max_failures=2, primary_interval=None)
+
+    # A requested disconnection doesn't switch brokers.
+    client.on_disconnect(client, None, 0)
+    assert connect_async.call_count == 0
+    on_disconnect.assert_called_once_with(client, None, 0)
+
+    # A lost connection doesn't either: the client reconnects to the same
+    # broker.
+    client.on_disconnect(client, None, 7)
+    assert connect_async.call_count == 0
+    assert failover.index == 0
+
+    # A single failed reconnect doesn't switch brokers, a second one does.
+    client.on_connect_fail(client, None)
+    assert connect_async.call_count == 0
+    client.on_connect_fail(client, None)
+    connect_async.assert_called_once_with('mqtt2.example.com', 8883, 30, '')
+    assert failover.index == 1
+    assert failover.failures == 0
+
+    # A lost connection to the second broker goes back to the first one.
+    client.on_disconnect(client, None, 7)
+    connect_async.assert_called_with('mqtt1.example.com', 1883, 30, '')
+    assert failover.index == 0
+
+
+def test_broker_failover_primary_check(listening_port, mocker):
+    """Test whether the connection to another broker is dropped when the
+    first broker is reachable again."""
+    client = Client()
+    mocker.patch.object(client, 'connect_async')
+    sock = mocker.Mock()
+    mocker.patch.object(client, 'socket', return_value=sock)
+    timer = mocker.patch('snipskit.mqtt.client.Timer')
+    config = MQTTConfig(['127.0.0.1:{}'.format(listening_port),
+                         'mqtt2.example.com'])
+
+    failover = BrokerFailover(client, config.connections, max_failures=1)
+    client.on_connect_fail(client, None)
+    assert failover.index == 1
+    timer.assert_called_once_with(300.0, failover._check_primary)
+    timer.return_value.start.assert_called_once_with()
+
+    # The first broker is reachable, so the connection is dropped.
+    failover._check_primary()
+    sock.shutdown.assert_called_once_with(socket.SHUT_RDWR)
+
+    # The client sees a lost connection and goes back to the first broker.
+    client.on_disconnect(client, None, 7)
+    assert failover.index == 0
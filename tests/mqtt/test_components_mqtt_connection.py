@@ -125,8 +125,9 @@ def test_snips_component_mqtt_connection_with_tls_and_authentication(fs, mocker)
 
     mocker.patch('paho.mqtt.client.Client.connect')
     mocker.patch('paho.mqtt.client.Client.loop_forever')
-    mocker.patch('paho.mqtt.client.Client.tls_set')
+    mocker.patch('paho.mqtt.client.Client.tls_set_context')
     mocker.patch('paho.mqtt.client.Client.username_pw_set')
+    tls_context = mocker.patch('snipskit.mqtt.tls.tls_context')
     mocker.patch.object(SimpleMQTTComponent, 'initialize')
 
     component = SimpleMQTTComponent()
@@ -141,9 +142,9 @@ def test_snips_component_mqtt_connection_with_tls_and_authentication(fs, mocker)
     # Check MQTT connection
     component.mqtt.username_pw_set.assert_called_once_with('foobar',
                                                            'secretpassword')
-    component.mqtt.tls_set.assert_called_once_with(ca_certs='/etc/ssl/certs/ca-certificates.crt',
-                                                   certfile=None,
-                                                   keyfile=None)
+    tls_context.assert_called_once_with(component.snips.mqtt.connection)
+    assert tls_context.call_args[0][0].ca_file == '/etc/ssl/certs/ca-certificates.crt'
+    component.mqtt.tls_set_context.assert_called_once_with(tls_context.return_value)
     assert component.mqtt.loop_forever.call_count == 1
     component.mqtt.connect.assert_called_once_with('mqtt.example.com', 4883,
                                                    60, '')
@@ -2,8 +2,12 @@
 class.
 """
 
+import json
+
+from paho.mqtt.client import MQTTMessage
 from snipskit.mqtt.components import MQTTSnipsComponent
-from snipskit.mqtt.decorators import topic
+from snipskit.mqtt.decorators import intent, intent_not_recognized, intents, \
+    session_ended, session_queued, session_started, topic
 
 
 class DecoratedMQTTComponent(MQTTSnipsComponent):
@@ -48,3 +52,105 @@ def test_snips_component_mqtt_decorators(fs, mocker):
     component.mqtt.subscribe.assert_called_once_with('hermes/intent/#')
     component.mqtt.message_callback_add.assert_called_once_with('hermes/intent/#',
                                                                 component.handle_intents)
+
+
+class HermesDecoratedMQTTComponent(MQTTSnipsComponent):
+    """A Snips component using the Hermes-style decorators on MQTT."""
+
+    def initialize(self):
+        self.calls = []
+
+    @intent('User:Weather')
+    def weather(self, topic, payload):
+        self.calls.append(('weather', topic, payload['sessionId']))
+
+    @intents
+    def all_intents(self, topic, payload):
+        self.calls.append(('intents', topic,
+                           payload['intent']['intentName']))
+
+    @intent_not_recognized
+    def not_recognized(self, topic, payload):
+        pass
+
+    @session_started
+    def started(self, topic, payload):
+        pass
+
+    @session_ended
+    def ended(self, topic, payload):
+        pass
+
+    @session_queued
+    def queued(self, topic, payload):
+        pass
+
+
+def test_snips_component_mqtt_hermes_decorators(fs, mocker):
+    """Test whether the Hermes-style decorators subscribe to the topics of the
+    intents and the dialogue manager and decode the payload.
+    """
+
+    config_file = '/etc/snips.toml'
+    fs.create_file(config_file, contents='[snips-common]\n')
+
+    mocker.patch('paho.mqtt.client.Client.connect')
+    mocker.patch('paho.mqtt.client.Client.loop_forever')
+    mocker.patch('paho.mqtt.client.Client.subscribe')
+    mocker.patch('paho.mqtt.client.Client.message_callback_add')
+
+    component = HermesDecoratedMQTTComponent()
+    component._subscribe_topics(None, None, None, None)
+
+    topics = {call[0][0] for call in component.mqtt.subscribe.call_args_list}
+    assert topics == {'hermes/intent/User:Weather',
+                      'hermes/intent/#',
+                      'hermes/dialogueManager/intentNotRecognized',
+                      'hermes/dialogueManager/sessionStarted',
+                      'hermes/dialogueManager/sessionEnded',
+                      'hermes/dialogueManager/sessionQueued'}
+    component.mqtt.message_callback_add.assert_any_call('hermes/intent/User:Weather',
+                                                        component.weather)
+
+    msg = MQTTMessage(topic=b'hermes/intent/User:Weather')
+    msg.payload = json.dumps({'sessionId': 'session-1',
+                              'siteId': 'default',
+                              'intent': {'intentName': 'User:Weather',
+                                         'confidenceScore': 1.0},
+                              'slots': []}).encode('utf-8')
+    component.weather(None, None, msg)
+    component.all_intents(None, None, msg)
+
+    assert component.calls == [('weather', 'hermes/intent/User:Weather',
+                                'session-1'),
+                               ('intents', 'hermes/intent/User:Weather',
+                                'User:Weather')]
+
+
+def test_snips_component_mqtt_subscribe(fs, mocker):
+    """Test whether a subscription with the `subscribe` method is made again
+    each time the component connects to the MQTT broker.
+    """
+
+    config_file = '/etc/snips.toml'
+    fs.create_file(config_file, contents='[snips-common]\n')
+
+    mocker.patch('paho.mqtt.client.Client.connect')
+    mocker.patch('paho.mqtt.client.Client.loop_forever')
+    mocker.patch('paho.mqtt.client.Client.subscribe')
+    mocker.patch('paho.mqtt.client.Client.message_callback_add')
+
+    component = DecoratedMQTTComponent()
+    callback = mocker.Mock()
+    component.subscribe('hermes/audioServer/+/playFinished', callback)
+
+    component.mqtt.subscribe.assert_called_once_with('hermes/audioServer/+/playFinished')
+    component.mqtt.message_callback_add.assert_called_once_with('hermes/audioServer/+/playFinished',
+                                                                callback)
+
+    # Simulate a reconnect.
+    component.mqtt.subscribe.reset_mock()
+    component._subscribe_topics(None, None, None, None)
+    topics = [call[0][0] for call in component.mqtt.subscribe.call_args_list]
+    assert sorted(topics) == ['hermes/audioServer/+/playFinished',
+                              'hermes/intent/#']
@@ -0,0 +1,111 @@
+"""Tests for the on-demand profiling of the
+`snipskit.components.MQTTSnipsComponent` class.
+"""
+
+import json
+import os
+from pathlib import Path
+import signal
+import time
+
+import pytest
+from snipskit.mqtt.components import MQTTSnipsComponent
+from snipskit.mqtt.decorators import topic
+
+
+class ProfiledMQTTComponent(MQTTSnipsComponent):
+    """A Snips component using MQTT directly with profiling enabled."""
+
+    def initialize(self):
+        self.enable_profiling(name='test', interval=0.001)
+
+    @topic('hermes/intent/#')
+    def handle_intents(self, topic, payload):
+        pass
+
+    def work(self, duration):
+        end = time.monotonic() + duration
+        while time.monotonic() < end:
+            sum(range(100))
+
+
+class Message:
+    """A fake MQTT message."""
+
+    def __init__(self, payload):
+        self.payload = json.dumps(payload).encode('utf-8')
+
+
+@pytest.fixture
+def component(fs, mocker):
+    fs.create_file('/etc/snips.toml', contents='[snips-common]\n')
+    mocker.patch('paho.mqtt.client.Client.connect')
+    mocker.patch('paho.mqtt.client.Client.loop_forever')
+    mocker.patch('paho.mqtt.client.Client.subscribe')
+    mocker.patch('paho.mqtt.client.Client.message_callback_add')
+    mocker.patch('paho.mqtt.client.Client.publish')
+
+    return ProfiledMQTTComponent()
+
+
+def test_profile_control_topic(component):
+    """Test whether the profiler is started and stopped with the control topic
+    and its result is published."""
+    component._subscribe_topics(None, None, None, None)
+
+    control_topic = 'snipskit/profile/test/control'
+    component.mqtt.subscribe.assert_any_call(control_topic)
+    component.mqtt.message_callback_add.assert_any_call(
+        control_topic, component._profile_control)
+
+    component._profile_control(None, None, Message({'action': 'start',
+                                                    'duration': 10}))
+    assert component.profiler.running
+    component.work(0.05)
+    component._profile_control(None, None, Message({'action': 'stop'}))
+    component.profiler._thread.join(1)
+
+    topic_name, payload = component.mqtt.publish.call_args[0]
+    assert topic_name == 'snipskit/profile/test/result'
+    result = json.loads(payload)
+    assert result['samples'] > 0
+    # Only the handlers of the component are profiled.
+    assert result['folded'].split('\n')[0].split(';')[1].startswith('work (')
+
+
+@pytest.mark.parametrize('command', [
+    {'duration': 10},
+    ['start'],
+    {'action': 'start', 'duration': '10'},
+    {'action': 'start', 'duration': -1},
+    {'action': 'start', 'duration': 0},
+    {'action': 'start', 'duration': 1e9},
+    {'action': 'start', 'duration': True},
+    {'action': 'start', 'duration': None},
+])
+def test_profile_control_invalid(component, command):
+    """Test whether an invalid message on the control topic, e.g. with a
+    duration that isn't a positive number up to one hour, is ignored."""
+    component._profile_control(None, None, Message(command))
+
+    assert not component.profiler.running
+
+
+def test_profile_signal(component, fs):
+    """Test whether a signal toggles the profiler and the profile is written
+    to the profile directory."""
+    directory = Path('/var/lib/profiles')
+    fs.create_dir(str(directory))
+    component.enable_profiling(signal.SIGUSR1, str(directory), duration=10,
+                               interval=0.001, name='test')
+
+    os.kill(os.getpid(), signal.SIGUSR1)
+    assert component.profiler.running
+    component.work(0.05)
+    os.kill(os.getpid(), signal.SIGUSR1)
+    component.profiler._thread.join(1)
+    signal.signal(signal.SIGUSR1, signal.SIG_DFL)
+
+    profiles = list(directory.glob('profile-{}-*.folded'.format(os.getpid())))
+    assert len(profiles) == 1
+    assert 'work (' in profiles[0].read_text()
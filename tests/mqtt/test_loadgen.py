@@ -0,0 +1,108 @@
+"""Tests for the `snipskit.mqtt.loadgen` module."""
+
+import json
+
+from paho.mqtt.client import MQTTMessage
+import pytest
+from snipskit.mqtt.loadgen import LoadGenerator, LoadReport, main, percentile
+
+
+class StandInClient:
+    """A stand-in for an MQTT client with an app that replies to each intent
+    with an endSession message, except on the site 'loadgen-1'."""
+
+    def __init__(self):
+        self.callbacks = {}
+        self.published = []
+
+    def message_callback_add(self, topic, callback):
+        self.callbacks[topic] = callback
+
+    def subscribe(self, topic):
+        pass
+
+    def publish(self, topic, payload):
+        self.published.append(topic)
+        payload = json.loads(payload)
+        if topic.startswith('hermes/intent/') and payload['siteId'] != 'loadgen-1':
+            msg = MQTTMessage(topic=b'hermes/dialogueManager/endSession')
+            msg.payload = json.dumps({'sessionId': payload['sessionId']}).encode('utf-8')
+            self.callbacks['hermes/dialogueManager/endSession'](self, None, msg)
+
+
+def test_percentile():
+    """Test whether the `percentile` function uses the nearest-rank method."""
+    values = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+
+    assert percentile(values, 50) == 5
+    assert percentile(values, 90) == 9
+    assert percentile(values, 99) == 10
+    assert percentile(values, 0) == 1
+    assert percentile([], 50) is None
+
+
+def test_load_report():
+    """Test whether a `LoadReport` object computes the throughput and
+    latencies."""
+    report = LoadReport(10, 8, 1, 1, 2.0, [0.3, 0.1, 0.2])
+
+    assert report.throughput == 4.0
+    assert report.latency(50) == 0.2
+    assert 'Sessions lost:      1' in str(report)
+    assert 'Latency p100       300.0 ms' in str(report)
+
+
+def test_load_generator():
+    """Test whether a `LoadGenerator` object runs complete dialogue flows and
+    counts the lost sessions."""
+    client = StandInClient()
+    generator = LoadGenerator(client, sites=3, rate=100, timeout=0.05)
+
+    report = generator.run(0.1)
+
+    assert report.started >= 9
+    assert report.lost == report.started // 3
+    assert report.completed + report.timed_out + report.lost == report.started
+    assert client.published[:4] == ['hermes/hotword/default/detected',
+                                    'hermes/dialogueManager/sessionStarted',
+                                    'hermes/intent/snipskit:LoadTest',
+                                    'hermes/dialogueManager/sessionEnded']
+
+
+def test_main(mocker, capsys):
+    """Test whether the command line interface connects to the broker and
+    prints a report."""
+    client = mocker.patch('snipskit.mqtt.loadgen.Client')
+    connect = mocker.patch('snipskit.mqtt.loadgen.connect')
+    run = mocker.patch('snipskit.mqtt.loadgen.LoadGenerator.run',
+                       return_value=LoadReport(1, 1, 0, 0, 1.0, [0.01]))
+
+    main(['--broker', 'mqtt.example.com:1883', '--duration', '5'])
+
+    assert connect.call_args[0][1].broker_address == 'mqtt.example.com:1883'
+    run.assert_called_once_with(5.0)
+    client.return_value.loop_stop.assert_called_once_with()
+    assert 'Throughput:         1.00 sessions/s' in capsys.readouterr().out
+
+
+@pytest.mark.parametrize('kwargs', [{'rate': 0}, {'rate': -1},
+                                    {'sites': 0}])
+def test_load_generator_invalid(kwargs):
+    """Test whether a `LoadGenerator` object rejects a rate or number of
+    sites that isn't greater than 0."""
+    with pytest.raises(ValueError):
+        LoadGenerator(StandInClient(), **kwargs)
+
+
+@pytest.mark.parametrize('args', [['--rate', '0'], ['--rate', '-5'],
+                                  ['--rate', 'fast'], ['--sites', '0']])
+def test_main_invalid(args, mocker, capsys):
+    """Test whether the command line interface rejects a rate or number of
+    sites that isn't greater than 0 before connecting to the broker."""
+    connect = mocker.patch('snipskit.mqtt.loadgen.connect')
+
+    with pytest.raises(SystemExit):
+        main(['--broker', 'mqtt.example.com:1883'] + args)
+
+    connect.assert_not_called()
+    assert 'not' in capsys.readouterr().err
@@ -0,0 +1,120 @@
+"""Tests for the `snipskit.mqtt.record` module."""
+
+import pytest
+
+from paho.mqtt.client import MQTTMessage
+from snipskit.config import SnipsConfig
+from snipskit.mqtt.components import MQTTSnipsComponent
+from snipskit.mqtt.decorators import topic
+from snipskit.mqtt.record import TrafficLog, TrafficRecorder, dispatcher, \
+    replay
+
+
+class RecordedMQTTComponent(MQTTSnipsComponent):
+    """A simple Snips component using MQTT directly to test."""
+
+    def initialize(self):
+        self.hotwords = []
+
+    @topic('hermes/hotword/+/detected')
+    def handle_hotword(self, topic, payload):
+        self.hotwords.append((topic, payload['siteId']))
+
+
+def record_traffic(filename):
+    """Record some traffic in a traffic log."""
+    with TrafficRecorder(filename) as recorder:
+        recorder.record('hermes/hotword/default/detected',
+                        '{"siteId": "kitchen"}', 100.0)
+        recorder.record('hermes/audioServer/kitchen/audioFrame', b'\x00\x01',
+                        100.1)
+        recorder.record('hermes/hotword/default/detected',
+                        '{"siteId": "bedroom"}', 100.2)
+
+
+def test_traffic_log(tmp_path):
+    """Test whether a traffic log is recorded and indexed correctly."""
+    filename = str(tmp_path / 'traffic.log')
+    record_traffic(filename)
+
+    # Append a message and a partially written record.
+    with TrafficRecorder(filename) as recorder:
+        msg = MQTTMessage(topic=b'hermes/tts/say')
+        msg.payload = b'{}'
+        recorder._on_message(None, None, msg)
+        assert recorder.count == 1
+    with open(filename, 'ab') as log_file:
+        log_file.write(b'\x00' * 5)
+
+    with TrafficLog(filename) as log:
+        assert len(log) == 4
+        assert log[1] == (100.1, 'hermes/audioServer/kitchen/audioFrame',
+                          b'\x00\x01')
+        assert log[3][1:] == ('hermes/tts/say', b'{}')
+        assert log.topics['hermes/hotword/default/detected'] == [0, 2]
+        payloads = [message[2] for message in log.messages('hermes/hotword/#')]
+        assert payloads == [b'{"siteId": "kitchen"}', b'{"siteId": "bedroom"}']
+
+
+def test_traffic_log_invalid_file(tmp_path):
+    """Test whether a file that isn't a traffic log raises `ValueError`."""
+    filename = tmp_path / 'traffic.log'
+    filename.write_bytes(b'foobar')
+
+    with pytest.raises(ValueError):
+        TrafficLog(str(filename))
+    with pytest.raises(ValueError):
+        TrafficRecorder(str(filename))
+
+
+def test_traffic_recorder_attach(mocker):
+    """Test whether a recorder records all messages of an MQTT client."""
+    client = mocker.MagicMock()
+    recorder = TrafficRecorder.__new__(TrafficRecorder)
+
+    recorder.attach(client)
+    client.message_callback_add.assert_called_once_with('#',
+                                                        recorder._on_message)
+    recorder.detach(client)
+    client.message_callback_remove.assert_called_once_with('#')
+
+
+def test_replay(tmp_path):
+    """Test whether a traffic log is replayed with the recorded timing."""
+    filename = str(tmp_path / 'traffic.log')
+    record_traffic(filename)
+    messages = []
+
+    with TrafficLog(filename) as log:
+        count, duration = replay(log, lambda *message: messages.append(message),
+                                 speed=2)
+        assert count == 3
+        assert duration >= 0.1
+        assert messages[1] == ('hermes/audioServer/kitchen/audioFrame',
+                               b'\x00\x01')
+
+        count, duration = replay(log, lambda *message: None, speed=None,
+                                 topic_filter='hermes/audioServer/#')
+        assert count == 1
+
+
+def test_replay_dispatcher(tmp_path, mocker):
+    """Test whether a traffic log is replayed to the callbacks of a
+    component."""
+    filename = str(tmp_path / 'traffic.log')
+    record_traffic(filename)
+
+    config_file = tmp_path / 'snips.toml'
+    config_file.write_text('[snips-common]\n')
+
+    mocker.patch('paho.mqtt.client.Client.connect')
+    mocker.patch('paho.mqtt.client.Client.loop_forever')
+    component = RecordedMQTTComponent(SnipsConfig(str(config_file)))
+
+    with TrafficLog(filename) as log:
+        replay(log, dispatcher(component), speed=None)
+
+    assert component.hotwords == [('hermes/hotword/default/detected',
+                                   'kitchen'),
+                                  ('hermes/hotword/default/detected',
+                                   'bedroom')]
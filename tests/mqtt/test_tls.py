@@ -0,0 +1,115 @@
+"""Tests for the `snipskit.mqtt.tls` module."""
+
+import shutil
+import socket
+import ssl
+import subprocess
+import sys
+from threading import Thread
+
+import pytest
+from snipskit.config import MQTTConfig, MQTTTLSConfig
+from snipskit.mqtt.tls import clear_tls_cache, tls_context
+
+
+@pytest.fixture(autouse=True)
+def tls_cache():
+    clear_tls_cache()
+    yield
+    clear_tls_cache()
+
+
+@pytest.fixture
+def certificate(tmp_path):
+    """Create a self-signed certificate for localhost."""
+    if not shutil.which('openssl'):
+        pytest.skip('openssl is not installed')
+
+    cert_file = str(tmp_path / 'cert.pem')
+    key_file = str(tmp_path / 'key.pem')
+    subprocess.run(['openssl', 'req', '-x509', '-newkey', 'rsa:2048',
+                    '-nodes', '-days', '1', '-subj', '/CN=localhost',
+                    '-addext', 'subjectAltName=DNS:localhost',
+                    '-keyout', key_file, '-out', cert_file],
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                   check=True)
+    return cert_file, key_file
+
+
+@pytest.fixture
+def tls_server(certificate):
+    """Run a TLS server on localhost that sends one byte to each client."""
+    cert_file, key_file = certificate
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert_file, key_file)
+
+    server = socket.socket()
+    server.bind(('127.0.0.1', 0))
+    server.listen(5)
+
+    def serve():
+        while True:
+            try:
+                client, _ = server.accept()
+            except OSError:
+                return
+            try:
+                with context.wrap_socket(client, server_side=True) as tls:
+                    tls.sendall(b'x')
+                    tls.recv(1)
+            except (OSError, ssl.SSLError):
+                pass
+
+    thread = Thread(target=serve, daemon=True)
+    thread.start()
+    yield server.getsockname()[1]
+    server.close()
+
+
+def mqtt_config(port, ca_file=None):
+    return MQTTConfig('localhost:{}'.format(port),
+                      tls=MQTTTLSConfig(hostname='localhost',
+                                        ca_file=ca_file))
+
+
+def test_tls_context_shared(certificate):
+    """Test whether connections with the same TLS settings share a context."""
+    cert_file, _ = certificate
+    context = tls_context(mqtt_config(8883, cert_file).connection)
+
+    assert isinstance(context, ssl.SSLContext)
+    assert context.verify_mode == ssl.CERT_REQUIRED
+    assert context.check_hostname
+    assert tls_context(mqtt_config(8884, cert_file).connection) is context
+    assert tls_context(mqtt_config(8883).connection) is not context
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7),
+                    reason='TLS session resumption requires Python 3.7')
+def test_tls_session_resumption(certificate, tls_server):
+    """Test whether a second connection resumes the TLS session."""
+    cert_file, _ = certificate
+    context = tls_context(mqtt_config(tls_server, cert_file).connection)
+
+    reused = []
+    for _ in range(2):
+        sock = socket.create_connection(('127.0.0.1', tls_server))
+        with context.wrap_socket(sock, server_hostname='localhost') as tls:
+            assert tls.recv(1) == b'x'
+            reused.append(tls.session_reused)
+            tls.sendall(b'x')
+
+    assert reused == [False, True]
+
+
+def test_tls_context_without_tls_client_protocol(certificate, mocker):
+    """Test whether a context is created on Python versions without
+    `ssl.PROTOCOL_TLS_CLIENT`."""
+    cert_file, _ = certificate
+    mocker.patch('snipskit.mqtt.tls._PROTOCOL', ssl.PROTOCOL_SSLv23)
+
+    context = tls_context(mqtt_config(8883, cert_file).connection)
+
+    assert context.protocol == ssl.PROTOCOL_SSLv23
+    assert context.verify_mode == ssl.CERT_REQUIRED
+    assert context.check_hostname
@@ -0,0 +1,72 @@
+"""Tests for the tracing of the `snipskit.components.MQTTSnipsComponent`
+class.
+"""
+
+import json
+
+import pytest
+from snipskit.config import SnipsConfig
+from snipskit.mqtt.components import MQTTSnipsComponent
+from snipskit.mqtt.decorators import topic
+from snipskit.tracing import set_tracer, span, Tracer
+
+
+def read_trace(filename):
+    """Read the events of an unterminated trace file."""
+    return json.loads(filename.read_text().rstrip().rstrip(',') + ']')
+
+
+@pytest.fixture
+def tracer(tmp_path):
+    """Install a tracer writing to a temporary file."""
+    tracer = Tracer(str(tmp_path / 'trace.json'))
+    set_tracer(tracer)
+    yield tracer
+    set_tracer(None)
+    tracer.close()
+
+
+class Message:
+    """A fake MQTT message."""
+
+    def __init__(self, topic, payload):
+        self.topic = topic
+        self.payload = json.dumps(payload).encode('utf-8')
+
+
+class TracedMQTTComponent(MQTTSnipsComponent):
+    """A Snips component using MQTT directly to test."""
+
+    @topic('hermes/intent/User:Weather')
+    def weather(self, topic, payload):
+        with span('weather API'):
+            pass
+        self.publish('hermes/dialogueManager/endSession',
+                     {'sessionId': payload['sessionId'], 'text': 'Sunny'})
+
+
+def test_trace_mqtt_component(tracer, tmp_path, mocker):
+    mocker.patch('paho.mqtt.client.Client.connect')
+    mocker.patch('paho.mqtt.client.Client.loop_forever')
+    mocker.patch('paho.mqtt.client.Client.publish')
+    snips_toml = tmp_path / 'snips.toml'
+    snips_toml.write_text('[snips-common]\n')
+
+    component = TracedMQTTComponent(SnipsConfig(str(snips_toml)))
+    component.weather(None, None, Message('hermes/intent/User:Weather',
+                                          {'sessionId': 'session-1'}))
+
+    component.mqtt.publish.assert_called_once_with('hermes/dialogueManager/endSession',
+                                                   json.dumps({'sessionId': 'session-1',
+                                                               'text': 'Sunny'}))
+
+    events = read_trace(tmp_path / 'trace.json')
+    assert [(event['ph'], event['name']) for event in events] == \
+        [('b', 'message'), ('b', 'decode'), ('e', 'decode'),
+         ('b', 'weather'), ('b', 'weather API'), ('e', 'weather API'),
+         ('b', 'publish'), ('e', 'publish'), ('e', 'weather'),
+         ('e', 'message')]
+    assert all(event['id'] == 'session-1' for event in events)
+    assert events[0]['args'] == {'topic': 'hermes/intent/User:Weather',
+                                 'size': 26}
+    assert events[6]['args'] == {'topic': 'hermes/dialogueManager/endSession'}
@@ -0,0 +1,64 @@
+"""Tests for the `snipskit.mqtt.tts.CachedTTS` class."""
+
+import json
+
+from paho.mqtt.client import MQTTMessage
+from snipskit.mqtt.tts import CachedTTS
+from snipskit.tts import TTSCache
+
+
+def test_cached_tts(tmp_path, mocker):
+    """Test whether a `CachedTTS` object publishes a say message on a cache
+    miss, captures the synthesized audio and plays it on a cache hit."""
+    client = mocker.MagicMock()
+    tts = CachedTTS(client, TTSCache(str(tmp_path)))
+
+    client.subscribe.assert_called_once_with('hermes/audioServer/+/playBytes/+')
+
+    request_id, cached = tts.say('Hello', 'kitchen', 'en', session_id='1234')
+    assert not cached
+    topic, payload = client.publish.call_args[0]
+    assert topic == 'hermes/tts/say'
+    assert json.loads(payload) == {'text': 'Hello', 'siteId': 'kitchen',
+                                   'id': request_id, 'lang': 'en',
+                                   'sessionId': '1234'}
+
+    # The TTS service publishes the synthesized audio.
+    msg = MQTTMessage(topic='hermes/audioServer/kitchen/playBytes/{}'.format(request_id).encode('utf-8'))
+    msg.payload = b'RIFF...'
+    tts._play_bytes(None, None, msg)
+    assert tts.pending == {}
+
+    request_id, cached = tts.say('Hello', 'bedroom', 'en')
+    assert cached
+    client.publish.assert_called_with('hermes/audioServer/bedroom/playBytes/{}'.format(request_id),
+                                      b'RIFF...')
+
+
+def test_cached_tts_resubscribe(tmp_path, mocker):
+    """Test whether a `CachedTTS` object subscribes again when the client
+    reconnects, and still calls the previous `on_connect` callback."""
+    client = mocker.MagicMock()
+    on_connect = client.on_connect
+    CachedTTS(client, TTSCache(str(tmp_path)))
+
+    client.subscribe.reset_mock()
+    client.on_connect(client, None, {}, 0)
+
+    client.subscribe.assert_called_once_with('hermes/audioServer/+/playBytes/+')
+    on_connect.assert_called_once_with(client, None, {}, 0)
+
+
+def test_cached_tts_timeout(tmp_path, mocker):
+    """Test whether a `CachedTTS` object forgets say requests that don't get
+    their audio."""
+    monotonic = mocker.patch('time.monotonic', return_value=1000.0)
+    tts = CachedTTS(mocker.MagicMock(), TTSCache(str(tmp_path)), timeout=10)
+
+    first, _ = tts.say('Hello', 'kitchen')
+    monotonic.return_value = 1005.0
+    second, _ = tts.say('Goodbye', 'kitchen')
+    monotonic.return_value = 1012.0
+    third, _ = tts.say('Welcome', 'kitchen')
+
+    assert list(tts.pending) == [second, third]
@@ -0,0 +1,103 @@
+"""Unit tests for the `snipskit.aioservices` module."""
+
+import asyncio
+
+import pytest
+from snipskit import aioservices
+import snipskit.services
+from snipskit.services import SNIPS_SERVICES
+
+
+def run(coroutine):
+    """Run a coroutine in a new event loop."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+@pytest.fixture
+def binaries(tmp_path, monkeypatch):
+    """Install fake Snips binaries that print their version and count how
+    many times they're run. The binary of snips-asr hangs."""
+    for service in ('snips-nlu', 'snips-tts'):
+        binary = tmp_path / service
+        binary.write_text('#!/bin/sh\n'
+                          'echo run >> "{}.log"\n'
+                          'echo "{} 1.1.2 (0.62.3) '
+                          '[model_version: 0.19.0]"\n'
+                          .format(binary, service))
+        binary.chmod(0o755)
+
+    binary = tmp_path / 'snips-asr'
+    binary.write_text('#!/bin/sh\nexec sleep 10\n')
+    binary.chmod(0o755)
+
+    monkeypatch.setenv('PATH', '{}:/bin:/usr/bin'.format(tmp_path))
+    snipskit.services._version_cache.clear()
+    yield tmp_path
+    snipskit.services._version_cache.clear()
+
+
+def runs(binaries, service):
+    """Return how many times the binary of a service has run."""
+    try:
+        return len((binaries / (service + '.log')).read_text().splitlines())
+    except FileNotFoundError:
+        return 0
+
+
+def test_versions(binaries):
+    """Test whether the binaries are run once and a hanging binary times
+    out, but is still installed."""
+    versions = run(aioservices.versions(timeout=0.5))
+
+    assert versions == {service: '1.1.2'
+                        if service in ('snips-nlu', 'snips-tts') else ''
+                        for service in SNIPS_SERVICES}
+    assert run(aioservices.installed(timeout=0.1)) == \
+        {service: service in ('snips-asr', 'snips-nlu', 'snips-tts')
+         for service in SNIPS_SERVICES}
+    assert run(aioservices.version(timeout=0.1)) == '1.1.2'
+    assert run(aioservices.version('snips-tts')) == '1.1.2'
+    assert run(aioservices.model_version()) == '0.19.0'
+    assert run(aioservices.is_installed('snips-nlu'))
+    assert run(aioservices.is_installed('snips-asr', timeout=0.1))
+    assert not run(aioservices.is_installed('snips-dialogue'))
+
+    assert runs(binaries, 'snips-nlu') == 1
+    assert runs(binaries, 'snips-tts') == 1
+
+    # The synchronous functions use the same cache.
+    assert snipskit.services.version('snips-nlu') == '1.1.2'
+    assert runs(binaries, 'snips-nlu') == 1
+
+
+def test_concurrent_callers(binaries):
+    """Test whether concurrent callers share one run of a binary."""
+    async def query():
+        return await asyncio.gather(*[aioservices.version('snips-nlu')
+                                      for _ in range(5)])
+
+    assert run(query()) == ['1.1.2'] * 5
+    assert runs(binaries, 'snips-nlu') == 1
+    assert aioservices._pending == {}
+
+
+def test_running(mocker):
+    process_iter = mocker.patch('psutil.process_iter',
+                                return_value=[mocker.Mock(info={'name': 'snips-nlu',
+                                                                'pid': 120,
+                                                                'create_time': 1000.0})])
+
+    states = run(aioservices.running())
+
+    assert process_iter.call_count == 1
+    assert states == {service: service == 'snips-nlu'
+                      for service in SNIPS_SERVICES}
+    assert run(aioservices.is_running('snips-nlu'))
+    assert not run(aioservices.is_running('snips-asr'))
+
+    snapshot = run(aioservices.process_snapshot())
+    assert snapshot.pids('snips-nlu') == [120]
@@ -0,0 +1,157 @@
+"""Tests for the `snipskit.audio` module."""
+
+import io
+import wave
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from snipskit.audio import AudioAnalyzer, AudioAsset, features_summary, \
+    frame_features, frames, pcm_to_samples, resample, samples_to_pcm, \
+    wav_header, wav_to_samples
+
+
+def make_wav(samples, sample_rate=16000, channels=1):
+    """Return a 16-bit WAV file with the specified samples."""
+    wav_file = io.BytesIO()
+    with wave.open(wav_file, 'wb') as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(np.asarray(samples, dtype='<i2').tobytes())
+    return wav_file.getvalue()
+
+
+def test_wav_to_samples():
+    """Test whether a WAV file is decoded to normalized samples."""
+    samples, sample_rate = wav_to_samples(make_wav([0, 16384, -32768]))
+
+    assert sample_rate == 16000
+    assert samples.tolist() == [0.0, 0.5, -1.0]
+
+
+def test_pcm_to_samples_stereo():
+    """Test whether multiple channels are mixed down to one channel."""
+    pcm = np.array([16384, 0, -16384, -16384], dtype='<i2').tobytes()
+
+    assert pcm_to_samples(pcm, channels=2).tolist() == [0.25, -0.5]
+
+
+def test_pcm_to_samples_unsupported_sample_width():
+    """Test whether an unsupported sample width raises `ValueError`."""
+    with pytest.raises(ValueError):
+        pcm_to_samples(b'\x00\x00\x00', sample_width=3)
+
+
+def test_frames():
+    """Test whether samples are split into overlapping frames."""
+    framed = frames(np.arange(10, dtype=np.float32), 4, 3)
+
+    assert framed.tolist() == [[0, 1, 2, 3], [3, 4, 5, 6], [6, 7, 8, 9]]
+
+
+def test_frame_features():
+    """Test whether the features of silence, noise and a tone are computed
+    correctly."""
+    silence = np.zeros(256)
+    alternating = np.tile([0.5, -0.5], 128)
+    tone = 0.5 * np.sin(2 * np.pi * 4 * np.arange(256) / 256)
+    features = frame_features(np.concatenate((silence, alternating, tone)))
+
+    assert features['rms'][0] == 0
+    assert features['rms'][1] == pytest.approx(0.5)
+    assert features['rms'][2] == pytest.approx(0.5 / np.sqrt(2))
+    assert features['peak'].tolist() == pytest.approx([0, 0.5, 0.5])
+    assert features['zcr'][1] == 1
+    assert features['zcr'][2] < 0.1
+    assert features['voice'].tolist() == [False, False, True]
+
+
+def test_features_summary():
+    """Test whether the features are summarized in a compact dict."""
+    summary = features_summary(frame_features(np.tile([0.5, -0.5], 256)))
+
+    assert summary == {'frames': 2, 'rms': 0.5, 'peak': 0.5, 'zcr': 1.0,
+                       'voice': 0.0}
+    assert features_summary(frame_features(np.zeros(10)))['frames'] == 0
+
+
+def test_audio_analyzer_buffers_incomplete_frames():
+    """Test whether an `AudioAnalyzer` object keeps the samples of an
+    incomplete frame for the next chunk."""
+    analyzer = AudioAnalyzer(frame_length=256)
+
+    features = analyzer.feed(make_wav([8192] * 200))
+    assert len(features['rms']) == 0
+    assert analyzer.sample_rate == 16000
+
+    features = analyzer.feed(make_wav([8192] * 400))
+    assert features['rms'].tolist() == pytest.approx([0.25, 0.25])
+
+    analyzer.reset()
+    assert len(analyzer.feed(make_wav([8192] * 200))['rms']) == 0
+
+
+def test_wav_header():
+    """Test whether a WAV header and PCM data are decoded correctly."""
+    pcm = np.array([0, 16384, -32768], dtype='<i2').tobytes()
+    samples, sample_rate = wav_to_samples(wav_header(len(pcm), 8000) + pcm)
+
+    assert sample_rate == 8000
+    assert samples.tolist() == [0.0, 0.5, -1.0]
+
+
+def test_samples_to_pcm():
+    """Test whether samples are converted back to PCM data."""
+    samples = [0.0, 0.5, -1.0, 1.0]
+
+    assert pcm_to_samples(samples_to_pcm(samples)).tolist() == [0.0, 0.5,
+                                                                -1.0,
+                                                                32767 / 32768]
+    assert samples_to_pcm(samples, sample_width=1) == bytes([128, 192, 0,
+                                                             255])
+    assert samples_to_pcm([0.5], channels=2) == samples_to_pcm([0.5, 0.5])
+
+
+def test_resample():
+    """Test whether samples are resampled with linear interpolation."""
+    samples = np.array([0.0, 1.0, 0.0, -1.0])
+
+    assert resample(samples, 8000, 16000).tolist() == [0.0, 0.5, 1.0, 0.5,
+                                                       0.0, -0.5, -1.0, -1.0]
+    assert resample(samples, 16000, 8000).tolist() == [0.0, 0.0]
+    assert resample(samples, 8000, 8000) is samples
+
+
+def test_audio_asset(tmp_path):
+    """Test whether an `AudioAsset` object reads a WAV file and caches the
+    converted WAV files."""
+    filename = tmp_path / 'ding.wav'
+    filename.write_bytes(make_wav([0, 16384, -16384, 0] * 4, 8000, 2))
+
+    asset = AudioAsset(filename)
+    assert (asset.sample_rate, asset.channels, asset.sample_width) == (8000,
+                                                                       2, 2)
+    assert asset.pcm().tobytes() == filename.read_bytes()[44:]
+
+    assert asset.wav() == filename.read_bytes()
+    assert asset.wav() is asset.wav()
+
+    converted = asset.wav(sample_rate=16000, channels=1)
+    assert converted is asset.wav(16000, 1, 2)
+    samples, sample_rate = wav_to_samples(converted)
+    assert sample_rate == 16000
+    assert len(samples) == 16
+
+    asset.close()
+
+
+def test_audio_asset_not_a_wav_file(tmp_path):
+    """Test whether an `AudioAsset` object raises `wave.Error` for a file that
+    isn't a WAV file."""
+    filename = tmp_path / 'ding.wav'
+    filename.write_bytes(b'This is not a WAV file.')
+
+    with pytest.raises(wave.Error):
+        AudioAsset(filename)
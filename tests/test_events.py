@@ -0,0 +1,253 @@
+"""Tests for the `snipskit.events` module."""
+
+from datetime import datetime
+import json
+import time
+
+import pytest
+from snipskit.events import _topic_matches, EventLog, get_event_log, \
+    set_event_log
+from snipskit.hermes.decorators import intent, session_started
+from snipskit.mqtt.decorators import topic
+
+
+def read_events(filename):
+    """Read the events of a JSON Lines file."""
+    return [json.loads(line) for line in filename.read_text().splitlines()]
+
+
+@pytest.fixture
+def event_log(tmp_path):
+    """Install an event log writing to a temporary file."""
+    event_log = EventLog(str(tmp_path / 'events.jsonl'))
+    set_event_log(event_log)
+    yield event_log
+    set_event_log(None)
+
+
+@pytest.mark.parametrize('subscription,topic_name,expected', [
+    ('hermes/intent/#', 'hermes/intent/User:Weather', True),
+    ('hermes/intent/#', 'hermes/intent', True),
+    ('hermes/audioServer/+/audioFrame', 'hermes/audioServer/kitchen/audioFrame', True),
+    ('hermes/audioServer/+/audioFrame', 'hermes/audioServer/kitchen/playBytes/1', False),
+    ('hermes/intent/User:Weather', 'hermes/intent/User:Weather', True),
+    ('hermes/intent/User:Weather', 'hermes/intent/User:Lights', False),
+    ('hermes/intent/+', 'hermes/intent', False),
+])
+def test_topic_matches(subscription, topic_name, expected):
+    assert _topic_matches(subscription, topic_name) == expected
+
+
+def test_record_and_flush(tmp_path, mocker):
+    mocker.patch('time.time', return_value=1000.0)
+    event_log = EventLog(str(tmp_path / 'events.jsonl'))
+
+    assert event_log.record('hermes/intent/User:Weather', 'weather', 0.0123456789,
+                            'kitchen', 'session-1')
+    assert event_log.record('hermes/hotword/toggleOn', 'hotword_on', 0.001,
+                            user='koen')
+    assert not (tmp_path / 'events.jsonl').exists()
+
+    assert event_log.flush() == 2
+    assert event_log.flush() == 0
+
+    assert read_events(tmp_path / 'events.jsonl') == [
+        {'time': 1000.0, 'topic': 'hermes/intent/User:Weather',
+         'siteId': 'kitchen', 'sessionId': 'session-1', 'handler': 'weather',
+         'duration': 0.012346},
+        {'time': 1000.0, 'topic': 'hermes/hotword/toggleOn', 'siteId': None,
+         'sessionId': None, 'handler': 'hotword_on', 'duration': 0.001,
+         'user': 'koen'}]
+
+
+def test_sampling(tmp_path, mocker):
+    event_log = EventLog(str(tmp_path / 'events.jsonl'),
+                         sample_rates={'hermes/audioServer/+/audioFrame': 0.25})
+    random = mocker.patch('random.random', side_effect=[0.1, 0.5, 0.3, 0.2])
+
+    recorded = [event_log.record('hermes/audioServer/kitchen/audioFrame',
+                                 'frame', 0.0001)
+                for _ in range(4)]
+    assert event_log.record('hermes/intent/User:Weather', 'weather', 0.01)
+
+    assert recorded == [True, False, False, True]
+    assert random.call_count == 4
+    event_log.flush()
+    events = read_events(tmp_path / 'events.jsonl')
+    assert [event.get('sampleRate') for event in events] == [0.25, 0.25, None]
+
+
+def test_queue_size(tmp_path):
+    event_log = EventLog(str(tmp_path / 'events.jsonl'), queue_size=3)
+
+    for index in range(5):
+        event_log.record('topic', 'handler{}'.format(index), 0.0)
+    event_log.flush()
+
+    # The oldest events are dropped.
+    assert [event['handler'] for event in read_events(tmp_path / 'events.jsonl')] == \
+        ['handler2', 'handler3', 'handler4']
+
+
+def test_rotation(tmp_path):
+    filename = tmp_path / 'events.jsonl'
+    event_log = EventLog(str(filename), max_bytes=500, backup_count=1)
+
+    for batch in range(6):
+        for index in range(2):
+            event_log.record('topic', 'handler', 0.0, session_id=str(batch))
+        event_log.flush()
+
+    assert filename.stat().st_size <= 500
+    assert (tmp_path / 'events.jsonl.1').exists()
+    assert not (tmp_path / 'events.jsonl.2').exists()
+    assert read_events(filename)[-1]['sessionId'] == '5'
+
+
+def test_start_stop(tmp_path):
+    event_log = EventLog(str(tmp_path / 'events.jsonl'), flush_interval=10)
+    event_log.start()
+    event_log.record('topic', 'handler', 0.0)
+    event_log.stop(1)
+
+    # The remaining events are written when the event log stops.
+    assert len(read_events(tmp_path / 'events.jsonl')) == 1
+
+
+class Message:
+    """A fake MQTT message."""
+
+    def __init__(self, topic, payload):
+        self.topic = topic
+        self.payload = json.dumps(payload).encode('utf-8')
+
+
+class Component:
+    """A class with decorated handlers."""
+
+    @topic('hermes/intent/#')
+    def handle_intents(self, topic, payload):
+        if payload.get('fail'):
+            raise RuntimeError('Failed')
+
+    @intent('User:Weather')
+    def weather(self, hermes, intent_message):
+        pass
+
+    @session_started
+    def started(self, hermes, session_started_message):
+        pass
+
+
+def test_topic_decorator(event_log, tmp_path):
+    assert get_event_log() is event_log
+
+    component = Component()
+    component.handle_intents(None, None,
+                             Message('hermes/intent/User:Weather',
+                                     {'siteId': 'kitchen',
+                                      'sessionId': 'session-1'}))
+    with pytest.raises(RuntimeError):
+        component.handle_intents(None, None,
+                                 Message('hermes/intent/User:Lights',
+                                         {'fail': True}))
+    event_log.flush()
+
+    events = read_events(tmp_path / 'events.jsonl')
+    assert [(event['topic'], event['siteId'], event['sessionId'],
+             event['handler'], event.get('error')) for event in events] == \
+        [('hermes/intent/User:Weather', 'kitchen', 'session-1',
+          'handle_intents', None),
+         ('hermes/intent/User:Lights', None, None, 'handle_intents',
+          'RuntimeError')]
+    assert all(event['duration'] >= 0 for event in events)
+
+
+def test_hermes_decorators(event_log, tmp_path, mocker):
+    component = Component()
+    component.weather(None, mocker.Mock(site_id='kitchen',
+                                        session_id='session-1'))
+    component.started(None, mocker.Mock(site_id='bedroom',
+                                        session_id='session-2'))
+    event_log.flush()
+
+    events = read_events(tmp_path / 'events.jsonl')
+    assert [(event['topic'], event['siteId'], event['sessionId'],
+             event['handler']) for event in events] == \
+        [('hermes/intent/User:Weather', 'kitchen', 'session-1', 'weather'),
+         ('hermes/dialogueManager/sessionStarted', 'bedroom', 'session-2',
+          'started')]
+
+
+def test_write_error(tmp_path, capsys):
+    """Test whether the writer thread reports an error and keeps running."""
+    event_log = EventLog(str(tmp_path / 'missing' / 'events.jsonl'),
+                         flush_interval=0.01)
+    event_log.start()
+    event_log.record('topic', 'handler', 0.0)
+
+    try:
+        deadline = time.monotonic() + 5
+        while event_log.last_error is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert isinstance(event_log.last_error, OSError)
+        assert event_log._thread.is_alive()
+
+        # The events are written again when the directory exists.
+        (tmp_path / 'missing').mkdir()
+        event_log.record('topic', 'handler', 0.0)
+    finally:
+        event_log.stop(1)
+
+    assert len(read_events(tmp_path / 'missing' / 'events.jsonl')) == 1
+    assert 'Exception while writing the event log' in capsys.readouterr().err
+
+
+def test_unserializable_fields(tmp_path):
+    """Test whether extra fields that can't be serialized to JSON are written
+    as strings."""
+    event_log = EventLog(str(tmp_path / 'events.jsonl'))
+    event_log.record('topic', 'handler', 0.0,
+                     started=datetime(2019, 5, 1, 12, 30), payload=b'\x00')
+    event_log.flush()
+
+    event = read_events(tmp_path / 'events.jsonl')[0]
+    assert event['started'] == '2019-05-01 12:30:00'
+    assert event['payload'] == "b'\\x00'"
+
+
+def test_serialization_error(tmp_path, capsys):
+    """Test whether the writer thread keeps running if a batch can't be
+    serialized."""
+    event_log = EventLog(str(tmp_path / 'events.jsonl'), flush_interval=0.01)
+    circular = []
+    circular.append(circular)
+    event_log.start()
+    event_log.record('topic', 'handler', 0.0, circular=circular)
+
+    try:
+        deadline = time.monotonic() + 5
+        while event_log.last_error is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert isinstance(event_log.last_error, ValueError)
+        assert event_log._thread.is_alive()
+
+        event_log.record('topic', 'handler', 0.0)
+    finally:
+        event_log.stop(1)
+
+    assert len(read_events(tmp_path / 'events.jsonl')) == 1
+    assert 'Exception while writing the event log' in capsys.readouterr().err
+
+
+def test_topic_rates_bounded(tmp_path, mocker):
+    """Test whether the cache of sample rates doesn't grow without bound."""
+    mocker.patch('snipskit.events._MAX_TOPIC_RATES', 10)
+    event_log = EventLog(str(tmp_path / 'events.jsonl'),
+                         sample_rates={'hermes/audioServer/+/playBytes/#': 1.0})
+
+    for index in range(25):
+        event_log.record('hermes/audioServer/default/playBytes/{}'.format(index),
+                         'play', 0.0)
+
+    assert len(event_log._topic_rates) <= 10
@@ -0,0 +1,113 @@
+"""Tests for the `snipskit.executor` module."""
+
+from threading import Event, Lock, Thread
+import time
+
+from snipskit.executor import SessionExecutor
+
+
+def test_order_per_session():
+    """Test whether the callbacks of a session run in order and a slow
+    session doesn't block the others."""
+    executor = SessionExecutor(max_workers=4)
+    calls = []
+    lock = Lock()
+    slow_started = Event()
+    release = Event()
+
+    def callback(session, index):
+        if session == 'slow' and index == 0:
+            slow_started.set()
+            release.wait(5)
+        with lock:
+            calls.append((session, index))
+
+    for index in range(5):
+        executor.submit('slow', callback, 'slow', index)
+    slow_started.wait(5)
+    for index in range(5):
+        executor.submit('fast', callback, 'fast', index)
+
+    # The fast session finishes while the slow session is blocked.
+    deadline = time.monotonic() + 5
+    while len(calls) < 5 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    with lock:
+        assert calls == [('fast', index) for index in range(5)]
+
+    release.set()
+    executor.shutdown()
+
+    assert [call for call in calls if call[0] == 'slow'] == \
+        [('slow', index) for index in range(5)]
+    assert executor._queues == {}
+
+
+def test_no_session():
+    executor = SessionExecutor(max_workers=2)
+    calls = []
+
+    for index in range(10):
+        executor.submit(None, calls.append, index)
+    executor.shutdown()
+
+    assert sorted(calls) == list(range(10))
+
+
+def test_errors(mocker):
+    on_error = mocker.Mock()
+    executor = SessionExecutor(on_error=on_error)
+    calls = []
+
+    def fail():
+        raise ValueError('Failed')
+
+    executor.submit('session', fail)
+    executor.submit('session', calls.append, 'next')
+    executor.shutdown()
+
+    assert isinstance(executor.last_error, ValueError)
+    on_error.assert_called_once_with(executor.last_error, 'session')
+    # The session continues after an error.
+    assert calls == ['next']
+
+
+def test_max_pending():
+    """Test whether submit blocks when too many callbacks are pending."""
+    executor = SessionExecutor(max_workers=1, max_pending=2)
+    release = Event()
+    submitted = Event()
+
+    executor.submit('a', release.wait, 5)
+    executor.submit('b', release.wait, 5)
+
+    def submit():
+        executor.submit('c', lambda: None)
+        submitted.set()
+
+    Thread(target=submit, daemon=True).start()
+
+    assert not submitted.wait(0.1)
+    release.set()
+    assert submitted.wait(5)
+    executor.shutdown()
+
+
+def test_failing_error_handler():
+    """Test whether the callbacks of a session still run if the error handler
+    raises an exception."""
+    def on_error(error, key):
+        raise RuntimeError('Broken error handler')
+
+    executor = SessionExecutor(on_error=on_error)
+    calls = []
+
+    def fail():
+        raise ValueError('Failed')
+
+    executor.submit('session', fail)
+    executor.submit('session', calls.append, 'next')
+    executor.shutdown()
+
+    assert calls == ['next']
+    assert executor._queues == {}
@@ -0,0 +1,73 @@
+"""Tests for the import time of the `snipskit` modules.
+
+Each module is imported in a fresh interpreter, so the modules imported by
+earlier tests don't count.
+
+The import time budget in milliseconds can be changed with the environment
+variable SNIPSKIT_IMPORT_BUDGET, e.g. on a slow machine.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                   'src')
+
+IMPORT_BUDGET = float(os.environ.get('SNIPSKIT_IMPORT_BUDGET', 100))
+
+HEAVY_MODULES = ['hermes_python', 'numpy', 'paho', 'psutil', 'toml',
+                 'urllib.request']
+
+MODULES = ['snipskit.apps', 'snipskit.components', 'snipskit.config',
+           'snipskit.events', 'snipskit.executor', 'snipskit.monitor',
+           'snipskit.profiler', 'snipskit.services', 'snipskit.tools',
+           'snipskit.tracing', 'snipskit.watcher',
+           'snipskit.hermes.apps', 'snipskit.hermes.components',
+           'snipskit.hermes.decorators', 'snipskit.mqtt.apps',
+           'snipskit.mqtt.components', 'snipskit.mqtt.decorators',
+           'snipskit.mqtt.dialogue', 'snipskit.mqtt.tls', 'snipskit.mqtt.tts']
+
+
+def run_python(code, *options):
+    """Run Python code in a fresh interpreter with the source directory of
+    snipskit in its path and return its standard output and standard error.
+    """
+    code = 'import sys; sys.path.insert(0, {!r}); {}'.format(SRC, code)
+    result = subprocess.run([sys.executable] + list(options) + ['-c', code],
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            universal_newlines=True, check=True)
+    return result.stdout, result.stderr
+
+
+@pytest.mark.parametrize('module', MODULES)
+def test_no_heavy_imports(module):
+    """Test whether importing a module doesn't import heavy dependencies."""
+    stdout, _ = run_python('import {}; print(" ".join(sorted(sys.modules)))'
+                           .format(module))
+    imported = stdout.split()
+
+    assert [heavy for heavy in HEAVY_MODULES if heavy in imported] == []
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7),
+                    reason='-X importtime requires Python 3.7')
+@pytest.mark.parametrize('module', MODULES)
+def test_import_time(module):
+    """Test whether importing a module stays within the import time budget.
+    """
+    _, stderr = run_python('import {}'.format(module), '-X', 'importtime')
+
+    # The output of -X importtime has lines with the self time and the
+    # cumulative time in microseconds of each module:
+    # import time:       154 |      35780 |   snipskit.tools
+    cumulative = {}
+    for line in stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            _, total, name = line.split('|')
+            if total.strip().isdigit():
+                cumulative[name.strip()] = int(total) / 1000
+
+    assert cumulative[module] < IMPORT_BUDGET
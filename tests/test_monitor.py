@@ -0,0 +1,215 @@
+"""Unit tests for the `snipskit.monitor` module."""
+
+from contextlib import contextmanager
+import json
+import time
+
+import psutil
+import pytest
+from snipskit.monitor import RingBuffer, ServiceMonitor
+
+
+class FakeProcess:
+    """A fake psutil process with settable metrics."""
+
+    def __init__(self, name, pid, rss=1000, cpu=1.0, threads=2, fds=5):
+        self.info = {'name': name}
+        self.pid = pid
+        self.rss = rss
+        self.cpu = cpu
+        self.threads = threads
+        self.fds = fds
+        self.gone = False
+
+    @contextmanager
+    def oneshot(self):
+        yield
+
+    def cpu_percent(self):
+        if self.gone:
+            raise psutil.NoSuchProcess(self.pid)
+        return self.cpu
+
+    def memory_info(self):
+        class MemoryInfo:
+            rss = self.rss
+        return MemoryInfo
+
+    def num_threads(self):
+        return self.threads
+
+    def num_fds(self):
+        return self.fds
+
+
+@pytest.fixture
+def processes(mocker):
+    """Fake a process table with some Snips processes."""
+    table = [FakeProcess('systemd', 1),
+             FakeProcess('snips-nlu', 120, rss=1000, cpu=10.0),
+             FakeProcess('snips-nlu', 121, rss=500, cpu=5.0),
+             FakeProcess('snips-asr', 130, rss=2000),
+             FakeProcess(None, 140)]
+    mocker.patch('psutil.process_iter', return_value=table)
+    clock = mocker.patch('time.time', return_value=1000.0)
+    return table, clock
+
+
+def test_ring_buffer():
+    buffer = RingBuffer(3)
+
+    assert len(buffer) == 0
+    assert buffer.last() is None
+    assert list(buffer.values()) == []
+
+    buffer.append(1)
+    buffer.append(2)
+    assert len(buffer) == 2
+    assert list(buffer.values()) == [1.0, 2.0]
+
+    buffer.append(3)
+    buffer.append(4)
+    buffer.append(5)
+    assert len(buffer) == 3
+    assert buffer.last() == 5.0
+    assert list(buffer.values()) == [3.0, 4.0, 5.0]
+    assert buffer.values().typecode == 'd'
+
+
+def test_sample(processes):
+    monitor = ServiceMonitor(size=10)
+
+    samples = monitor.sample()
+
+    assert samples == {'snips-nlu': {'cpu': 15.0, 'rss': 1500,
+                                     'threads': 4, 'fds': 10},
+                       'snips-asr': {'cpu': 1.0, 'rss': 2000,
+                                     'threads': 2, 'fds': 5}}
+    assert monitor.services == ['snips-asr', 'snips-nlu']
+    assert list(monitor.values('snips-nlu', 'time')) == [1000.0]
+    assert list(monitor.values('snips-nlu', 'rss')) == [1500.0]
+    assert list(monitor.values('snips-tts', 'rss')) == []
+
+
+def test_sample_reuses_processes(processes, mocker):
+    table, _ = processes
+    monitor = ServiceMonitor()
+    monitor.sample()
+
+    # A new process object for the same PID, as psutil returns it.
+    mocker.patch('psutil.process_iter',
+                 return_value=[FakeProcess('snips-asr', 130, rss=3000)])
+    monitor.sample()
+
+    # The process object of the first scan is sampled.
+    assert list(monitor.values('snips-asr', 'rss')) == [2000.0, 2000.0]
+    assert list(monitor.values('snips-nlu', 'rss')) == [1500.0]
+
+
+def test_sample_process_gone(processes):
+    table, _ = processes
+    table[3].gone = True
+    monitor = ServiceMonitor()
+
+    assert 'snips-asr' not in monitor.sample()
+
+
+def test_statistics_and_trend(processes):
+    table, clock = processes
+    monitor = ServiceMonitor(size=3)
+
+    assert monitor.statistics('snips-asr', 'rss') is None
+    assert monitor.trend('snips-asr', 'rss') is None
+
+    for second, rss in enumerate((2000, 2100, 2200, 2300)):
+        clock.return_value = 1000.0 + 10 * second
+        table[3].rss = rss
+        monitor.sample()
+
+    assert monitor.statistics('snips-asr', 'rss') == {'last': 2300.0,
+                                                      'mean': 2200.0,
+                                                      'min': 2100.0,
+                                                      'max': 2300.0}
+    assert monitor.trend('snips-asr', 'rss') == pytest.approx(10.0)
+    assert monitor.trend('snips-asr', 'threads') == pytest.approx(0.0)
+
+
+def test_threshold(processes, mocker):
+    table, _ = processes
+    callback = mocker.Mock()
+    monitor = ServiceMonitor()
+    monitor.add_threshold('snips-nlu', 'cpu', 50, callback)
+
+    monitor.sample()
+    callback.assert_not_called()
+
+    table[1].cpu = 60.0
+    monitor.sample()
+    monitor.sample()
+    callback.assert_called_once_with('snips-nlu', 'cpu', 65.0)
+
+    table[1].cpu = 10.0
+    monitor.sample()
+    table[1].cpu = 80.0
+    monitor.sample()
+    assert callback.call_count == 2
+
+    with pytest.raises(ValueError):
+        monitor.add_threshold('snips-nlu', 'memory', 50, callback)
+
+
+def test_publish_summary(processes, mocker):
+    client = mocker.Mock()
+    monitor = ServiceMonitor(client=client, topic='monitor')
+
+    monitor.sample()
+
+    topic, payload = client.publish.call_args[0]
+    assert topic == 'monitor'
+    assert json.loads(payload)['snips-nlu'] == {'cpu': [15.0, 15.0, 15.0],
+                                                'rss': [1500, 1500, 1500],
+                                                'threads': [4, 4, 4],
+                                                'fds': [10, 10, 10]}
+
+
+def test_default_topic(mocker):
+    mocker.patch('socket.gethostname', return_value='satellite')
+
+    assert ServiceMonitor().topic == 'snipskit/monitor/satellite/summary'
+
+
+def test_start_stop(processes):
+    table, _ = processes
+    monitor = ServiceMonitor(interval=0.01)
+
+    monitor.start()
+    monitor.stop(1)
+
+    assert monitor.services == ['snips-asr', 'snips-nlu']
+    assert monitor._thread is None
+
+
+def test_sampling_error(processes, mocker, capsys):
+    """Test whether the monitor keeps sampling if publishing the summary
+    fails."""
+    client = mocker.Mock()
+
+    def publish(topic, payload):
+        if client.publish.call_count == 1:
+            raise OSError('Broker unreachable')
+
+    client.publish.side_effect = publish
+    monitor = ServiceMonitor(interval=0.01, client=client)
+
+    monitor.start()
+    try:
+        deadline = time.monotonic() + 5
+        while client.publish.call_count < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert monitor._thread.is_alive()
+    finally:
+        monitor.stop(1)
+
+    assert client.publish.call_count >= 3
+    assert isinstance(monitor.last_error, OSError)
+    assert 'Exception while sampling' in capsys.readouterr().err
@@ -0,0 +1,89 @@
+"""Tests for the `snipskit.profiler` module."""
+
+from threading import Event, Thread
+import time
+
+from snipskit.profiler import Profile, SamplingProfiler
+
+
+def busy(stop):
+    """Keep a thread busy until stop is set."""
+    while not stop.is_set():
+        sum(range(100))
+
+
+def idle(stop):
+    """Keep a thread waiting until stop is set."""
+    stop.wait()
+
+
+def run_threads(*targets):
+    """Start threads running the targets and return their stop event."""
+    stop = Event()
+    for target in targets:
+        Thread(target=target, args=(stop,), name=target.__name__,
+               daemon=True).start()
+    return stop
+
+
+def test_profile_folded(tmp_path):
+    profile = Profile({('MainThread', 'main', 'handler'): 3,
+                       ('MainThread', 'main'): 5}, 8, 0.04)
+
+    assert profile.folded() == 'MainThread;main 5\n' \
+                               'MainThread;main;handler 3\n'
+
+    filename = tmp_path / 'profile.folded'
+    profile.write(str(filename))
+    assert filename.read_text() == profile.folded()
+
+    assert Profile({}, 0, 0.0).folded() == ''
+
+
+def test_sampling_profiler(mocker):
+    stop = run_threads(busy)
+    on_finish = mocker.Mock()
+    profiler = SamplingProfiler(interval=0.001, on_finish=on_finish)
+
+    assert profiler.start(duration=10)
+    assert profiler.running
+    assert not profiler.start()
+    time.sleep(0.05)
+    profile = profiler.stop()
+    stop.set()
+
+    assert not profiler.running
+    assert profile is profiler.profile
+    on_finish.assert_called_once_with(profile)
+    assert profile.samples > 0
+    assert profile.duration < 10
+    assert any(stack[0] == 'busy' and 'busy' in stack[-1]
+               for stack in profile.stacks)
+    # The thread of the profiler isn't sampled.
+    assert not any(stack[0] == 'SamplingProfiler'
+                   for stack in profile.stacks)
+
+
+def test_sampling_profiler_duration():
+    profiler = SamplingProfiler(interval=0.001)
+    profiler.start(duration=0.02)
+    time.sleep(0.2)
+
+    assert not profiler.running
+    assert profiler.profile.duration < 0.2
+
+
+def test_sampling_profiler_focus():
+    stop = run_threads(busy, idle)
+    profiler = SamplingProfiler(interval=0.001, focus={busy.__code__})
+
+    profiler.start()
+    time.sleep(0.05)
+    profile = profiler.stop()
+    stop.set()
+
+    assert profile.stacks
+    for stack in profile.stacks:
+        # Only the busy thread is counted, starting at the busy function.
+        assert stack[0] == 'busy'
+        assert stack[1].startswith('busy (')
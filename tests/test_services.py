@@ -0,0 +1,110 @@
+"""Unit tests for the `snipskit.services` module."""
+
+import pytest
+import snipskit.services
+from snipskit.services import installed, is_running, model_version, \
+    ProcessSnapshot, running, SNIPS_SERVICES, version, versions
+
+
+@pytest.fixture
+def processes(mocker):
+    """Fake a process table with some Snips processes."""
+    table = [('systemd', 1, 1000.0),
+             ('snips-nlu', 120, 1100.0),
+             ('snips-nlu', 121, 1050.0),
+             ('snips-dialogue', 130, None),
+             ('mosquitto', 140, 1000.0)]
+    process_iter = mocker.patch('psutil.process_iter',
+                                return_value=[mocker.Mock(info={'name': name,
+                                                                'pid': pid,
+                                                                'create_time': create_time})
+                                              for name, pid, create_time
+                                              in table])
+    mocker.patch('time.time', return_value=1200.0)
+    return process_iter
+
+
+def test_process_snapshot(processes):
+    snapshot = ProcessSnapshot()
+
+    processes.assert_called_once_with(['name', 'pid', 'create_time'])
+    assert snapshot.services == SNIPS_SERVICES
+    assert snapshot.is_running('snips-nlu')
+    assert snapshot.is_running('snips-dialogue')
+    assert not snapshot.is_running('snips-asr')
+    assert not snapshot.is_running('mosquitto')
+
+    assert snapshot.pids('snips-nlu') == [120, 121]
+    assert snapshot.pids('snips-asr') == []
+    assert snapshot.instances('snips-nlu') == 2
+    assert snapshot.instances('snips-asr') == 0
+
+    assert snapshot.uptime('snips-nlu') == 150.0
+    assert snapshot.uptime('snips-dialogue') is None
+    assert snapshot.uptime('snips-asr') is None
+
+
+def test_running(processes):
+    states = running()
+
+    assert processes.call_count == 1
+    assert states == {service: service in ('snips-nlu', 'snips-dialogue')
+                      for service in SNIPS_SERVICES}
+
+
+def test_is_running(processes):
+    assert is_running('snips-nlu')
+    assert not is_running('snips-tts')
+
+
+@pytest.fixture
+def binaries(tmp_path, monkeypatch):
+    """Install fake Snips binaries that print their version and count how
+    many times they're run."""
+    for service in ('snips-nlu', 'snips-tts'):
+        binary = tmp_path / service
+        binary.write_text('#!/bin/sh\n'
+                          'echo run >> "{}.log"\n'
+                          'echo "{} 1.1.2 (0.62.3) '
+                          '[model_version: 0.19.0]"\n'
+                          .format(binary, service))
+        binary.chmod(0o755)
+
+    monkeypatch.setenv('PATH', str(tmp_path))
+    snipskit.services._version_cache.clear()
+    yield tmp_path
+    snipskit.services._version_cache.clear()
+
+
+def runs(binaries, service):
+    """Return how many times the binary of a service has run."""
+    try:
+        return len((binaries / (service + '.log')).read_text().splitlines())
+    except FileNotFoundError:
+        return 0
+
+
+def test_versions_cached(binaries):
+    """Test whether each binary is run only once for all version queries."""
+    assert versions() == {service: '1.1.2'
+                          if service in ('snips-nlu', 'snips-tts') else ''
+                          for service in SNIPS_SERVICES}
+    assert installed()['snips-nlu']
+    assert not installed()['snips-asr']
+    assert version() == '1.1.2'
+    assert version('snips-tts') == '1.1.2'
+    assert model_version() == '0.19.0'
+
+    assert runs(binaries, 'snips-nlu') == 1
+    assert runs(binaries, 'snips-tts') == 1
+
+
+def test_versions_binary_changed(binaries):
+    """Test whether a binary is run again when it has changed."""
+    assert version('snips-nlu') == '1.1.2'
+
+    binary = binaries / 'snips-nlu'
+    binary.write_text(binary.read_text().replace('1.1.2', '1.2.0') + '\n')
+
+    assert version('snips-nlu') == '1.2.0'
+    assert runs(binaries, 'snips-nlu') == 2
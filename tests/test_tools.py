@@ -1,7 +1,12 @@
 """Tests for the `snipskit.tools` module."""
 
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from io import BytesIO
+from threading import Thread
+
 import pytest
-from snipskit.tools import find_path, latest_snips_version
+from snipskit.tools import _CHUNK_SIZE, _scan_version, find_path, \
+    latest_snips_version
 
 # Variables for some file paths we test."""
 etc = '/etc/snips.toml'
@@ -45,3 +50,110 @@ def test_latest_snips_version():
     published."""
 
     assert latest_snips_version() == '1.1.2'
+
+
+RELEASE_NOTES = ('<html><body>' + 'x' * 20000 +
+                 '<span data-offset-key="a1">Platform Update 1.1.2 </span>'
+                 '<span data-offset-key="b2">Platform Update 1.1.1 </span>'
+                 '</body></html>').encode('utf-8')
+
+
+class ReleaseNotesHandler(BaseHTTPRequestHandler):
+    """Serve the release notes with an ETag and a Last-Modified header."""
+
+    requests = []
+
+    def do_GET(self):
+        self.requests.append(dict(self.headers))
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('ETag', '"v1"')
+        self.send_header('Last-Modified', 'Mon, 01 Jul 2019 10:00:00 GMT')
+        self.send_header('Content-Length', str(len(RELEASE_NOTES)))
+        self.end_headers()
+        self.wfile.write(RELEASE_NOTES)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def release_notes():
+    """Run an HTTP server with the release notes."""
+    ReleaseNotesHandler.requests = []
+    server = HTTPServer(('127.0.0.1', 0), ReleaseNotesHandler)
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield 'http://127.0.0.1:{}/release-notes'.format(server.server_port)
+    server.shutdown()
+    server.server_close()
+
+
+def test_latest_snips_version_cached(release_notes, tmp_path, mocker):
+    """Test whether the latest version is cached and checked again with a
+    conditional request after the TTL."""
+    cache_file = str(tmp_path / 'cache' / 'version.json')
+    clock = mocker.patch('time.time', return_value=1000.0)
+
+    assert latest_snips_version(cache_file, 60, release_notes) == '1.1.2'
+    assert len(ReleaseNotesHandler.requests) == 1
+    assert 'If-None-Match' not in ReleaseNotesHandler.requests[0]
+
+    # Within the TTL, no request is made.
+    clock.return_value = 1059.0
+    assert latest_snips_version(cache_file, 60, release_notes) == '1.1.2'
+    assert len(ReleaseNotesHandler.requests) == 1
+
+    # After the TTL, a conditional request is made.
+    clock.return_value = 1061.0
+    assert latest_snips_version(cache_file, 60, release_notes) == '1.1.2'
+    assert len(ReleaseNotesHandler.requests) == 2
+    headers = ReleaseNotesHandler.requests[1]
+    assert headers['If-None-Match'] == '"v1"'
+    assert headers['If-Modified-Since'] == 'Mon, 01 Jul 2019 10:00:00 GMT'
+
+    # The 304 response has renewed the cached result.
+    clock.return_value = 1100.0
+    assert latest_snips_version(cache_file, 60, release_notes) == '1.1.2'
+    assert len(ReleaseNotesHandler.requests) == 2
+
+    # Another URL isn't answered from the cache.
+    assert latest_snips_version(cache_file, 60,
+                                release_notes + '?other') == '1.1.2'
+    assert len(ReleaseNotesHandler.requests) == 3
+
+
+def test_latest_snips_version_default_cache(release_notes, tmp_path,
+                                            monkeypatch):
+    """Test whether the result is cached in the snipskit directory of
+    XDG_CACHE_HOME by default."""
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+
+    assert latest_snips_version(url=release_notes) == '1.1.2'
+    assert (tmp_path / 'snipskit' / 'latest_snips_version.json').exists()
+
+
+def test_latest_snips_version_not_found(release_notes, tmp_path, mocker):
+    """Test whether a ValueError is raised if the release notes don't contain
+    a version."""
+    mocker.patch('snipskit.tools._scan_version', return_value=None)
+
+    with pytest.raises(ValueError):
+        latest_snips_version(str(tmp_path / 'version.json'), 0, release_notes)
+
+
+def test_scan_version_stops_at_first_match():
+    """Test whether the stream is only read until the first version, also if
+    it's split over two chunks."""
+    stream = BytesIO(b'x' * (_CHUNK_SIZE - 40) +
+                     b'<span data-offset-key="a1">Platform Update 1.1.2 '
+                     b'</span>' + b'y' * 10 * _CHUNK_SIZE)
+
+    assert _scan_version(stream) == '1.1.2'
+    assert stream.tell() == 2 * _CHUNK_SIZE
+
+    assert _scan_version(BytesIO(b'no versions')) is None
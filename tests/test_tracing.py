@@ -0,0 +1,112 @@
+"""Tests for the `snipskit.tracing` module."""
+
+import json
+
+import pytest
+from snipskit.hermes.decorators import intent
+from snipskit.tracing import current_session, get_tracer, set_tracer, span, \
+    Tracer
+
+
+def read_trace(filename):
+    """Read the events of an unterminated trace file."""
+    content = filename.read_text()
+    assert content.startswith('[\n')
+    return json.loads(content.rstrip().rstrip(',') + ']')
+
+
+@pytest.fixture
+def tracer(tmp_path):
+    """Install a tracer writing to a temporary file."""
+    tracer = Tracer(str(tmp_path / 'trace.json'))
+    set_tracer(tracer)
+    yield tracer
+    set_tracer(None)
+    tracer.close()
+
+
+def test_span(tracer, tmp_path):
+    assert get_tracer() is tracer
+
+    with span('handler', 'session-1', intent='User:Weather'):
+        assert current_session() == 'session-1'
+        with span('weather API'):
+            pass
+    assert current_session() is None
+
+    with span('timer'):
+        pass
+
+    events = read_trace(tmp_path / 'trace.json')
+    assert [(event['ph'], event['name'], event['id']) for event in events] == \
+        [('b', 'handler', 'session-1'),
+         ('b', 'weather API', 'session-1'),
+         ('e', 'weather API', 'session-1'),
+         ('e', 'handler', 'session-1'),
+         ('b', 'timer', 'none'),
+         ('e', 'timer', 'none')]
+    assert events[0]['args'] == {'intent': 'User:Weather'}
+    assert events[0]['cat'] == 'snipskit'
+    assert all(first['ts'] <= second['ts']
+               for first, second in zip(events, events[1:]))
+
+
+def test_span_without_tracer(tmp_path):
+    with span('handler', 'session-1'):
+        assert current_session() is None
+
+
+def test_rotation(tmp_path):
+    filename = tmp_path / 'trace.json'
+    filename.write_text('old')
+    tracer = Tracer(str(filename), max_bytes=1000, backup_count=2)
+
+    assert (tmp_path / 'trace.json.1').read_text() == 'old'
+
+    for index in range(30):
+        tracer.event('b', 'span', 'session-{}'.format(index))
+    tracer.close()
+
+    assert filename.stat().st_size <= 1000
+    assert (tmp_path / 'trace.json.1').stat().st_size <= 1000
+    assert (tmp_path / 'trace.json.2').exists()
+    assert not (tmp_path / 'trace.json.3').exists()
+    assert read_trace(filename)[-1]['id'] == 'session-29'
+
+
+def test_trace_hermes_decorator(tracer, tmp_path, mocker):
+    class Component:
+
+        @intent('User:Weather')
+        def weather(self, hermes, intent_message):
+            """Handle the weather intent."""
+            return intent_message.session_id
+
+    method = Component().weather
+    assert method.subscribe_method == 'subscribe_intent'
+    assert method.subscribe_parameter == 'User:Weather'
+    assert method.__name__ == 'weather'
+    assert method.__doc__ == 'Handle the weather intent.'
+
+    assert method(None, mocker.Mock(session_id='session-2')) == 'session-2'
+
+    events = read_trace(tmp_path / 'trace.json')
+    assert [(event['ph'], event['name'], event['id'])
+            for event in events] == [('b', 'weather', 'session-2'),
+                                     ('e', 'weather', 'session-2')]
+
+
+def test_hermes_decorator_fast_path(mocker):
+    """Test whether a Hermes callback is called without a span if nothing is
+    traced or logged."""
+    span = mocker.patch('snipskit.hermes.decorators.span')
+
+    class Component:
+
+        @intent('User:Weather')
+        def weather(self, hermes, intent_message):
+            return intent_message.session_id
+
+    assert Component().weather(None, mocker.Mock(session_id='session-3')) == \
+        'session-3'
+    assert span.call_count == 0
@@ -0,0 +1,58 @@
+"""Tests for the `snipskit.tts` module."""
+
+import os
+
+from snipskit.tts import TTSCache
+
+
+def test_tts_cache_get_put(tmp_path):
+    """Test whether a `TTSCache` object returns the cached audio of a text in
+    a language with a voice."""
+    cache = TTSCache(str(tmp_path / 'tts'))
+
+    assert cache.get('Hello', 'en') is None
+
+    cache.put('Hello', b'hello', 'en')
+    cache.put('Hello', b'bonjour', 'fr')
+
+    assert cache.get('Hello', 'en') == b'hello'
+    assert cache.get('Hello', 'fr') == b'bonjour'
+    assert cache.get('Hello', 'en', 'female') is None
+    assert ('Hello', 'fr', None) in cache
+    assert len(cache) == 2
+    assert cache.size == 12
+
+
+def test_tts_cache_eviction(tmp_path):
+    """Test whether a `TTSCache` object removes the least recently used audio
+    when it's full."""
+    cache = TTSCache(str(tmp_path), max_size=10)
+
+    cache.put('one', b'1111')
+    cache.put('two', b'2222')
+    cache.get('one')
+    cache.put('three', b'3333')
+
+    assert cache.get('one') == b'1111'
+    assert cache.get('two') is None
+    assert cache.get('three') == b'3333'
+    assert cache.size == 8
+    assert len(os.listdir(str(tmp_path))) == 2
+
+    # Audio larger than the cache isn't cached.
+    cache.put('four', b'4' * 11)
+    assert cache.get('four') is None
+
+    cache.clear()
+    assert len(cache) == 0
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_tts_cache_existing_directory(tmp_path):
+    """Test whether a `TTSCache` object uses the audio that's already cached
+    in its directory."""
+    TTSCache(str(tmp_path)).put('Hello', b'hello', 'en')
+
+    cache = TTSCache(str(tmp_path))
+    assert cache.size == 5
+    assert cache.get('Hello', 'en') == b'hello'
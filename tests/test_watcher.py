@@ -0,0 +1,154 @@
+"""Tests for the `snipskit.watcher` module."""
+
+from threading import Event
+import time
+
+import pytest
+from snipskit.config import AppConfig, AssistantConfig, SnipsConfig
+from snipskit.watcher import ConfigWatcher
+
+
+class WatchedComponent:
+    """A stand-in for a Snips app with configuration files."""
+
+    def __init__(self, directory):
+        self.snips = SnipsConfig(str(directory / 'snips.toml'))
+        self.assistant = AssistantConfig(str(directory / 'assistant.json'))
+        self.config = AppConfig(str(directory / 'config.ini'))
+        self.reloads = []
+        self.reloaded = Event()
+
+    def on_config_reload(self, changed):
+        self.reloads.append(changed)
+        self.reloaded.set()
+
+
+@pytest.fixture
+def component(tmp_path):
+    (tmp_path / 'snips.toml').write_text('[snips-common]\n'
+                                         'mqtt = "mqtt.example.com:1883"\n')
+    (tmp_path / 'assistant.json').write_text('{"language": "en"}')
+    (tmp_path / 'config.ini').write_text('[secret]\napi-key=foobar\n')
+    return WatchedComponent(tmp_path)
+
+
+def test_config_watcher_check(tmp_path, component):
+    """Test whether only changed configuration files are reloaded."""
+    watcher = ConfigWatcher(component)
+    snips = component.snips
+
+    assert watcher.check() == []
+    assert component.reloads == []
+
+    (tmp_path / 'assistant.json').write_text('{"language": "fr"}')
+    (tmp_path / 'config.ini').write_text('[secret]\napi-key=barfoo\n')
+
+    assert watcher.check() == ['assistant', 'config']
+    assert component.reloads == [['assistant', 'config']]
+    assert component.assistant['language'] == 'fr'
+    assert component.config['secret']['api-key'] == 'barfoo'
+    assert component.snips is snips
+
+    assert watcher.check() == []
+
+
+def test_config_watcher_invalid_file(tmp_path, component):
+    """Test whether the configuration is kept if a changed file can't be
+    parsed, and reloaded when it's fixed."""
+    watcher = ConfigWatcher(component)
+    assistant = component.assistant
+
+    (tmp_path / 'assistant.json').write_text('{"language": ')
+    assert watcher.check() == []
+    assert component.assistant is assistant
+    assert isinstance(watcher.last_error, ValueError)
+
+    (tmp_path / 'assistant.json').write_text('{"language": "nl"}')
+    assert watcher.check() == ['assistant']
+    assert component.assistant['language'] == 'nl'
+
+
+@pytest.mark.parametrize('use_inotify', [True, False])
+def test_config_watcher_thread(tmp_path, component, use_inotify):
+    """Test whether the watcher thread reloads a changed file."""
+    watcher = ConfigWatcher(component, interval=0.05, use_inotify=use_inotify)
+    watcher.start()
+    try:
+        (tmp_path / 'snips.toml').write_text('[snips-common]\n'
+                                             'mqtt = "localhost:8883"\n')
+        assert component.reloaded.wait(5)
+    finally:
+        watcher.stop()
+
+    assert component.reloads == [['snips']]
+    assert component.snips.mqtt.broker_address == 'localhost:8883'
+
+
+def test_config_watcher_own_write(tmp_path, component):
+    """Test whether the app's own writes to config.ini aren't reloaded and a
+    reloaded app configuration keeps its write delay."""
+    component.config = AppConfig(str(tmp_path / 'config.ini'), write_delay=5)
+    config = component.config
+    watcher = ConfigWatcher(component)
+
+    config['secret']['api-key'] = 'barfoo'
+    config.flush()
+    assert watcher.check() == []
+    assert component.config is config
+
+    (tmp_path / 'config.ini').write_text('[secret]\napi-key=external\n')
+    assert watcher.check() == ['config']
+    assert component.config['secret']['api-key'] == 'external'
+    assert component.config.write_delay == 5
+
+
+def test_config_watcher_pending_write(tmp_path, component):
+    """Test whether a delayed write of the app's configuration doesn't
+    overwrite a change by someone else."""
+    component.config = AppConfig(str(tmp_path / 'config.ini'),
+                                 write_delay=0.2)
+    config = component.config
+    watcher = ConfigWatcher(component)
+
+    config['secret']['api-key'] = 'barfoo'
+    config.write()
+    (tmp_path / 'config.ini').write_text('[secret]\napi-key=external\n')
+
+    assert watcher.check() == ['config']
+    assert not config.pending
+    time.sleep(0.4)
+
+    assert (tmp_path / 'config.ini').read_text() == \
+        '[secret]\napi-key=external\n'
+    assert component.config['secret']['api-key'] == 'external'
+    assert watcher.check() == []
+
+
+def test_config_watcher_thread_error(tmp_path, component, capsys):
+    """Test whether the watcher thread keeps watching if
+    `on_config_reload` raises an exception."""
+    calls = []
+
+    def on_config_reload(changed):
+        calls.append(changed)
+        if len(calls) == 1:
+            raise RuntimeError('Failed')
+        component.reloaded.set()
+
+    component.on_config_reload = on_config_reload
+    watcher = ConfigWatcher(component, interval=0.05, use_inotify=False)
+    watcher.start()
+    try:
+        (tmp_path / 'snips.toml').write_text('[snips-common]\n'
+                                             'mqtt = "localhost:8883"\n')
+        deadline = time.monotonic() + 5
+        while not calls and time.monotonic() < deadline:
+            time.sleep(0.01)
+        (tmp_path / 'assistant.json').write_text('{"language": "de"}')
+        assert component.reloaded.wait(5)
+    finally:
+        watcher.stop()
+
+    assert calls == [['snips'], ['assistant']]
+    assert isinstance(watcher.last_error, RuntimeError)
+    assert 'Exception while reloading' in capsys.readouterr().err